@@ -11,11 +11,15 @@ Outputs  : Identifies and locates errors if there are any in the Spice codes (st
 # Importing libraries
 import sys
 import os
+import numpy as np
+
+## The netlist is read and values are converted by the parser of Assignment-2 so that both the assignments accept the same netlists
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Assignment-2'))
+from netlist_parser import SPICE_BEGIN, SPICE_END, Parse_Netlist
+from value_parser import Parse_Values
 
 # Constants used in the code
 INPUT_FILE_TYPE = '.netlist'	# Extension of netlist files
-SPICE_BEGIN = '.circuit'		# Line which indicates start of Spice code
-SPICE_END = '.end'				# Line which indicates end of Spice code
 
 
 # Checking for Valid commandline arguments
@@ -32,73 +36,11 @@ if file_input[-8:] != INPUT_FILE_TYPE:
 	print("Incorrect file type. Only '.netlist' type files are accepted.")
 	exit()
 
-## Checking if the file given by the user exists and is read if it exists
-try:
-	f = open(file_input)
-	lines = f.readlines()
-#	print(lines)		# This can be uncommented to see the lines being read
-
-except:
-	print("Unable to locate file.")
-	exit()
-
-f.close()		# File is closed
-
 
-# Function to check if a string can be converted into float
+# Function to check if a value is given as a number in scientific notation with an optional suffix and unit (1k, 4.7uF, 10meg)
+## The value is converted by Parse_Values() as a column of one value, which gives NaN if it isn't valid
 def check_scientific_notation(value_string):
-	## An attempt is made to convert into float and if succesful, True is returned
-	try:
-		get_value = float(value_string)
-		return True
-
-	## If the attempt fails, False is returned
-	except:
-		return False		
-
-
-# Checking if spice codes are present in the netlist file. 
-no_circuit = True		# Checks if there is a Spice code in the netlist file
-Begin_circuit = 0		# Stores the line at which a Spice code starts. Default value is 0 which is used to check if a Spice code has started.
-
-
-for i in range(len(lines)):
-	## Removing the comments and trailing whitespaces. Note that there cannot be components with names containing '#'. 
-	if lines[i].find('#') >= 0:
-		lines[i] = lines[i][:lines[i].find('#')]
-	
-	lines[i] = lines[i].strip()
-
-	## Searching for SPICE_BEGIN in the netlist file which indicates the start of the Spice code
-	if lines[i] == SPICE_BEGIN:
-		if Begin_circuit == 0:	
-			Begin_circuit = i+1
-
-		else:
-			print("Error: Previous Spice code which started at", Begin_circuit,"hasn't ended before the new start of another one at", i+1)
- 
-	## Searching for SPICE_END in the netlist file which indicates the end of the Spice code which starts at line Begin_circuit
-
-	if lines[i] == SPICE_END:
-		if Begin_circuit > 0:
-			no_circuit = False
-			Begin_circuit = 0
-
-		else:
-			print("Error: Encountered end of a Spice code at line", i+1,"without the start of a Spice code.")
-			exit()
-
-
-## If a Spice code hasn't been ended, then it prints an error
-if Begin_circuit != 0:
-	print("Error: End of Spice code missing for Start code present at line", Begin_circuit)
-	exit()
-
-## If a Spice code was not found in the netlist file then it prints an error. 
-### This is not executed if the previous 'if' block is executed so it prints if there is no SPICE_BEGIN or SPICE_END
-if no_circuit:
-	print("The given netlist file has no identifiable Spice code.")
-	exit()
+	return not np.isnan(Parse_Values([value_string])[0])
 
 
 # Here I am classifying the types of components on the basis of number and type of nodes
@@ -130,7 +72,7 @@ class Component:
 		### Checking for valid values
 		if not check_scientific_notation(self.component_value):
 			print("Error: Invalid value (", self.component_value,") at line", index, "in the netlist file")
-			print("\nOnly alpha-numeric node names are allowed")
+			print("\nValue has to be specified as a numeric or a string in scientific notation, optionally followed by a suffix such as k, u or meg")
 			exit()
 
 		### Checking for dependencies
@@ -148,119 +90,111 @@ class Component:
 		self.component_value = init_value
 
 
-# List to collect all the different and valid circuits. 
-## This variable is used only for storing purpose and not used in this code. It can be used for further analysis of individual circuits or for group analysis.
-collect_circuits = []
+# Function to extract the tokens of a line of Spice code, called by Parse_Netlist() for every line of a Spice code as it is read
+## First, the component which the line of code is dealing with is identified based on the name of the component
+## Second, the number of nodes is fixed according to the type of the component.
+## Third, the function check_validity is called to validate the tokens passed to the Component object
+## Returns the Component along with the line with its words reversed for display purpose
+def parse_component(words, line_number):
+	element_name = words[0]			# All the components have the first their name as the first token
 
+	### Checking of components of type 1
+	if words[0][0] in element_type1:
+		if len(words) == 4:
+			element_ports = [words[1], words[2]]
+			element_dependencies = []
+			element_value = words[3]
 
-# Parsing each line and extracting tokens
-for i in range(len(lines)-1):
-	## Searching for SPICE_BEGIN in the netlist file
-	if lines[i] == SPICE_BEGIN:
-		circuit_components = []		# Variable to store the components and their tokens
-		spice_lines = []			# Variable to store the lines of the spice code line by line for display purpose
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()					
 
-		## If SPICE_BEGIN has been identified the lines are syntactically checked till a SPICE_END has been encountered
-		for j in range(i+1,len(lines)):
-			words = lines[j].split()		# Variable to store each line as a word array
-
-			if len(words) == 0:		# If there are no words in the line, then we move to the next line
-				continue
-
-			### Each line is checked if its the end of the Spice code starting at i
-			if words[0] == SPICE_END:
-				collect_circuits.append(circuit_components)
-				print("\n\nSpice code starting at line", i+1,"verified.\n")
-				i = j+1		# This speedens up the searching for all the Spice codes in the netlist file
-				break
-
-
-			### First, the component which the line of code is dealing with is identified based on the name of the component
-			### Second, the number of nodes is fixed according to the type of the component.
-			### Third, the function check_validity is called to validate the tokens passed to the Component object
-			
-			element_name = words[0]			# All the components have the first their name as the first token
-
-			#### Checking of components of type 1
-			if words[0][0] in element_type1:
-				if len(words) == 4:
-					element_ports = [words[1], words[2]]
-					element_dependencies = []
-					element_value = words[3]
-
-				else:
-					print("Error: Incorrect syntax at line", j+1,". Incorrect set of tokens given for the component.")
-					exit()					
-
-			#### Checking of components of type 2
-			elif words[0][0] in element_type2:
-				if len(words) == 6:
-					element_ports = [words[1], words[2], words[3], words[4]]
-					element_dependencies = []
-					element_value = words[5]
-
-				else:
-					print("Error: Incorrect syntax at line", j+1,". Incorrect set of tokens given for the component.")
-					exit()					
-
-			#### Checking of components of type 3
-			elif words[0][0] in element_type3:
-				if len(words) == 5:
-					element_ports = [words[1], words[2]]
-					element_dependencies = [words[3]]
-					element_value = words[4]
-
-				else:
-					print("Error: Incorrect syntax at line", j+1,". Incorrect set of tokens given for the component.")
-					exit()
-
-			#### If the type of component is not valid
-			else:
-				print("""Error: Type-error in the type of component in line""", j+1,""".
-					Accepted types are Resistor(R), Capacitor(C), Inductor(I), Voltage source(V), Current source(I), VCVS(E), VCCS(G), CCVS(H) and CCCS(F).
-					The component's name should start with the given associated character.""")
-				exit()
+	### Checking of components of type 2
+	elif words[0][0] in element_type2:
+		if len(words) == 6:
+			element_ports = [words[1], words[2], words[3], words[4]]
+			element_dependencies = []
+			element_value = words[5]
 
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()					
 
-			### All the values are stored in the class object and the tokens are checked for their validity.
-			component_details = Component(element_name, element_ports, element_dependencies, element_value)
-			component_details.check_validity(j+1)
+	### Checking of components of type 3
+	elif words[0][0] in element_type3:
+		if len(words) == 5:
+			element_ports = [words[1], words[2]]
+			element_dependencies = [words[3]]
+			element_value = words[4]
 
-			### If check_validity() failed then the program exits. So the component details are stored only if it has passed.
-			circuit_components.append(component_details)
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()
 
+	### If the type of component is not valid
+	else:
+		print("""Error: Type-error in the type of component in line""", line_number,""".
+				Accepted types are Resistor(R), Capacitor(C), Inductor(I), Voltage source(V), Current source(I), VCVS(E), VCCS(G), CCVS(H) and CCCS(F).
+				The component's name should start with the given associated character.""")
+		exit()
 
-			### The code lines are now processed as required for display purpose.
 
-			#### Words of a line are reversed and a temporary string is being declared for converting array of strings into one string
-			words.reverse()
-			temporary_string = ""
+	## All the values are stored in the class object and the tokens are checked for their validity.
+	## If check_validity() failed then the program exits. So the component details are returned only if it has passed.
+	component_details = Component(element_name, element_ports, element_dependencies, element_value)
+	component_details.check_validity(line_number)
 
-			#### Words are being stored as strings for display purpose
-			for eachword in words:
-				temporary_string += eachword + ' '
+	## The code line is now processed as required for display purpose.
+	### Words of the line are reversed and joined into one string
+	return component_details, ' '.join(reversed(words))
 
-			temporary_string = temporary_string[:-1]		# Space at the end is removed
 
-			### Each line is being stored in spice_lines as type string
-			spice_lines.append(temporary_string)
+# Reading the netlist file in a single pass through the records given by Parse_Netlist().
+## Comments are removed and the order of SPICE_BEGIN and SPICE_END is checked by the parser, and each line of a Spice code is checked by
+## parse_component() as it is read. A Spice code is displayed as soon as its end is read, so only the lines of one Spice code are held in memory at a time.
+no_circuit = True		# Checks if there is a Spice code in the netlist file
+Begin_circuit = 0		# Stores the line at which a Spice code starts. Default value is 0 which is used to check if a Spice code has started.
 
+for kind, line_number, data in Parse_Netlist(file_input, parse_component):
+	## Start of a Spice code
+	if kind == SPICE_BEGIN:
+		Begin_circuit = line_number
+		circuit_components = []		# Variable to store the components and their tokens
+		spice_lines = []			# Variable to store the lines of the spice code line by line for display purpose
+
+	## A verified component of the Spice code. Components of subcircuits defined outside Spice codes are ignored
+	elif kind == 'element' and Begin_circuit != 0:
+		component_details, spice_line = data
+		circuit_components.append(component_details)
+		spice_lines.append(spice_line)
 
-		## Order of lines is reversed for display purpose and displayed
+	## End of the Spice code which starts at line Begin_circuit
+	elif kind == SPICE_END:
+		print("\n\nSpice code starting at line", Begin_circuit,"verified.\n")
+
+		### Order of lines is reversed for display purpose and displayed
 		spice_lines.reverse()
 
-		## Displaying output
 		print("Displaying the modified Spice code")
 		for spice_code in spice_lines:
 			print(spice_code)
 
 		print("\n")
 
+		no_circuit = False
+		Begin_circuit = 0
+
+## If a Spice code was not found in the netlist file then it prints an error. 
+if no_circuit:
+	print("The given netlist file has no identifiable Spice code.")
+	exit()
+
+
 
 '''
 Brief Overview:
-	1. Check for equal number of SPICE_BEGIN and SPICE_END and in that order.
-	2. Then we read every line in a Spice code and verify their syntax based on their type.
+	1. The file is read line by line in one pass by the parser of Assignment-2, which checks the order of SPICE_BEGIN and SPICE_END as they are read.
+	2. Every line in a Spice code is verified for its syntax based on its type as it is read.
 	3. Verified code is stored in lists and component-wise tokens are stored separately in object of type Component.
 	4. The list variables are used for display purpose and the 
 	4. The code stored in lists is then displayed in reverse order.
@@ -269,4 +203,5 @@ In C code, I would have done similar blocks of code but it would have taken more
 Well-known codes like sort function may be inefficient as compared to the same pre-defined functions in python.
 C code is also not capable of handling bad inputs as it is not a interpreter file.
 This can be handled and taken advantage of in Python. For example, Python can identify strings which can be converted as float (strings with only numbers or numbers in scientific notation)
+and numpy can convert a whole column of them at once
 '''
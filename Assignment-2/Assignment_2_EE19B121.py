@@ -11,803 +11,448 @@ Outputs  : Identifies and locates errors if there are any in the netlist file an
 # Importing libraries
 import sys
 import os
+import argparse
+import time
 import numpy as np 
 import math
 import cmath
 
+from batch_solver import Solve_Batch		# Solving the circuits of the netlist file across a pool of processes
+from compiled_circuit import COMPILED_FILE_TYPE, Compile_Circuits, Load_Circuits		# Parsed circuits stored in a binary file which is memory mapped when it is read again
+from circuit_solver import ANALYSIS_AC, ANALYSIS_OP, ANALYSIS_PZ, ANALYSIS_SWEEP, ANALYSIS_TF, ANALYSIS_TRAN, CircuitResult		# Solving a circuit (DC, nonlinear DC, AC by superposition, a frequency sweep, a transient, a parameter step or a transfer function)
+from incremental_solver import INCREMENTAL_KINDS		# Large DC circuits solved again from their factorisations after small edits
+from iterative_solver import DEFAULT_MAX_ITERATIONS, DEFAULT_PRECONDITIONER, DEFAULT_SOLVER, DEFAULT_TOLERANCE, PRECONDITIONERS, SOLVERS, pyamg		# Krylov methods for very large resistive grids
+from model_reduction import REDUCE_TOLERANCE		# Reduced models of large RC/RLC circuits used for sweeps and transients
+from netlist_parser import Read_Circuits		# Single pass reading and verification of the netlist file
+from node_ordering import DEFAULT_ORDERING, ORDERINGS		# Orderings of the unknowns used before sparse LU factorisation
+from phase_profiler import Merge_Phases, Phase, Profile_Blocks, Start_Profiling, Take_Phases, Write_Profile		# Time and memory of each phase of reading and solving the circuits
+from result_cache import ResultCache		# Results of circuits which have been solved before
+from result_writer import OUTPUT_FORMATS, ResultWriter, pyarrow		# Results written in bulk to a CSV, npz or Parquet file
+
 
 # Constants used in the code
 INPUT_FILE_TYPE = '.netlist'	# Extension of netlist files
-SPICE_BEGIN = '.circuit'		# Directive indicating start of Spice code
-SPICE_END = '.end'				# Directive indicating end of Spice code
-SPICE_AC = '.ac' 				# Directive containing the frequency of an AC source and also used to indicate the type of circuit
-SPICE_DC = '.dc'				# Used to indicate the type of circuit
 
 MAX_FLOAT = sys.float_info.max * 1e-100		# Slightly lesser than python's maximum value to prevent errors
-MIN_FLOAT = sys.float_info.min * 1e100  	# Slightly more than python's maximum value to prevent errors 
 PI = np.pi 									# Storing value of pi as another constant
 THRESHOLD = float('1e-10')					# If a value falls below this threshold, then it is made 0
 
 
 # Checking for Valid commandline arguments
+## The netlist file needs to be given. Circuits are solved one after the other unless more processes are asked for with --jobs
+parser = argparse.ArgumentParser(description = "Solves the circuits in a netlist file and displays the nodal voltages and currents passing through independent voltage sources")
+parser.add_argument('netlist', help = "netlist file (or compiled circuit file) with the circuits to be solved")
+parser.add_argument('--compile', metavar = 'FILE', help = "parse the netlist file and store its circuits in a compiled circuit file, which can be given instead of the netlist file later")
+parser.add_argument('-j', '--jobs', type = int, default = 1, help = "number of processes used to solve the circuits (0 uses all the processors)")
+parser.add_argument('--cache', metavar = 'DIRECTORY', help = "directory in which results are stored so that circuits solved before aren't solved again")
+parser.add_argument('--cache-size', type = float, default = 1024, metavar = 'MB', help = "limit on the size of the cache, beyond which the least recently used results are removed")
+parser.add_argument('--incremental', metavar = 'DIRECTORY', help = "directory in which the factorisations and solutions of large DC circuits are kept, so that they are solved again quickly after small edits to the netlist file")
+parser.add_argument('-o', '--output', metavar = 'FILE', help = "file (.csv, .npz or .parquet) to which the nodal voltages and currents are written instead of being displayed")
+parser.add_argument('--waveforms', metavar = 'PREFIX', help = "prefix of the files to which waveforms of transients are written (default is the name of the netlist file, in the current directory)")
+parser.add_argument('--ordering', choices = ORDERINGS, default = DEFAULT_ORDERING, help = "fill reducing ordering of the unknowns used by sparse LU (default is %(default)s)")
+parser.add_argument('--ordering-report', action = 'store_true', help = "display the fill-in and operations of LU of the MNA matrix of each circuit for every ordering")
+parser.add_argument('--solver', choices = SOLVERS, default = DEFAULT_SOLVER, help = "method used to solve DC circuits, sparse LU or a Krylov method (default is %(default)s)")
+parser.add_argument('--preconditioner', choices = PRECONDITIONERS, default = DEFAULT_PRECONDITIONER, help = "preconditioner of the Krylov methods (default is %(default)s)")
+parser.add_argument('--tolerance', type = float, default = DEFAULT_TOLERANCE, help = "residual relative to the B vector at which the Krylov methods stop (default is %(default)s)")
+parser.add_argument('--profile', metavar = 'FILE', help = "JSON file to which the wall time, allocations and peak memory of each phase of every circuit are written")
+parser.add_argument('--max-iterations', type = int, default = DEFAULT_MAX_ITERATIONS, help = "limit on the iterations of the Krylov methods (default is %(default)s)")
+arguments = parser.parse_args()
+
+file_input = arguments.netlist
 
-## The number of commandline arguments is restricted to 2 - this python file and the netlist file
-if len(sys.argv) != 2:
-	print("Invalid number of arguments given. One file needs to be given.")
+## Here the type of file being entered is checked
+file_type = os.path.splitext(file_input)[1]
+if file_type not in (INPUT_FILE_TYPE, COMPILED_FILE_TYPE):
+	print("Incorrect file type. Only '.netlist' and '.cnet' type files are accepted.")
 	exit()
 
-file_input = sys.argv[1]
+## Compiling the netlist file. Nothing is solved here.
+if arguments.compile != None:
+	if file_type != INPUT_FILE_TYPE or os.path.splitext(arguments.compile)[1] != COMPILED_FILE_TYPE:
+		print("Only '.netlist' files can be compiled and only into '.cnet' files.")
+		exit()
 
-## Here the type of file being entered is checked
-if file_input[-8:] != INPUT_FILE_TYPE:
-	print("Incorrect file type. Only '.netlist' type files are accepted.")
+	print(Compile_Circuits(Read_Circuits(file_input), arguments.compile), "circuits have been compiled into", arguments.compile)
 	exit()
 
-## Checking if the file given by the user exists and is read if it exists
-try:
-	f = open(file_input)
-	lines = f.readlines()
-#	print(lines)		# This can be uncommented to see the lines being read
+if arguments.jobs < 0:
+	print("Invalid number of processes given. It has to be 0 or more.")
+	exit()
 
-except:
-	print("Unable to locate file.")
+if arguments.tolerance <= 0 or arguments.max_iterations <= 0:
+	print("Invalid tolerance or limit on iterations given. Both have to be more than 0.")
 	exit()
 
-f.close()		# File is closed
-
-
-# Here I am classifying the types of components on the basis of number and type of nodes
-## These lists are used only for pure DC circuit 
-element_type1 = ['R','L','C','V','I']
-element_type2 = ['E','G']
-element_type3 = ['H','F']
-
-
-# Defining a Class Component to store the tokens.
-## Function check_validity validates data stored regarding a component. 
-## The number of ports and dependencies need to be checked before passing them to an object of this Class
-class Component:
-	## Details about a component are to be stored in these variables
-	component_type = None
-	component_name = None
-	component_ports = []
-	component_dependencies = []
-	component_value = None
-
-	## Function to check validity of given tokens
-	def check_validity(self, index = None):
-		### Checking if the Port names are alpha-numeric
-		for port_name in self.component_ports:
-			if not port_name.isalnum():
-				print("Error: Invalid Port name (" , port_name, ") at line" , index, "in the netlist file")
-				print("\nOnly alpha-numeric node names are allowed")
-				exit()
-
-		### Checking for dependencies
-		if self.component_type in element_type3:
-			if self.component_dependencies[0][0] != 'V':
-				print("Error: Invalid dependency (", self.component_dependencies,") at line", index,".\nDependencies of current controlled sources need to start with V")
-				exit()
-
-	## Function to initialise an object of class Component
-	### Component's value is checked if its complex and has been converted into real when we deal with DC circuits
-	def __init__(self, init_name = None, init_ports = [], init_dependencies = [], init_value = None):
-		self.component_type = init_name[0]
-		self.component_name = init_name
-		self.component_ports = init_ports
-		self.component_dependencies = init_dependencies
-
-		try:
-			self.component_value = complex(init_value)
-		except:
-			print("Error: Invalid value given for", init_name,"in the netlist file")
-			print("\nValue has to be specified as a numeric or a string in scientific notation")
-			exit()
-
-
-# Function to solve linear equations given in the form of a matrix
-## If the solution is not unique then a Bool value will be returned instead of a vector
-def Solve_Linear_Equations(A_matrix, B_vector):
-	try:
-		vector_result = np.linalg.solve(A_matrix, B_vector)
-
-	except:
-		vector_result = False
-
-	return vector_result
-
-
-# Function to solve a purely DC circuit given the circuit's components
-def Solve_DC(circuit_components):
-	node_names = []			# List to store all the given node names and pseudo nodes (for current through voltage sources)
-
-	## For loop to identify size of MNA matrix
-	### Here I am including ground and later adding an equation V_GND = 0
-	for element in circuit_components:
-		for port in element.component_ports: 
-			if ('V_' + port) not in node_names:
-				node_names.append('V_' + port)
-
-		
-		### Pseudo nodes are being identified and added here and are given the name 'I_'+'node_name'
-		if element.component_type == 'V' or element.component_type == 'E' or element.component_type == 'H': # Need to do for controlled voltage sources
-			node_names.append('I_' + element.component_name)
-
-	## Numpy arrays are mutable data-types so size was pre-determined
-	mna_size = len(node_names)
-	b_vector = np.zeros((mna_size, 1), dtype = complex)				# All values are being treated as complex for compatibility 
-	mna_matrix = np.zeros((mna_size, mna_size), dtype = complex)
-
-	## For loop to Populate MNA matrix and the corresponding B vector
-	for element in circuit_components:
-		node1 = node_names.index('V_' + element.component_ports[0])
-		node2 = node_names.index('V_' + element.component_ports[1])
-
-		### Resistor's value is being added to the matrix
-		if element.component_type == 'R':
-			mna_matrix[node1, node1] += 1/element.component_value
-			mna_matrix[node1, node2] -= 1/element.component_value
-
-			mna_matrix[node2, node2] += 1/element.component_value
-			mna_matrix[node2, node1] -= 1/element.component_value
-
-		### Inductor's value is being added to the matrix. Here I am adding a factor to make its effective resistance at steady state close to 0.
-		elif element.component_type == 'L':
-			mna_matrix[node1, node1] += 1/(MIN_FLOAT * element.component_value)
-			mna_matrix[node1, node2] -= 1/(MIN_FLOAT * element.component_value)
-
-			mna_matrix[node2, node2] += 1/(MIN_FLOAT * element.component_value)
-			mna_matrix[node2, node1] -= 1/(MIN_FLOAT * element.component_value)		
-
-		### Capacitor's value is being added to the matrix. Here I am adding a factor to make its effective resistance at steady state extremely large.
-		elif element.component_type == 'C':
-			mna_matrix[node1, node1] += (MIN_FLOAT * element.component_value)
-			mna_matrix[node1, node2] -= (MIN_FLOAT * element.component_value)
-
-			mna_matrix[node2, node2] += (MIN_FLOAT * element.component_value)
-			mna_matrix[node2, node1] -= (MIN_FLOAT * element.component_value)	
-		
-		### Voltage source's value is being added to the the vector and the matrix is also modified.
-		#### Here I am assuming the first node to be at higher potential and the current flowing from the first node
-		elif element.component_type == 'V': 
-			pseudo_node = node_names.index('I_' + element.component_name)
-
-			mna_matrix[node1, pseudo_node] -= 1
-			mna_matrix[node2, pseudo_node] += 1
-
-			mna_matrix[pseudo_node, node1] += 1
-			mna_matrix[pseudo_node, node2] -= 1		
-
-			b_vector[pseudo_node] += element.component_value
-
-		### Current source's value is being added to the the vector
-		#### Here I am assuming that the current is flowing from the first node
-		elif element.component_type == 'I':
-			b_vector[node1] -= element.component_value
-			b_vector[node2] += element.component_value
-
-		### VCVS's value is being added to the matrix.
-		#### Here I am assuming the first node to be connected to positive terminal and the first dependent node to be at higher potential
-		elif element.component_type == 'E':
-			pseudo_node = node_names.index('I_' + element.component_name)
-			dependent_nodes = element.component_dependencies
-
-			#### Checking if the dependencies are present
-			if dependent_nodes[0] not in node_names or dependent_nodes[1] not in node_names:
-				print("VCVS (", element.component_name, ") has invalid dependencies.")
-				exit()
-
-			mna_matrix[node1, pseudo_node] -= 1
-			mna_matrix[node2, pseudo_node] += 1
-
-			mna_matrix[pseudo_node, node1] += 1
-			mna_matrix[pseudo_node, node2] -= 1
-			mna_matrix[pseudo_node, dependent_nodes[0]] -= element.component_value
-			mna_matrix[pseudo_node, dependent_nodes[1]] += element.component_value
-
-		### VCCS's value is being added to the matrix.
-		#### Here I am assuming the current to flow from the first node to the second node and the first dependent node to be at higher potential
-		elif element.component_type == 'G':
-			dependent_nodes = element.component_dependencies
+if arguments.output != None and os.path.splitext(arguments.output)[1] not in OUTPUT_FORMATS:
+	print("Incorrect type of output file. Only '.csv', '.npz' and '.parquet' files can be written.")
+	exit()
 
-			#### Checking if the dependencies are present
-			if dependent_nodes[0] not in node_names or dependent_nodes[1] not in node_names:
-				print("VCCS (", element.component_name, ") has invalid dependencies.")
-				exit()
-
-			mna_matrix[node1, dependent_nodes[0]] += element.component_value
-			mna_matrix[node1, dependent_nodes[1]] -= element.component_value
-	
-			mna_matrix[node2, dependent_nodes[0]] -= element.component_value
-			mna_matrix[node2, dependent_nodes[1]] += element.component_value
-
-		### CCVS's value is being added to the matrix.
-		#### Here I am assuming the first node to be connected to positive terminal
-		elif element.component_type == 'H':
-			pseudo_node = node_names.index('I_' + element.component_name)
-			dependent_current = 'I_' + element.component_dependencies
-
-			try:
-				dependent_pseudo_node = node_names.index(dependent_current)
-
-			except:
-				print("CCVS (", element.component_name, ") has invalid dependencies.")
-				exit()
-
-			mna_matrix[pseudo_node, node1] += 1
-			mna_matrix[pseudo_node, node2] -= 1
-
-			mna_matrix[node1, dependent_pseudo_node] -= element.component_value
-
-		### CCCS's value is being added to the matrix.
-		#### Here I am assuming the current to flow from the first node to the second node
-		elif element.component_type == 'F':
-			dependent_current = 'I_' + element_dependencies
-
-			try:
-				dependent_pseudo_node = node_names.index(dependent_current)
+if arguments.output != None and arguments.output.endswith('.parquet') and pyarrow == None:
+	print("Error: pyarrow is needed to write '.parquet' files. It can be installed with 'pip install pyarrow'.")
+	exit()
 
-			except:
-				print("CCVS (", element.component_name, ") has invalid dependencies.")
-				exit()
+if arguments.preconditioner == 'amg' and pyamg == None:
+	print("Error: pyamg is needed for the 'amg' preconditioner. It can be installed with 'pip install pyamg'.")
+	exit()
 
-			mna_matrix[node1, dependent_pseudo_node] += element.component_value
-			mna_matrix[node2, dependent_pseudo_node] -= element.component_value
+## Options of the solver which change the results. These are a part of the key of a result in the cache.
+solver_options = {'ordering': arguments.ordering, 'ordering_report': arguments.ordering_report}
+if arguments.solver != DEFAULT_SOLVER:
+	solver_options.update({'solver': arguments.solver, 'preconditioner': arguments.preconditioner, 'tolerance': arguments.tolerance, 'max_iterations': arguments.max_iterations})
 
+## Waveforms are written to the current directory by default, named after the netlist file
+waveform_prefix = arguments.waveforms if arguments.waveforms != None else os.path.basename(file_input)[:-len(file_type)]
 
-	## Additional modification to the matrix to make the potential of ground 0
-	node_gnd = node_names.index('V_GND')
-	mna_matrix[node_gnd, node_gnd] += 1
+result_cache = None
+if arguments.cache != None:
+	result_cache = ResultCache(arguments.cache, int(arguments.cache_size * 2**20))
 
-	## MNA matrix and vector are being passed to be solved. If it fails, then the function would return Boolean False instead of a vector
-	result = Solve_Linear_Equations(mna_matrix, b_vector)
+incremental_counts = dict.fromkeys(INCREMENTAL_KINDS, 0)		# Number of circuits (or parts of circuits) solved in each way by the incremental solver
 
-	## Checking type of result
-	if type(result) == bool:
-		print("Error: Inverse of matrix formed through MNA cannot be determined")
-		exit()
+## Phases are recorded from here on if --profile is given. Memory is traced only then since tracing slows down allocations.
+start_time = time.perf_counter()
+block_phases = {}		# Number of components and statistics of the parsing of each circuit block, against the line at which it starts
+profiled_blocks = []	# Statistics of the phases of each circuit block, in the order the blocks are given
+if arguments.profile != None:
+	Start_Profiling()
 
-	else:
-		return result, node_names			# Both are sent for convenience sake
-
-
-# Function to solve a circuit which may have AC components. In this code this is used such that there is only one active power source in the circuit
-def Solve_AC(circuit_components, f):
-	node_names = []					# List to store all the given node names and pseudo nodes (for current through voltage sources)
-
-	## For loop to identify size of MNA matrix
-	### Here I am including ground and later adding an equation V_GND = 0
-	for element in circuit_components:
-		for port in element.component_ports: # Gnd is included
-			if ('V_' + port) not in node_names:
-				node_names.append('V_' + port)
-
-		### Pseudo nodes are being identified and added here and are given the name 'I_'+'node_name'
-		if element.component_type == 'V' or element.component_type == 'E' or element.component_type == 'H': # Need to do for controlled voltage sources
-			node_names.append('I_' + element.component_name)
-
-	## Numpy arrays are mutable data-types so size was pre-determined
-	mna_size = len(node_names)
-	b_vector = np.zeros((mna_size, 1), dtype = complex)				# All values are being treated as complex for compatibility 
-	mna_matrix = np.zeros((mna_size, mna_size), dtype = complex)
-
-	## For loop to Populate MNA matrix and the corresponding B vector
-	for element in circuit_components:
-		node1 = node_names.index('V_' + element.component_ports[0])
-		node2 = node_names.index('V_' + element.component_ports[1])
-
-		### Resistor's value is being added to the matrix
-		if element.component_type == 'R':
-			mna_matrix[node1, node1] += 1/element.component_value
-			mna_matrix[node1, node2] -= 1/element.component_value
-
-			mna_matrix[node2, node2] += 1/element.component_value
-			mna_matrix[node2, node1] -= 1/element.component_value
-
-		### Inductor's value is being added to the matrix. Here I am adding a factor to make its effective resistance at steady state close to 0.
-		elif element.component_type == 'L':
-			mna_matrix[node1, node1] += 1/( (1j) * 2*PI*f * element.component_value )
-			mna_matrix[node1, node2] -= 1/( (1j) * 2*PI*f * element.component_value )
-
-			mna_matrix[node2, node2] += 1/( (1j) * 2*PI*f * element.component_value )
-			mna_matrix[node2, node1] -= 1/( (1j) * 2*PI*f * element.component_value ) 					
-
-		### Capacitor's value is being added to the matrix. Here I am adding a factor to make its effective resistance at steady state extremely large.
-		elif element.component_type == 'C':
-			mna_matrix[node1, node1] += ( (1j) * 2*PI*f * element.component_value )
-			mna_matrix[node1, node2] -= ( (1j) * 2*PI*f * element.component_value )
-
-			mna_matrix[node2, node2] += ( (1j) * 2*PI*f * element.component_value )
-			mna_matrix[node2, node1] -= ( (1j) * 2*PI*f * element.component_value )
-
-		### Voltage source's value is being added to the the vector and the matrix is also modified.
-		#### Here I am assuming the first node to be at higher potential and the current flowing from the first node
-		elif element.component_type == 'V':
-			pseudo_node = node_names.index('I_' + element.component_name)
-
-			mna_matrix[node1, pseudo_node] = -1
-			mna_matrix[node2, pseudo_node] = 1
-
-			mna_matrix[pseudo_node, node1] = 1
-			mna_matrix[pseudo_node, node2] = -1		
-
-			b_vector[pseudo_node] = element.component_value
-
-		### Current source's value is being added to the the vector
-		#### Here I am assuming that the current is flowing from the first node
-		elif element.component_type == 'I':
-			b_vector[node1] -= element.component_value
-			b_vector[node2] += element.component_value
-
-		### VCVS's value is being added to the matrix.
-		#### Here I am assuming the first node to be connected to positive terminal and the first dependent node to be at higher potential
-		elif element.component_type == 'E':
-			pseudo_node = node_name.index('I_' + element.component_name)
-			dependent_nodes = element.component_dependencies
-
-			#### Checking if the dependencies are present
-			if dependent_nodes[0] not in node_names or dependent_nodes[1] not in node_names:
-				print("VCVS (", element.component_name, ") has invalid dependencies.")
-				exit()
-
-			mna_matrix[node1, pseudo_node] = -1
-			mna_matrix[node2, pseudo_node] = 1
-
-			mna_matrix[pseudo_node, node1] = 1
-			mna_matrix[pseudo_node, node2] = -1
-			mna_matrix[pseudo_node, dependent_nodes[0]] = -(element.component_value)
-			mna_matrix[pseudo_node, dependent_nodes[1]] = element.component_value
-
-		### VCCS's value is being added to the matrix.
-		#### Here I am assuming the first node to be connected to positive terminal and the first dependent node to be at higher potential
-		elif element.component_type == 'G':
-			dependent_nodes = element.component_dependencies
-
-			#### Checking if the dependencies are present
-			if dependent_nodes[0] not in node_names or dependent_nodes[1] not in node_names:
-				print("VCCS (", element.component_name, ") has invalid dependencies.")
-				exit()
-
-			mna_matrix[node1, dependent_nodes[0]] += element.component_value
-			mna_matrix[node1, dependent_nodes[1]] -= element.component_value
-	
-			mna_matrix[node2, dependent_nodes[0]] -= element.component_value
-			mna_matrix[node2, dependent_nodes[1]] += element.component_value
-
-		### CCVS's value is being added to the matrix.
-		#### Here I am assuming the first node to be connected to positive terminal
-		elif element.component_type == 'H':
-			pseudo_node = node_names.index('I_' + element.component_name)
-			dependent_current = 'I_' + element.component_dependencies
-
-			try:
-				dependent_pseudo_node = node_names.index(dependent_current)
-
-			except:
-				print("CCVS (", element.component_name, ") has invalid dependencies.")
-				exit()
-
-			mna_matrix[pseudo_node, node1] += 1
-			mna_matrix[pseudo_node, node2] -= 1
-
-			mna_matrix[node1, dependent_pseudo_node] -= element.component_value
-
-		### CCCS's value is being added to the matrix.
-		#### Here I am assuming the current to flow from the first node to the second node
-		elif element.component_type == 'F':
-			dependent_current = 'I_' + element_dependencies
-
-			try:
-				dependent_pseudo_node = node_names.index(dependent_current)
 
-			except:
-				print("CCVS (", element.component_name, ") has invalid dependencies.")
-				exit()
+# Function to display the nodal voltages and currents through the voltage sources of a circuit with only DC sources
+def Display_DC(circuit_result):
+	print("MNA has been performed successfully.")
+	print("Voltage of GND node is taken as 0 for reference\n")
 
-			mna_matrix[node1, dependent_pseudo_node] += element.component_value
-			mna_matrix[node2, dependent_pseudo_node] -= element.component_value
-		else:
-			print("Not handled")
-			exit()
 
+	## For loop for displaying each nodal voltages
+	for node_index, node in enumerate(circuit_result.node_names):
+		if node[0] == 'V' and node != 'V_GND':
+			print("Voltage at node", node[2:], "is {:.3} V".format(circuit_result.results[0, node_index].real))
 
-	## Additional modification to the matrix to make the potential of ground 0
-	node_gnd = node_names.index('V_GND')
-	mna_matrix[node_gnd, node_gnd] += 1
 
-	## MNA matrix and vector are being passed to be solved. If it fails, then the function would return Boolean False instead of a vector
-	result = Solve_Linear_Equations(mna_matrix, b_vector)
+	## For loop for displaying each current passing through voltage source
+	for node_index, node in enumerate(circuit_result.node_names):
+		if node[0] == 'I':
+			print("Current passing through the source", node[2:], "is {:.3} A".format(circuit_result.results[0, node_index].real))
 
-	## Checking type of result
-	if type(result) == bool:
-		print("Error: Inverse of matrix formed through MNA not found")
-		exit()
 
-	else:
-		return result, node_names			# Both are sent for convenience sake
+# Function to display the nodal voltages and currents through the voltage sources of a circuit which has sources at different frequencies
+## The response at each frequency is displayed as a sinusoid and they are added together
+def Display_AC(circuit_result):
+	print("Modified Nodal Analysis has been performed successfully.")
+	print("Voltage of GND node is taken as 0 for reference\n")
 
 
-# Checking if spice codes are present in the netlist file. 
-no_circuit = True		# Checks if there is a Spice code in the netlist file
-Begin_circuit = 0		# Stores the line at which a Spice code starts. Default value is 0 which is used to check if a Spice code has started.
-source_frequencies = {} # Dictionary variable to store frequences of AC sources. Its used in other parts of the code for calculative purposes
+	## For loop for displaying each nodal voltage
+	### Multiple if statements used to address various cases
+	for node_index, node in enumerate(circuit_result.node_names):
+		if node[0] == 'V' and node != 'V_GND':
+			nodal_voltages = {node:[]}
 
-for i in range(len(lines)):
-	## Removing the comments and trailing whitespaces. Note that there cannot be components with names containing '#'. 
-	if lines[i].find('#') >= 0:
-		lines[i] = lines[i][:lines[i].find('#')]
-	
-	lines[i] = lines[i].strip()
+			for point, frequency in enumerate(circuit_result.frequencies):
+				nodal_voltages[node].append([ frequency , circuit_result.results[point, node_index] ])
 
-	## Searching for SPICE_BEGIN in the netlist file which indicates the start of the Spice code
-	if lines[i] == SPICE_BEGIN:
-		if Begin_circuit == 0:	
-			Begin_circuit = i+1
+			print("Voltage at node", node[2:], "is ", end="")
 
-		else:
-			print("Error: Previous Spice code which started at", Begin_circuit,"hasn't ended before the new start of another one at", i+1)
- 
-	## Searching for SPICE_END in the netlist file which indicates the end of the Spice code which starts at line Begin_circuit
-	if lines[i] == SPICE_END:
-		if Begin_circuit > 0:
-			no_circuit = False
-			Begin_circuit = 0
+			for i in range(len(nodal_voltages[node])):
+				omega = 2 * PI * nodal_voltages[node][i][0]
+				voltage = nodal_voltages[node][i][1]
+				magnitude = abs(voltage)
+				### Adding 0 turns an imaginary part of -0 into +0, so that negative values are always shown at 180 deg whatever the order of elimination
+				phase = cmath.phase(voltage + 0) * (180/PI)
+				
+				if magnitude < THRESHOLD:
+					magnitude = float(0)
+					phase = float(0)
 
-		else:
-			print("Error: Encountered end of a Spice code at line", i+1,"without the start of a Spice code.")
-			exit()
-
-	## Searching for SPICE_AC in the netlist file which contains the frequency of an AC source
-	### It is checked if a block of Spice code was identified previously
-	if lines[i][:3] ==  SPICE_AC:
-		if Begin_circuit == 0 and not no_circuit:
-			words = lines[i].split()
-
-			if len(words) == 3 and ( words[1][0] == 'V' or words[1][0] == 'I'):
-				if words[1] in source_frequencies:
-					print("Error: Reassignment of frequency to AC source", words[1], "at line", i+1)
-					exit()
-
-				try:
-					source_frequencies[words[1]] = float(words[2])
-				except:
-					print("Error: Specified frequency at line", i+1, "is not valid.")
-					print("\nValue has to be specified as a numeric or a string in scientific notation")
-					exit()
-			else:
-				print("Error: Syntax error at line", i+1)
-				exit()
+				if abs(phase) < THRESHOLD:
+					phase = float(0)
 
-		else:
-			print("Error: Encountered an unexpected .ac directive at line", i+1)
-			exit()			
+				if phase != 0:
+					print("{:.3}*cos({:.3}t+({:.3} deg))".format(magnitude, omega, phase),sep='', end='')
 
+				else:
+					if magnitude != 0:
+						if omega != 0:
+							print("{:.3}*cos({:.3}t)".format(magnitude, omega),sep='', end='')
 
-## If a Spice code hasn't been ended, then it prints an error
-if Begin_circuit != 0:
-	print("Error: End of Spice code missing for Start code present at line", Begin_circuit)
-	exit()
+						else:
+							print("{:.3}".format(magnitude),sep='', end='')
 
-## If a Spice code was not found in the netlist file then it prints an error. 
-### This is not executed if the previous 'if' block is executed so it prints if there is no SPICE_BEGIN or SPICE_END
-if no_circuit:
-	print("The given netlist file has no identifiable Spice code.")
-	exit()
+					else:
+						print("0",sep='', end='')
 
+				if i != len(nodal_voltages[node])-1:
+					print(' + ', end="")
+				else:
+					print(" V")
 
-# Function to solve a circuit of given type and display nodal voltages and currents through the voltage sources
-## Here AC type circuit means that there 'might' have AC sources and DC type circuits have only DC sources
-def Solve_circuit(circuit_components, circuit_type):
 
-	## Solving for AC type circuit
-	### Sources operating at multiple frequencies, including DC sources, have been accounted for
-	if circuit_type == SPICE_AC:
-		sources = {}			# Dictionary to store all independent power sources with their values
-		final_result = {}		# Dictionary to store all the frequencies of the power sources with the MNA output values
+	## For loop for displaying each current passing through voltage source
+	### Multiple if statements used to address various cases
+	for node_index, node in enumerate(circuit_result.node_names):
+		if node[0] == 'I':
+			currents = {node:[]}
 
-		### For loop to store power sources and their values and to remove all the sources from the circuit to enable solving through superposition
-		for element in circuit_components:
-			if (element.component_type == 'V' or element.component_type == 'I'):
-				sources[element.component_name] = element.component_value
-				circuit_components[circuit_components.index(element)].component_value = 0
+			for point, frequency in enumerate(circuit_result.frequencies):
+				currents[node].append([ frequency , circuit_result.results[point, node_index] ])
 
+			print("Current passing through the source", node[2:], "is ", end="")
 
-		### For loop to perform MNA by superposition by considering individual power sources
-		#### Here same frequencies are added together and stored in final_result
-		#### Though the loop needs to go only over those elements named in sources{}, the element object is required for indexing purposes.
-		for element in circuit_components:
+			for i in range(len(currents[node])):
+				omega = 2 * PI * currents[node][i][0]
+				current = currents[node][i][1]
+				magnitude = abs(current)
+				phase = cmath.phase(current + 0) * (180/PI)
 
-			if element.component_name in sources:
-				circuit_components[circuit_components.index(element)].component_value = sources[element.component_name]
+				if magnitude < THRESHOLD:
+					magnitude = float(0)
+					phase = float(0)
 
-				frequency = source_frequencies[element.component_name]					# Variable to act like an alias
+				if abs(phase) < THRESHOLD:
+					phase = float(0)
 
-				if frequency == 0:
-					temp_result, node_names = Solve_DC(circuit_components)				# Temporary variables to get the values
+				if phase != 0:
+					print("{:.3}*cos({:.3}t+({:.3} deg))".format(magnitude, omega, phase),sep='', end='')
 
 				else:
-					temp_result, node_names = Solve_AC(circuit_components, frequency)	# Temporary variables to get the values
+					if magnitude != 0:
+						if omega != 0:
+							print("{:.3}*cos({:.3}t)".format(magnitude, omega),sep='', end='')
 
-				circuit_components[circuit_components.index(element)].component_value = 0			
+						else:
+							print("{:.3}".format(magnitude),sep='', end='')
 
-				if frequency in final_result:
-					final_result[frequency] += temp_result
+					else:
+						print("0",sep='', end='')
 
+				if i != len(currents[node])-1:
+					print(' + ', end="")
 				else:
-					final_result[frequency] = temp_result
+					print(" A")
 
 
-		### Displaying all the unknown voltages of the nodes and currents passing through voltage source
-		print("Modified Nodal Analysis has been performed successfully.")
-		print("Voltage of GND node is taken as 0 for reference\n")
-
-
-		#### For loop for displaying each nodal voltage
-		##### Multiple if statements used to address various cases
-		for node in node_names:
-			if node[0] == 'V' and node != 'V_GND':
-				nodal_voltages = {node:[]}
 
-				for source_name in source_frequencies:
-					nodal_voltages[node].append([ source_frequencies[source_name] , final_result[source_frequencies[source_name]][node_names.index(node)][0] ])
+# Function to display the nodal voltages and currents through the voltage sources of a circuit at each frequency of a sweep
+def Display_Sweep(circuit_result):
+	frequencies = circuit_result.frequencies
+	node_names = circuit_result.node_names
 
-				print("Voltage at node", node[2:], "is ", end="")
+	print("AC sweep has been performed successfully over", len(frequencies), "frequencies.")
+	print("Voltage of GND node is taken as 0 for reference")
 
-				for i in range(len(nodal_voltages[node])):
-					omega = 2 * PI * nodal_voltages[node][i][0]
-					voltage = nodal_voltages[node][i][1]
-					magnitude = abs(voltage)
-					phase = cmath.phase(voltage) * (180/PI)
-					
-					if magnitude < THRESHOLD:
-						magnitude = float(0)
-						phase = float(0)
+	magnitudes = abs(circuit_result.results)
+	phases = np.angle(circuit_result.results + 0, deg = True)		# + 0 makes imaginary parts of -0 into +0 (see Display_AC())
+	phases[magnitudes < THRESHOLD] = 0
 
-					if abs(phase) < THRESHOLD:
-						phase = float(0)
+	for point in range(len(frequencies)):
+		print("\nAt frequency {:.3} Hz".format(frequencies[point]))
 
-					if phase != 0:
-						print("{:.3}*cos({:.3}t+({:.3} deg))".format(magnitude, omega, phase),sep='', end='')
+		for node_index, node in enumerate(node_names):
+			if node[0] == 'V' and node != 'V_GND':
+				print("Voltage at node", node[2:], "is {:.3} V at {:.3} deg".format(magnitudes[point, node_index], phases[point, node_index]))
 
-					else:
-						if magnitude != 0:
-							if omega != 0:
-								print("{:.3}*cos({:.3}t)".format(magnitude, omega),sep='', end='')
+		## Currents through inductors are also unknowns here but only the currents through the sources are displayed
+		for node_index, node in enumerate(node_names):
+			if node[0] == 'I' and node[2] != 'L':
+				print("Current passing through the source", node[2:], "is {:.3} A at {:.3} deg".format(magnitudes[point, node_index], phases[point, node_index]))
 
-							else:
-								print("{:.3}".format(magnitude),sep='', end='')
 
-						else:
-							print("0",sep='', end='')
+# Function to display the values of the nodal voltages and currents through the voltage sources at the end of a transient
+## The whole waveforms are only written to the file and are not displayed
+def Display_Transient(circuit_result):
+	print("Transient analysis has been performed successfully.")
+	print("Waveforms have been written to", circuit_result.waveform_file)
+	print("Voltage of GND node is taken as 0 for reference")
+	print("\nAt time {:.3} s".format(circuit_result.frequencies[0]))
 
-					if i != len(nodal_voltages[node])-1:
-						print(' + ', end="")
-					else:
-						print(" V")
+	for node_index, node in enumerate(circuit_result.node_names):
+		if node[0] == 'V' and node != 'V_GND':
+			print("Voltage at node", node[2:], "is {:.3} V".format(circuit_result.results[0, node_index]))
 
+	## Currents through inductors are also unknowns here but only the currents through the sources are displayed
+	for node_index, node in enumerate(circuit_result.node_names):
+		if node[0] == 'I' and node[2] != 'L':
+			print("Current passing through the source", node[2:], "is {:.3} A".format(circuit_result.results[0, node_index]))
 
-		#### For loop for displaying each current passing through voltage source
-		##### Multiple if statements used to address various cases
-		for node in node_names:
-			if node[0] == 'I':
-				currents = {node:[]}
 
-				for source_name in source_frequencies:
-					currents[node].append([ source_frequencies[source_name] , final_result[source_frequencies[source_name]][node_names.index(node)][0] ])
+# Function to display the results of a circuit at each point of a parameter step
+## The result at each point is displayed in the same way as that of a DC or an AC circuit
+def Display_Step(circuit_result):
+	## Points at which the MNA matrix is singular have NaN results (see Solve_Step_At())
+	singular = np.isnan(circuit_result.results).any(axis = (1, 2))
 
-				print("Current passing through the source", node[2:], "is ", end="")
-
-				for i in range(len(currents[node])):
-					omega = 2 * PI * currents[node][i][0]
-					current = currents[node][i][1]
-					magnitude = abs(current)
-					phase = cmath.phase(current) * (180/PI)
+	if np.any(singular):
+		print("Parameter step has been performed over", len(circuit_result.step_values), "points, of which the MNA matrix is singular at", np.count_nonzero(singular), "points.")
+	else:
+		print("Parameter step has been performed successfully over", len(circuit_result.step_values), "points.")
 
-					if magnitude < THRESHOLD:
-						magnitude = float(0)
-						phase = float(0)
+	for point, step_values in enumerate(circuit_result.step_values):
+		print("\nAt point", point + 1, "with", ", ".join("{} = {:.3}".format(step_name, step_value) for step_name, step_value in zip(circuit_result.step_names, step_values)))
 
-					if abs(phase) < THRESHOLD:
-						phase = float(0)
+		if singular[point]:
+			print("Error: Inverse of matrix formed through MNA cannot be determined")
+			continue
 
-					if phase != 0:
-						print("{:.3}*cos({:.3}t+({:.3} deg))".format(magnitude, omega, phase),sep='', end='')
+		point_result = CircuitResult(circuit_result.begin_line, circuit_result.analysis, circuit_result.node_names, circuit_result.frequencies, circuit_result.results[point])
 
-					else:
-						if magnitude != 0:
-							if omega != 0:
-								print("{:.3}*cos({:.3}t)".format(magnitude, omega),sep='', end='')
+		if point_result.analysis == ANALYSIS_AC:
+			Display_AC(point_result)
+		else:
+			Display_DC(point_result)
 
-							else:
-								print("{:.3}".format(magnitude),sep='', end='')
 
-						else:
-							print("0",sep='', end='')
+# Function to display the DC transfer function from an independent source to a node, along with its poles and zeros for .pz
+## Gain is in V/V from a voltage source and in V/A from a current source. Poles and zeros are complex frequencies in rad/s.
+def Display_Transfer_Function(circuit_result):
+	output_node, source_name = circuit_result.transfer_names
+	gain, input_resistance, output_resistance = circuit_result.results[0].real
+	gain_unit = "V/V" if source_name.split('.')[-1][0] == 'V' else "V/A"
 
-					if i != len(currents[node])-1:
-						print(' + ', end="")
-					else:
-						print(" A")
+	print("Transfer function from", source_name, "to the voltage at node", output_node, "has been found.")
 
+	if np.isnan(gain):
+		print("DC gain cannot be determined since the MNA matrix at DC is singular (there is a pole at 0)")
 	else:
-		final_result, node_names = Solve_DC(circuit_components)
-
-		### Displaying all the unknown voltages of the nodes and currents passing through voltage source
-		print("MNA has been performed successfully.")
-		print("Voltage of GND node is taken as 0 for reference\n")
-
-
-		#### For loop for displaying each nodal voltages
-		for node in node_names:
-			if node[0] == 'V' and node != 'V_GND':
-				print("Voltage at node", node[2:], "is {:.3} V".format(final_result[node_names.index(node)][0].real))
+		print("DC gain is {:.3} {}".format(gain, gain_unit))
+		print("Input resistance at the source", source_name, "is {:.3} ohm".format(input_resistance))
+		print("Output resistance at node", output_node, "is {:.3} ohm".format(output_resistance))
 
+	if circuit_result.analysis != ANALYSIS_PZ:
+		return
 
-		#### For loop for displaying each current passing through voltage source
-		for node in node_names:
-			if node[0] == 'I':
-				print("Current passing through the source", node[2:], "is {:.3} A".format(final_result[node_names.index(node)][0].real))
+	for name, roots in (("Poles", circuit_result.poles), ("Zeros", circuit_result.zeros)):
+		print("\n" + name, "of the transfer function:" if len(roots) != 0 else "of the transfer function: none")
 
+		for root in roots:
+			imaginary = root.imag if abs(root.imag) >= THRESHOLD * max(abs(root), 1) else float(0)
+			print("{:.6} {} j{:.6} rad/s".format(root.real, '-' if imaginary < 0 else '+', abs(imaginary)))
 
 
-# List to collect all the different and valid circuits. 
-## This variable is used only for storing purpose and is not used in this code. It can be used for analysing multiple circuits (if its possible)
-collect_circuits = []
+# Function to display the nonzeros in L and U (fill-in included) and the operations of LU of the MNA matrix for each ordering
+## Savings are given with respect to the natural ordering, i.e. the order in which the nodes are given in the netlist file
+def Display_Ordering_Report(ordering_report):
+	natural = {ordering: (nonzeros, flops) for ordering, nonzeros, flops in ordering_report}.get('natural')
 
-# Parsing each line and extracting tokens
-for i in range(len(lines)-1):
-	## Searching for SPICE_BEGIN in the netlist file
-	if lines[i] == SPICE_BEGIN:
-		circuit_components = []		# Variable to store the components and their tokens
-		spice_lines = []			# Variable to store the lines of the spice code line by line for display purpose
-		element_array = []			# Variable to collect all the names of the elements to prevent redefinition
-		FLAG_GND = False 			# Variable to indicate if node GND is present
+	print("Sparse LU of the MNA matrix with each ordering of the nodes:")
+	for ordering, nonzeros, flops in ordering_report:
+		if natural != None and ordering != 'natural':
+			print("{:>8}: {} nonzeros in L and U, {:.3} operations ({:.1f}% fewer nonzeros, {:.1f}% fewer operations than natural)".format(ordering, nonzeros, float(flops), 100 * (1 - nonzeros / max(natural[0], 1)), 100 * (1 - flops / max(natural[1], 1))))
+		else:
+			print("{:>8}: {} nonzeros in L and U, {:.3} operations".format(ordering, nonzeros, float(flops)))
 
-		## If SPICE_BEGIN has been identified the lines are syntactically checked till a SPICE_END has been encountered
-		for j in range(i+1,len(lines)):
-			words = lines[j].split()		# Variable to store each line as a word array
+	print("")
 
-			if len(words) == 0:		# If there are no words in the line, then we move to the next line
-				continue
 
-			### Each line is checked if its the end of the Spice code starting at i
-			if words[0] == SPICE_END:
-				if not FLAG_GND:			# If GND node wasn't found then error is displayed
-					print("Error: No component connected to GND found.")
-					exit()
+# Function to display the iterations taken by a Krylov method and the residual it left
+def Display_Solver_Report(solver_report):
+	method, preconditioner, iterations, residual, converged = solver_report
 
-				collect_circuits.append(circuit_components)
-				print("\nSpice code starting at line", i+1,"verified.\n")
-				break ##
-			
-			element_name = words[0]			# All the components have the first their name as the first token
+	if converged:
+		print("{} with {} preconditioner converged in {} iterations with a relative residual of {:.3}".format(method, preconditioner, iterations, residual))
+	else:
+		print("Error: {} with {} preconditioner did not converge in {} iterations (relative residual of {:.3})".format(method, preconditioner, iterations, residual))
 
-			### First, it is checked if the identified Spice code is for an AC circuit by checking if the number of AC sources is more than 0
-			#### If true, a different syntax is checked for voltage and current sources based on if its AC or DC
-			#### The DC component is also stored in source_frequencies{} with frequency as 0
-			if len(source_frequencies) != 0 and ( words[0][0] == 'V' or words[0][0] == 'I'):
-				if words[3] == 'ac' and len(words) == 6:
-					if words[0] not in source_frequencies:
-						print("Error: AC source with unassigned frequency at line", j+1)
-						exit()
 
-					else:
-						element_ports = [words[1], words[2]]
+# Function to display the result of a circuit according to the analysis which was performed on it
+## If an output file is being written, the values are written to it instead of being displayed. Reports and errors are still displayed.
+def Display_Result(circuit_result, result_writer = None):
+	print("\nSpice code starting at line", circuit_result.begin_line,"verified.\n")
 
-						try:
-							phase = float(words[5])
-						except:
-							print("Error: Phase value given incorrectly at line", j+1)
-							exit()
+	if circuit_result.ordering_report != None:
+		Display_Ordering_Report(circuit_result.ordering_report)
 
-						element_dependencies = []
-						element_value = float(words[4]) * np.exp(1j*PI*(phase/180)) * 0.5
+	if circuit_result.solver_report != None:
+		Display_Solver_Report(circuit_result.solver_report)
 
-				elif words[3] == 'dc' and len(words) == 5:
-					element_ports = [words[1], words[2]]
-					element_dependencies = []
-					element_value = words[4]
+	if circuit_result.reduction_report != None:
+		full_size, reduced_size, reduction_error = circuit_result.reduction_report
+		print("Solved on a reduced model of", reduced_size, "unknowns in place of the", full_size, "unknowns of the circuit")
 
-					source_frequencies[element_name] = 0
+		if reduction_error == None:
+			print("Error of the reduced model could not be estimated since the circuit could not be solved at any of the frequencies checked\n")
+		elif reduction_error > REDUCE_TOLERANCE:
+			print("Warning: Estimated error of the reduced model is {:.3} of the largest value of its outputs. The results may not be accurate, and a higher order may be given in .reduce\n".format(reduction_error))
+		else:
+			print("Estimated error of the reduced model is {:.3} of the largest value of its outputs\n".format(reduction_error))
 
-				else:
-					print("Error: Incorrect syntax for power source at line", j+1)
-					exit()
+	if circuit_result.topology_errors != None:
+		for error in circuit_result.topology_errors:
+			print(error)
 
-			### Then onwards, we check with regular syntax (common to both AC and DC circuit) and also skip checking voltage and current sources if the circuit is an AC circuit
+	elif not circuit_result.solved and circuit_result.analysis == ANALYSIS_OP:
+		print("Error: Newton-Raphson iterations for the operating point did not converge")
 
-			#### Checking of components of type 1
-			if words[0][0] in element_type1:
-				if len(source_frequencies) != 0 and ( words[0][0] == 'V' or words[0][0] == 'I'):
-					if words[3] == 'ac' and len(words) == 6:
-						if words[0] not in source_frequencies:
-							print("Error: AC source with unassigned frequency at line", j+1)
-							exit()
+	elif not circuit_result.solved and circuit_result.solver_report != None:
+		pass		### The error has been given along with the report of the iterations
 
-						else:
-							element_ports = [words[1], words[2]]
+	elif not circuit_result.solved and circuit_result.analysis in (ANALYSIS_TF, ANALYSIS_PZ):
+		print("Error: Transfer function cannot be determined since the MNA matrix at DC is singular or its poles and zeros could not be found")
 
-							try:
-								phase = float(words[5])
-							except:
-								print("Error: Phase value given incorrectly at line", j+1)
-								exit()
+	elif not circuit_result.solved:
+		print("Error: Inverse of matrix formed through MNA cannot be determined")
 
-							element_dependencies = []
-							element_value = float(words[4]) * np.exp(1j*PI*(phase/180)) * 0.5
+	elif circuit_result.analysis in (ANALYSIS_TF, ANALYSIS_PZ):
+		Display_Transfer_Function(circuit_result)
 
-					elif words[3] == 'dc' and len(words) == 5:
-						element_ports = [words[1], words[2]]
-						element_dependencies = []
-						element_value = words[4]
+	elif result_writer != None:
+		result_writer.write(circuit_result)
+		print("Results have been written to", result_writer.output_file)
 
-					else:
-						print("Error: Incorrect syntax for power source at line", j+1)
-						exit()
+	elif circuit_result.step_names != None:
+		Display_Step(circuit_result)
 
-				elif len(words) == 4:
-					element_ports = [words[1], words[2]]
-					element_dependencies = []
-					element_value = words[3]
+	elif circuit_result.analysis == ANALYSIS_SWEEP:
+		Display_Sweep(circuit_result)
 
-				else:
-					print("Error: Incorrect syntax at line", j+1,". Incorrect set of tokens given for the component.")
-					exit()					
+	elif circuit_result.analysis == ANALYSIS_TRAN:
+		Display_Transient(circuit_result)
 
-			#### Checking of components of type 2
-			elif words[0][0] in element_type2:
-				if len(words) == 6:
-					element_ports = [words[1], words[2]]
-					element_dependencies = [words[3], words[4]]
-					element_value = words[5]
+	elif circuit_result.analysis == ANALYSIS_OP:
+		if circuit_result.iterations != None:
+			print("Operating point has been found in", circuit_result.iterations, "Newton-Raphson iterations.")
 
-				else:
-					print("Error: Incorrect syntax at line", j+1,". Incorrect set of tokens given for the component.")
-					exit()					
+		Display_DC(circuit_result)
 
-			#### Checking of components of type 3
-			elif words[0][0] in element_type3:
-				if len(words) == 5:
-					element_ports = [words[1], words[2]]
-					element_dependencies = [words[3]]
-					element_value = words[4]
+	elif circuit_result.analysis == ANALYSIS_AC:
+		Display_AC(circuit_result)
 
-				else:
-					print("Error: Incorrect syntax at line", j+1,". Incorrect set of tokens given for the component.")
-					exit()
+	else:
+		Display_DC(circuit_result)
 
-			#### If the type of component is not valid
-			else:
-				print("""Error: Type-error in the type of component in line""", j+1,""".
-					Accepted types are Resistor(R), Capacitor(C), Inductor(I), Voltage source(V), Current source(I), VCVS(E), VCCS(G), CCVS(H) and CCCS(F).
-					The component's name should start with the given associated character.""")
-				exit()
 
-			### Checking if any element is being redefined
-			if element_name in element_array:
-				print("Error: Redefinition of", element_name," at line", j+1)
-				exit()
+# Reading the netlist file and solving the circuits in it
+## Circuits are read one at a time along with the .ac directives given after them and are solved independently of each other.
+## Results are displayed in the order the circuits are given in the netlist file, even when they are solved by many processes.
+## Circuits which are found in the cache aren't solved again. Compiled circuit files are memory mapped instead of being parsed.
+## Large DC circuits are solved from the states of their last solutions if --incremental is given.
+## With --output, the results are written to the output file as they are solved rather than displayed.
+circuit_blocks = Load_Circuits(file_input) if file_type == COMPILED_FILE_TYPE else Read_Circuits(file_input)
+if arguments.profile != None:
+	circuit_blocks = Profile_Blocks(circuit_blocks, block_phases)
 
-			else:
-				element_array.append(element_name)
+result_writer = ResultWriter(arguments.output) if arguments.output != None else None
 
-			### If GND node is encountered, flag is set True
-			if element_ports[0] == 'GND' or element_ports[1] == 'GND':
-				FLAG_GND = True
+for circuit_result in Solve_Batch(circuit_blocks, None if arguments.jobs == 0 else arguments.jobs, cache = result_cache, solver_options = solver_options, waveform_prefix = waveform_prefix, incremental = arguments.incremental):
+	with Phase('display'):
+		Display_Result(circuit_result, result_writer)
 
+	if arguments.profile != None:
+		components, parse_phases = block_phases.pop(circuit_result.begin_line, (0, None))
+		profiled_blocks.append((circuit_result.begin_line, components, len(circuit_result.node_names), Merge_Phases(parse_phases, circuit_result.phases, Take_Phases())))
 
-			### All the values are stored in the class object and the tokens are checked for their validity.
-			component_details = Component(element_name, element_ports, element_dependencies, element_value)
-			component_details.check_validity(j+1)
+	if circuit_result.incremental_counts != None:
+		for kind, count in circuit_result.incremental_counts.items():
+			incremental_counts[kind] += count
 
-			### If check_validity() failed then the program exits. So the component details are stored only if it has passed.
-			circuit_components.append(component_details)
+if result_writer != None and not result_writer.close():
+	print("\nNo circuit has been solved, so", result_writer.output_file, "has been left as it was")
 
-		### After all the elements have been collected, then we pass it to Solve_circuit() along with the parameter to tell if its an AC or DC circuit
-		if len(source_frequencies) != 0:
-			Solve_circuit(circuit_components, SPICE_AC)
+if result_cache != None:
+	print("\nResult cache:", result_cache.hits, "hits and", result_cache.misses, "misses")
 
-		else:
-			Solve_circuit(circuit_components, SPICE_DC)
+if arguments.incremental != None:
+	print("\nIncremental solves:", incremental_counts['reused'], "reused,", incremental_counts['updated'], "updated,", incremental_counts['refactored'], "refactored and", incremental_counts['solved'], "solved afresh")
 
-		exit()
\ No newline at end of file
+if arguments.profile != None:
+	Write_Profile(arguments.profile, file_input, arguments.jobs, time.perf_counter() - start_time, profiled_blocks)
+	print("\nProfile of", len(profiled_blocks), "circuits has been written to", arguments.profile)
@@ -0,0 +1,150 @@
+'''
+Title	 : AC Sweep
+Purpose  : To solve a circuit over a sweep of frequencies (.ac dec|lin|oct N fstart fstop) by assembling the MNA matrix only once
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a circuit and the sweep settings
+Outputs  : Nodal voltages and currents through voltage sources at every frequency of the sweep
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.linalg as sparse_linalg
+
+from mna_engine import SPARSE_THRESHOLD, Assemble_G_C, Build_Node_Table
+from node_ordering import DEFAULT_ORDERING, OrderedLU, Pivot_Options
+from phase_profiler import Phase, Profiled
+
+
+# Constants used in the code
+SWEEP_TYPES = ('dec', 'lin', 'oct')		# Accepted types of frequency sweeps
+SWEEP_BATCH_BYTES = 2**28				# Maximum memory (in bytes) used by a batch of dense MNA matrices
+
+
+# Function to get the frequencies of a sweep
+## 'dec' and 'oct' take the number of points per decade and per octave respectively while 'lin' takes the total number of points
+def Sweep_Frequencies(sweep_type, points, f_start, f_stop):
+	if sweep_type == 'lin':
+		return np.linspace(f_start, f_stop, points)
+
+	elif sweep_type == 'dec':
+		count = int(np.floor(points * np.log10(f_stop / f_start) + 1e-9)) + 1
+
+	else:
+		count = int(np.floor(points * np.log2(f_stop / f_start) + 1e-9)) + 1
+
+	return np.geomspace(f_start, f_stop, count)
+
+
+# Defining a Class SweepSystem to hold G and C on one common sparsity pattern
+## The MNA matrix at any frequency is then formed by only combining the arrays of values, i.e. G + jwC is never added as sparse matrices.
+## The fill reducing ordering is found once and the pattern is stored already permuted, so that each frequency only needs a numeric factorisation.
+class SweepSystem:
+	## Function to build the common pattern given G and C in CSC form
+	def __init__(self, g_matrix, c_matrix):
+		self.mna_size = g_matrix.shape[0]
+
+		g_matrix = sparse.csc_matrix(g_matrix)
+		c_matrix = sparse.csc_matrix(c_matrix)
+		g_matrix.eliminate_zeros()
+		c_matrix.eliminate_zeros()
+
+		### Union of both the patterns. Values are positive here so no entry of the union cancels out
+		pattern = (abs(g_matrix) + abs(c_matrix)).tocsc()
+		pattern.sort_indices()
+
+		### Values of G and C are placed on the common pattern through their positions in column-major order
+		pattern_keys = self.keys(pattern)
+		self.g_data = np.zeros(pattern.nnz, dtype = complex)
+		self.c_data = np.zeros(pattern.nnz, dtype = complex)
+		self.g_data[np.searchsorted(pattern_keys, self.keys(g_matrix))] = g_matrix.data
+		self.c_data[np.searchsorted(pattern_keys, self.keys(c_matrix))] = c_matrix.data
+
+		self.indices = pattern.indices
+		self.indptr = pattern.indptr
+		self.column_order = None
+		self.symmetric = False
+
+	## Function to get the positions of the entries of a sparse matrix in column-major order
+	def keys(self, matrix):
+		matrix.sum_duplicates()
+		columns = np.repeat(np.arange(self.mna_size, dtype = np.int64), np.diff(matrix.indptr))
+		return columns * self.mna_size + matrix.indices
+
+	## Function to form the MNA matrix at angular frequency omega on the common pattern
+	def matrix(self, omega):
+		return sparse.csc_matrix((self.g_data + (1j * omega) * self.c_data, self.indices, self.indptr), shape = (self.mna_size, self.mna_size))
+
+	## Function to find the ordering (see node_ordering.py) from the matrix at one frequency and to store the pattern permuted by it
+	### Symmetric orderings permute the rows as well as the columns
+	def analyse(self, omega, ordering = DEFAULT_ORDERING):
+		ordered_lu = OrderedLU(self.matrix(omega), ordering)
+		column_order = ordered_lu.column_order()
+		self.symmetric = ordered_lu.symmetric
+
+		### Permuting a matrix of positions gives the order in which the values need to be picked for the permuted pattern
+		positions = sparse.csc_matrix((np.arange(1, len(self.g_data) + 1, dtype = float), self.indices, self.indptr), shape = (self.mna_size, self.mna_size))
+		positions = positions[column_order][:, column_order].tocsc() if self.symmetric else positions[:, column_order].tocsc()
+		order = positions.data.astype(np.int64) - 1
+
+		self.g_data = self.g_data[order]
+		self.c_data = self.c_data[order]
+		self.indices = positions.indices
+		self.indptr = positions.indptr
+		self.column_order = column_order
+
+	## Function to solve the MNA equations at angular frequency omega with the stored ordering
+	@Profiled('solve')
+	def solve(self, omega, b_vector):
+		if self.symmetric:
+			b_vector = b_vector[self.column_order]
+
+		permuted_result = sparse_linalg.splu(self.matrix(omega), permc_spec = 'NATURAL', **Pivot_Options(self.symmetric)).solve(b_vector)
+
+		result = np.empty_like(permuted_result)
+		result[self.column_order] = permuted_result
+		return result
+
+
+# Function to solve a circuit at all the given frequencies
+## The matrices G, C and the source vector are assembled only once for the whole sweep
+## Small circuits are solved in batches of stacked dense matrices and large circuits through SweepSystem
+## Returns an array with the solution at each frequency along its rows and the node names. If the solution is not unique then False is returned instead.
+def Solve_AC_Sweep(circuit_components, frequencies, solver_options = {}):
+	node_table = Build_Node_Table(circuit_components, inductor_currents = True)
+	g_matrix, c_matrix, b_vector = Assemble_G_C(circuit_components, node_table)
+
+	mna_size = len(node_table)
+	omegas = 2 * np.pi * np.asarray(frequencies, dtype = float)
+	results = np.zeros((len(omegas), mna_size), dtype = complex)
+
+	try:
+		## Dense batches for small circuits. The number of matrices in a batch is limited by SWEEP_BATCH_BYTES
+		if mna_size <= SPARSE_THRESHOLD:
+			g_dense = g_matrix.toarray()
+			c_dense = c_matrix.toarray()
+			batch_size = max(1, SWEEP_BATCH_BYTES // (16 * mna_size * mna_size))
+
+			for start in range(0, len(omegas), batch_size):
+				batch_omegas = omegas[start:start + batch_size]
+				mna_matrices = g_dense[None, :, :] + (1j * batch_omegas[:, None, None]) * c_dense[None, :, :]
+				with Phase('solve'):
+					results[start:start + batch_size] = np.linalg.solve(mna_matrices, np.broadcast_to(b_vector, (len(batch_omegas), mna_size, 1)))[:, :, 0]
+
+		## Sparse solves with a common pattern and column ordering for large circuits
+		else:
+			sweep_system = SweepSystem(g_matrix, c_matrix)
+			sweep_system.analyse(omegas[len(omegas) // 2], solver_options.get('ordering', DEFAULT_ORDERING))
+
+			for point in range(len(omegas)):
+				results[point] = sweep_system.solve(omegas[point], b_vector)[:, 0]
+
+	except (np.linalg.LinAlgError, RuntimeError):
+		return False, node_table.names
+
+	if not np.all(np.isfinite(results)):
+		return False, node_table.names
+
+	return results, node_table.names
@@ -0,0 +1,121 @@
+'''
+Title	 : Batch Solver
+Purpose  : To solve the many independent circuits of a netlist file across a pool of processes
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Circuit blocks given one at a time by the netlist parser and the number of processes
+Outputs  : Result of each circuit block, given in the same order as the circuits in the netlist file
+'''
+
+
+# Importing libraries
+import collections
+import concurrent.futures
+import itertools
+import os
+
+from circuit_solver import Merge_Results, Solve_Block, Split_Block
+from phase_profiler import Profiling, Start_Profiling
+from result_cache import Circuit_Key
+
+
+# Constants used in the code
+BATCH_CHUNK = 16			# Number of circuit blocks sent to a process at once. Sending many small circuits together reduces the overhead of each job.
+BATCH_PENDING = 2			# Number of chunks waiting or being solved per process. Only these are held in memory apart from the chunk being given out.
+
+
+# Function to solve a list of circuit blocks one after the other. This is the job which is run by each process.
+def Solve_Blocks(circuit_blocks, waveform_prefix = 'transient', solver_options = {}, incremental = None):
+	return [Solve_Block(circuit_block, waveform_prefix, solver_options, incremental) for circuit_block in circuit_blocks]
+
+
+# Function to solve a circuit block in this process, one independent part at a time (see Split_Block())
+def Solve_Parts(circuit_block, waveform_prefix = 'transient', solver_options = {}, incremental = None):
+	return Merge_Results(circuit_block, [Solve_Block(part_block, waveform_prefix, solver_options, incremental) for part_block in Split_Block(circuit_block, solver_options)])
+
+
+# Function to give out the blocks of a chunk which weren't in the cache to the pool of processes
+## Blocks which aren't split into independent parts are solved together as one job, while each part of a block which is split is a job of its own
+## so that the parts of a large circuit are solved in parallel. Returns the job of the whole blocks and the jobs of the parts of each block of the chunk.
+def Submit_Chunk(executor, chunk, waveform_prefix = 'transient', solver_options = {}, incremental = None):
+	whole_blocks = []
+	part_jobs = []
+
+	for circuit_block, _, circuit_result in chunk:
+		part_blocks = Split_Block(circuit_block, solver_options) if circuit_result == None else []
+
+		if len(part_blocks) == 1:
+			whole_blocks.append(circuit_block)
+
+		part_jobs.append([executor.submit(Solve_Blocks, [part_block], waveform_prefix, solver_options, incremental) for part_block in part_blocks] if len(part_blocks) > 1 else None)
+
+	whole_job = executor.submit(Solve_Blocks, whole_blocks, waveform_prefix, solver_options, incremental) if whole_blocks else None
+	return whole_job, part_jobs
+
+
+# Function to look up the results of circuit blocks in a cache as they are read
+## Yields each block along with its key and its stored result. The result is None if it has to be solved (and always if there is no cache).
+def Lookup_Blocks(circuit_blocks, cache = None, solver_options = {}):
+	for circuit_block in circuit_blocks:
+		if cache == None:
+			yield circuit_block, None, None
+
+		else:
+			key = Circuit_Key(circuit_block, solver_options)
+			yield circuit_block, key, cache.get(key, circuit_block.begin_line)
+
+
+# Function to solve circuit blocks across a pool of processes and yield their results in the order the blocks are given
+## Blocks are read from the iterable only as the processes need them, so the circuits of a large netlist file are never all in memory at once.
+## Results are yielded as soon as the result of every earlier block is known.
+## If a cache is given, blocks whose results are stored in it are not solved again and the results of the other blocks are stored in it.
+## Waveforms of transients are written to files named by waveform_prefix and the circuits are solved with solver_options (see Solve_Block).
+## DC circuits are split into their independent parts, which are solved separately and joined back into one result.
+## If a directory of states is given as incremental, large DC circuits and parts are solved from their states there (see Solve_DC_Incremental()).
+## If jobs is 1 then the blocks are solved in this process itself.
+def Solve_Batch(circuit_blocks, jobs = None, chunk_size = BATCH_CHUNK, cache = None, solver_options = {}, waveform_prefix = 'transient', incremental = None):
+	if jobs == None:
+		jobs = os.cpu_count() or 1
+
+	lookups = Lookup_Blocks(circuit_blocks, cache, solver_options)
+
+	if jobs == 1:
+		for circuit_block, key, circuit_result in lookups:
+			if circuit_result == None:
+				circuit_result = Solve_Parts(circuit_block, waveform_prefix, solver_options, incremental)
+
+				if cache != None:
+					cache.put(key, circuit_result)
+
+			yield circuit_result
+		return
+
+	pending = collections.deque()			# Chunks in the order the blocks were given, along with the jobs solving the blocks which weren't in the cache
+
+	### Phases are recorded by the processes of the pool if they are being recorded by this process
+	with concurrent.futures.ProcessPoolExecutor(max_workers = jobs, initializer = Start_Profiling if Profiling() else None) as executor:
+		while True:
+			chunk = list(itertools.islice(lookups, chunk_size))
+
+			if chunk:
+				pending.append((chunk, Submit_Chunk(executor, chunk, waveform_prefix, solver_options, incremental)))
+
+			## The oldest chunk is waited for once enough chunks are pending or when there are no more blocks to be given out
+			while pending and ( len(pending) >= BATCH_PENDING * jobs or not chunk ):
+				done_chunk, (whole_job, part_jobs) = pending.popleft()
+				solved_results = iter(whole_job.result() if whole_job != None else [])
+
+				for (circuit_block, key, circuit_result), jobs_of_parts in zip(done_chunk, part_jobs):
+					if circuit_result == None:
+						if jobs_of_parts != None:
+							circuit_result = Merge_Results(circuit_block, [job.result()[0] for job in jobs_of_parts])
+						else:
+							circuit_result = next(solved_results)
+
+						if cache != None:
+							cache.put(key, circuit_result)
+
+					yield circuit_result
+
+			if not chunk:
+				break
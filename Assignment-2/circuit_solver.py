@@ -0,0 +1,305 @@
+'''
+Title	 : Circuit Solver
+Purpose  : To solve a verified circuit block (DC, AC by superposition, a frequency sweep or a transient) without displaying anything, so that it can be run in another process
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Circuit block given by the netlist parser
+Outputs  : Nodal voltages and currents through voltage sources at each frequency, stored as a CircuitResult
+'''
+
+
+# Importing libraries
+import numpy as np
+
+from ac_sweep import Solve_AC_Sweep, Sweep_Frequencies
+from circuit_topology import Check_Topology, Independent_Parts
+from incremental_solver import Solve_DC_Incremental
+from iterative_solver import DEFAULT_SOLVER, Solve_DC_Iterative
+from model_reduction import Solve_Reduced_Sweep, Solve_Reduced_Transient
+from mna_engine import Assemble_MNA, Build_Node_Table, Solve_Linear_Equations, Source_Vectors
+from netlist_parser import CircuitBlock
+from node_ordering import Ordering_Report
+from nonlinear_dc import Solve_Operating_Point
+from parameter_step import Solve_Step_At
+from phase_profiler import Merge_Phases, Phase, Take_Phases
+from pole_zero import TRANSFER_QUANTITIES, Solve_Transfer_Function
+from transient import WAVEFORM_FILE_TYPE, Solve_Transient
+
+
+# Constants used in the code
+ANALYSIS_DC = '.dc'				# Circuit with only DC sources
+ANALYSIS_AC = '.ac'				# Circuit with sources at given frequencies, solved by superposition
+ANALYSIS_SWEEP = 'sweep'		# Circuit solved over the frequencies of a sweep
+ANALYSIS_TRAN = '.tran'			# Circuit simulated in time
+ANALYSIS_OP = '.op'				# DC circuit with nonlinear components, solved by Newton-Raphson iterations
+ANALYSIS_TF = '.tf'				# DC transfer function from an independent source to a node
+ANALYSIS_PZ = '.pz'				# Poles and zeros of the transfer function from an independent source to a node
+
+
+# Defining a Class CircuitResult to store the solution of a circuit block
+## results[k] holds the values of all the unknowns (node_names) at frequencies[k]. For AC circuits each row is the response to the sources at that frequency alone.
+## For a transient, frequencies holds only the end time and results the values at that time. The whole waveforms are in waveform_file.
+## For a circuit with stepped components, results has one more axis in front for the points of the step. The values of the components named
+## in step_names at each point are along the rows of step_values. Results at points where the MNA matrix is singular are NaN.
+## For a circuit with nonlinear components, iterations holds the number of Newton-Raphson iterations taken.
+## For a transfer function, node_names holds TRANSFER_QUANTITIES and results their values at DC. transfer_names holds the output node and the input
+## source, and for .pz, poles and zeros hold the poles and zeros in rad/s (see Solve_Transfer_Function()).
+## For a frequency sweep or a transient on a reduced model, node_names holds only the kept nodes and reduction_report holds the number of unknowns
+## of the circuit and of its reduced model, and the estimated error of the model (None if it couldn't be estimated, see model_reduction.py).
+## ordering_report holds the fill-in and operations of LU for each node ordering if they were asked for (see Ordering_Report()).
+## solver_report holds the (method, preconditioner, iterations, residual, converged) of a DC circuit solved by an iterative method (see Solve_DC_Iterative()).
+## topology_errors holds the errors in the connections of the circuit found before it is solved (see Check_Topology()), which is then not solved.
+## phases holds the statistics of the phases of solving the circuit if they are being recorded (see phase_profiler.py).
+## incremental_counts holds the number of circuits (or parts of a circuit) solved in each way by the incremental solver (see Solve_DC_Incremental()).
+## If the MNA equations of the circuit have no unique solution (or the iterations don't converge) then solved is False and results is None.
+class CircuitResult:
+	## Function to initialise the result of the circuit block which starts at the given line
+	def __init__(self, begin_line, analysis, node_names, frequencies, results, waveform_file = None, step_names = None, step_values = None, iterations = None):
+		self.begin_line = begin_line
+		self.analysis = analysis
+		self.node_names = node_names
+		self.frequencies = frequencies
+		self.results = results
+		self.waveform_file = waveform_file
+		self.step_names = step_names
+		self.step_values = step_values
+		self.iterations = iterations
+		self.ordering_report = None
+		self.solver_report = None
+		self.topology_errors = None
+		self.incremental_counts = None
+		self.phases = None
+		self.transfer_names = None
+		self.poles = None
+		self.zeros = None
+		self.reduction_report = None
+		self.solved = results is not None
+
+
+# Function to solve a purely DC circuit
+## Returns the solution as a column vector or False if the MNA equations have no unique solution
+def Solve_DC(circuit_components, node_table, solver_options = {}):
+	mna_matrix, b_vector = Assemble_MNA(circuit_components, node_table)
+	return Solve_Linear_Equations(mna_matrix, b_vector, solver_options)
+
+
+# Function to solve a circuit with sources at different frequencies by superposition
+## The MNA matrix is the same for all the sources at a frequency, so it is assembled and factorised once per frequency
+## and each source acting alone is a column of the B matrix. The responses to the sources are then added together.
+## Returns the distinct frequencies (in the order they are first given) and the response at each of them along the rows, or False for both if a solve fails
+def Solve_Superposition(circuit_components, node_table, source_frequencies, solver_options = {}):
+	sources = {}			# Dictionary to store all the independent power sources (indices of the components) grouped by their frequencies
+
+	for element in np.flatnonzero(circuit_components.mask('V', 'I')):
+		sources.setdefault(source_frequencies[circuit_components.names[element]], []).append(element)
+
+	frequencies = list(dict.fromkeys(source_frequencies.values()))
+	results = np.zeros((len(frequencies), len(node_table)), dtype = complex)
+
+	for point, frequency in enumerate(frequencies):
+		mna_matrix, _ = Assemble_MNA(circuit_components, node_table, frequency)
+		temp_result = Solve_Linear_Equations(mna_matrix, Source_Vectors(circuit_components, node_table, sources[frequency]), solver_options)
+
+		if type(temp_result) == bool:
+			return False, False
+
+		results[point] = temp_result.sum(axis = 1)
+
+	return frequencies, results
+
+
+# Function to solve a circuit for every point of the .step directives given after it
+## The circuit is solved at each frequency of its sources (only at 0 for DC circuits) through low rank updates of one factorisation per frequency
+## Returns the frequencies and the results with the points of the step along the first axis, or False for both if the MNA matrix is singular
+def Solve_Stepped(circuit_block, node_table, solver_options = {}):
+	circuit_components = circuit_block.circuit_components
+	step_elements = [circuit_components.name_index[name] for name in circuit_block.steps]
+	step_values = np.column_stack(list(circuit_block.steps.values()))
+
+	sources = {}
+	for element in np.flatnonzero(circuit_components.mask('V', 'I')):
+		sources.setdefault(circuit_block.source_frequencies.get(circuit_components.names[element], 0), []).append(element)
+
+	frequencies = list(dict.fromkeys(circuit_block.source_frequencies.values())) if len(circuit_block.source_frequencies) != 0 else [0]
+	results = np.zeros((len(step_values), len(frequencies), len(node_table)), dtype = complex)
+
+	for point, frequency in enumerate(frequencies):
+		temp_result = Solve_Step_At(circuit_components, node_table, np.array(sources.get(frequency, []), dtype = np.int64), step_elements, step_values, frequency, solver_options)
+
+		if type(temp_result) == bool:
+			return False, False
+
+		results[:, point] = temp_result
+
+	return frequencies, results
+
+
+# Function to solve a circuit block with the analysis given by its .ac, .tran and .step directives
+## A transient or a frequency sweep is used if it is given. Otherwise the circuit is solved at every point of the step if components are stepped,
+## by superposition if it has AC sources and as a DC circuit if it has neither. DC circuits with diodes or MOSFETs are solved by Newton-Raphson iterations.
+## For a sweep, AC sources are the inputs and DC sources are removed as only the response to the AC sources is required
+## Waveforms of a transient are written to a file named by waveform_prefix and the line at which the circuit starts
+## solver_options holds the ordering used by sparse LU and whether the orderings are to be compared on the MNA matrix of the circuit,
+## and the iterative method (with its preconditioner, tolerance and limit on iterations) to be used for DC circuits in place of sparse LU
+## DC circuits solved by sparse LU use the states kept in the directory incremental, if it is given, so that they are solved quickly after small edits
+## Circuits with errors in their connections are not solved
+def Solve_Block(circuit_block, waveform_prefix = 'transient', solver_options = {}, incremental = None):
+	with Phase('topology'):
+		topology_errors = Check_Topology(circuit_block.circuit_components)
+
+	if len(topology_errors) != 0:
+		circuit_result = CircuitResult(circuit_block.begin_line, ANALYSIS_DC, [], [0], None)
+		circuit_result.topology_errors = topology_errors
+		circuit_result.phases = Take_Phases()
+		return circuit_result
+
+	ordering_report = None
+	if solver_options.get('ordering_report', False):
+		with Phase('ordering_report'):
+			circuit_components = circuit_block.circuit_components
+			mna_matrix, _ = Assemble_MNA(circuit_components, Build_Node_Table(circuit_components), max(circuit_block.source_frequencies.values(), default = 0))
+			ordering_report = Ordering_Report(mna_matrix)
+
+	with Phase('analysis'):
+		circuit_result = Solve_Analysis(circuit_block, waveform_prefix, solver_options, incremental)
+
+	circuit_result.ordering_report = ordering_report
+	circuit_result.phases = Take_Phases()
+	return circuit_result
+
+
+# Function to solve a circuit block with the analysis it asks for (see Solve_Block())
+def Solve_Analysis(circuit_block, waveform_prefix = 'transient', solver_options = {}, incremental = None):
+	circuit_components = circuit_block.circuit_components
+
+	if circuit_block.transient != None and circuit_block.reduction != None:
+		waveform_file = waveform_prefix + '_' + str(circuit_block.begin_line) + WAVEFORM_FILE_TYPE
+		result, node_names, reduced_model = Solve_Reduced_Transient(circuit_components, circuit_block.source_frequencies, circuit_block.transient, circuit_block.reduction, waveform_file, solver_options)
+
+		circuit_result = CircuitResult(circuit_block.begin_line, ANALYSIS_TRAN, node_names, [circuit_block.transient[1]], None if type(result) == bool else result[None, :], waveform_file)
+		circuit_result.reduction_report = None if reduced_model == None else (reduced_model.full_size, len(reduced_model), reduced_model.error)
+		return circuit_result
+
+	if circuit_block.transient != None:
+		waveform_file = waveform_prefix + '_' + str(circuit_block.begin_line) + WAVEFORM_FILE_TYPE
+		result, node_names = Solve_Transient(circuit_components, circuit_block.source_frequencies, circuit_block.transient, waveform_file, solver_options)
+		return CircuitResult(circuit_block.begin_line, ANALYSIS_TRAN, node_names, [circuit_block.transient[1]], None if type(result) == bool else result[None, :], waveform_file)
+
+	if circuit_block.transfer_function != None:
+		analysis, output_node, source_name, _ = circuit_block.transfer_function
+		dc_values, poles, zeros, _ = Solve_Transfer_Function(circuit_components, circuit_block.transfer_function, solver_options)
+
+		circuit_result = CircuitResult(circuit_block.begin_line, analysis, TRANSFER_QUANTITIES, [0], None if type(dc_values) == bool else dc_values[None, :])
+		circuit_result.transfer_names = [output_node, source_name]
+		circuit_result.poles = poles
+		circuit_result.zeros = zeros
+		return circuit_result
+
+	if circuit_block.ac_sweep != None:
+		circuit_components.values[circuit_components.mask('V', 'I') & ~circuit_components.ac] = 0
+
+		frequencies = Sweep_Frequencies(*circuit_block.ac_sweep)
+		if circuit_block.reduction == None:
+			results, node_names = Solve_AC_Sweep(circuit_components, frequencies, solver_options)
+			return CircuitResult(circuit_block.begin_line, ANALYSIS_SWEEP, node_names, frequencies, None if type(results) == bool else results)
+
+		results, node_names, reduced_model = Solve_Reduced_Sweep(circuit_components, frequencies, circuit_block.reduction, solver_options)
+		circuit_result = CircuitResult(circuit_block.begin_line, ANALYSIS_SWEEP, node_names, frequencies, None if type(results) == bool else results)
+		circuit_result.reduction_report = None if reduced_model == None else (reduced_model.full_size, len(reduced_model), reduced_model.error)
+		return circuit_result
+
+	if np.any(circuit_components.mask('D', 'M')):
+		result, node_names, iterations = Solve_Operating_Point(circuit_components, solver_options)
+		return CircuitResult(circuit_block.begin_line, ANALYSIS_OP, node_names, [0], None if type(result) == bool else result.T, iterations = iterations)
+
+	node_table = Build_Node_Table(circuit_components)		# Node table is built once and shared by all the solves
+
+	if len(circuit_block.steps) != 0:
+		frequencies, results = Solve_Stepped(circuit_block, node_table, solver_options)
+		analysis = ANALYSIS_AC if len(circuit_block.source_frequencies) != 0 else ANALYSIS_DC
+		return CircuitResult(circuit_block.begin_line, analysis, node_table.names, frequencies, None if type(results) == bool else results, step_names = list(circuit_block.steps), step_values = np.column_stack(list(circuit_block.steps.values())))
+
+	if len(circuit_block.source_frequencies) != 0:
+		frequencies, results = Solve_Superposition(circuit_components, node_table, circuit_block.source_frequencies, solver_options)
+		return CircuitResult(circuit_block.begin_line, ANALYSIS_AC, node_table.names, frequencies, None if type(results) == bool else results)
+
+	if solver_options.get('solver', DEFAULT_SOLVER) != DEFAULT_SOLVER:
+		result, solver_report = Solve_DC_Iterative(circuit_components, node_table, solver_options)
+		circuit_result = CircuitResult(circuit_block.begin_line, ANALYSIS_DC, node_table.names, [0], None if type(result) == bool else result.T)
+		circuit_result.solver_report = solver_report
+		return circuit_result
+
+	if incremental != None:
+		result, kind = Solve_DC_Incremental(circuit_components, node_table, incremental, solver_options)
+		circuit_result = CircuitResult(circuit_block.begin_line, ANALYSIS_DC, node_table.names, [0], None if type(result) == bool else result.T)
+		circuit_result.incremental_counts = {kind: 1}
+		return circuit_result
+
+	result = Solve_DC(circuit_components, node_table, solver_options)
+	return CircuitResult(circuit_block.begin_line, ANALYSIS_DC, node_table.names, [0], None if type(result) == bool else result.T)
+
+
+# Function to split a circuit block into blocks of its independent parts (see Independent_Parts()) so that they can be solved separately
+## Only DC circuits without stepped components or transfer functions are split, and not when the orderings are to be compared on the MNA matrix of the whole circuit.
+## Returns the list of blocks, which has only the given block if it isn't split
+def Split_Block(circuit_block, solver_options = {}):
+	if circuit_block.transient != None or circuit_block.ac_sweep != None or len(circuit_block.steps) != 0 or len(circuit_block.source_frequencies) != 0 or circuit_block.transfer_function != None or solver_options.get('ordering_report', False):
+		return [circuit_block]
+
+	parts = Independent_Parts(circuit_block.circuit_components)
+	if len(parts) < 2:
+		return [circuit_block]
+
+	part_blocks = []
+	for elements in parts:
+		part_block = CircuitBlock(circuit_block.begin_line)
+		part_block.circuit_components = circuit_block.circuit_components.select(elements)
+		part_blocks.append(part_block)
+
+	return part_blocks
+
+
+# Function to join the results of the parts of a circuit block (see Split_Block()) into the result of the whole block
+## Unknowns are put back in the order of the node table of the whole circuit. The block is solved only if all its parts are.
+## Newton-Raphson iterations, the iterations of Krylov methods, the counts of the incremental solver and the phases are added up over the parts,
+## and the largest residual is kept.
+def Merge_Results(circuit_block, part_results):
+	if len(part_results) == 1:
+		return part_results[0]
+
+	node_names = Build_Node_Table(circuit_block.circuit_components).names
+	analysis = ANALYSIS_OP if any(part_result.analysis == ANALYSIS_OP for part_result in part_results) else ANALYSIS_DC
+	circuit_result = CircuitResult(circuit_block.begin_line, analysis, node_names, [0], None)
+
+	topology_errors = [error for part_result in part_results if part_result.topology_errors != None for error in part_result.topology_errors]
+	if len(topology_errors) != 0:
+		circuit_result.topology_errors = topology_errors
+
+	iterations = [part_result.iterations for part_result in part_results if part_result.iterations != None]
+	if len(iterations) != 0:
+		circuit_result.iterations = sum(iterations)
+
+	solver_reports = [part_result.solver_report for part_result in part_results if part_result.solver_report != None]
+	if len(solver_reports) != 0:
+		method, preconditioner = solver_reports[0][:2]
+		circuit_result.solver_report = (method, preconditioner, sum(report[2] for report in solver_reports), max(report[3] for report in solver_reports), all(report[4] for report in solver_reports))
+
+	circuit_result.phases = Merge_Phases(*[part_result.phases for part_result in part_results])
+
+	for part_result in part_results:
+		if part_result.incremental_counts != None:
+			circuit_result.incremental_counts = circuit_result.incremental_counts or {}
+
+			for kind, count in part_result.incremental_counts.items():
+				circuit_result.incremental_counts[kind] = circuit_result.incremental_counts.get(kind, 0) + count
+
+	if all(part_result.solved for part_result in part_results):
+		node_position = {node_name: position for position, node_name in enumerate(node_names)}
+		circuit_result.results = np.zeros((1, len(node_names)), dtype = complex)
+
+		for part_result in part_results:
+			circuit_result.results[:, [node_position[node_name] for node_name in part_result.node_names]] = part_result.results
+
+		circuit_result.solved = True
+
+	return circuit_result
@@ -0,0 +1,289 @@
+'''
+Title	 : Circuit Store
+Purpose  : To store the components of a circuit compactly as arrays (struct of arrays) instead of one object per component
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Verified tokens of each component given by the netlist parser
+Outputs  : Arrays of type codes, node indices, controlling nodes and values which are used directly by the MNA stampers
+'''
+
+
+# Importing libraries
+import array
+import numpy as np
+
+from value_parser import Parse_Values
+
+
+# Constants used in the code
+ELEMENT_TYPES = 'RLCVIEGHFDM'									# Accepted types of components
+TYPE_CODE = {element_type: code for code, element_type in enumerate(ELEMENT_TYPES)}		# Type of component to its code
+BRANCH_TYPES = ('V', 'E', 'H')									# Components whose currents are unknowns in MNA (pseudo nodes)
+
+
+# Defining a Class Component to view the details of one component of a circuit.
+## Components are not stored as objects of this Class. They are created from CircuitArrays only when needed, e.g. for error messages.
+class Component:
+	## Function to initialise an object of class Component
+	### Ports and dependencies are copied into new lists, so that no two views share a list
+	def __init__(self, init_name = None, init_ports = None, init_dependencies = None, init_value = None, line_number = None, init_ac = False, init_parameter = 0):
+		self.component_type = init_name[0]
+		self.component_name = init_name
+		self.component_ports = list(init_ports) if init_ports != None else []
+		self.component_dependencies = list(init_dependencies) if init_dependencies != None else []
+		self.component_value = init_value
+		self.component_ac = init_ac					# True for AC sources (given with 'ac')
+		self.component_parameter = init_parameter	# Second parameter of the component (threshold voltage of MOSFETs)
+		self.line_number = line_number				# Line of the netlist file in which the component is given
+
+
+# Defining a Class CircuitArrays to store all the components of a circuit as arrays
+## Component k has type code types[k], is connected between the nodes nodes[k, 0] and nodes[k, 1] and has value values[k].
+## For E and G, controls[k] holds the indices of the controlling nodes. For H and F, controls[k, 0] holds the index of the controlling voltage source.
+## For M (MOSFET), nodes[k] holds the drain and the source, controls[k, 0] holds the gate and parameters[k] holds the threshold voltage.
+## Names of the nodes and of the components are interned in tables so that each name is stored only once.
+## Components are added one at a time through add() and the arrays are formed by finish() once the circuit is complete.
+## A subcircuit (.subckt) is also stored as a CircuitArrays whose first port_count nodes are its ports. It is used as a template:
+## instances of it are added through add_instance() and all the instances of a template are expanded together in finish().
+class CircuitArrays:
+	## Function to initialise an empty circuit
+	def __init__(self):
+		self.names = []					# Names of the components
+		self.name_index = {}			# Name of a component to its index
+		self.node_names = []			# Names of the nodes
+		self.node_index = {}			# Name of a node to its index
+
+		### Typed arrays are used while the circuit is being read as they grow without storing a Python object per entry
+		self.growing = {'types': array.array('b'), 'nodes': array.array('q'), 'controls': array.array('q'), 'ac': array.array('b'), 'parameters': array.array('d'), 'line_numbers': array.array('q')}
+		self.value_tokens = []			# Value of each component as given in the netlist file, converted together in finish() (see value_parser.py)
+		self.given_values = {}			# Index of a component to its value if it was given as a number (AC sources) instead of a token
+		self.control_names = {}			# Names of the controlling voltage sources of H and F, resolved once all the components are known
+		self.instances = {}				# Name of a subcircuit to its template and the names, port nodes and line numbers of its instances
+		self.port_count = 0				# Number of ports if this is the template of a subcircuit
+		self.type_groups = None			# Components sorted by type and where each type starts in that order, found once when first needed (see group())
+
+	## Function to get the index of a node, adding it to the table if it isn't present
+	def intern_node(self, node_name):
+		if node_name not in self.node_index:
+			self.node_index[node_name] = len(self.node_names)
+			self.node_names.append(node_name)
+
+		return self.node_index[node_name]
+
+	## Function to add a verified component to the circuit
+	### The value can be a number or the token of the value as given in the netlist file (see value_parser.py)
+	def add(self, element_name, element_ports, element_dependencies, element_value, element_ac = False, element_parameter = 0, line_number = 0):
+		self.name_index[element_name] = len(self.names)
+		self.names.append(element_name)
+
+		if type(element_value) == str:
+			self.value_tokens.append(element_value)
+		else:
+			self.value_tokens.append('0')
+			self.given_values[len(self.names) - 1] = element_value
+
+		growing = self.growing
+		growing['types'].append(TYPE_CODE[element_name[0]])
+		growing['nodes'].extend((self.intern_node(element_ports[0]), self.intern_node(element_ports[1])))
+		growing['ac'].append(element_ac)
+		growing['parameters'].append(element_parameter)
+		growing['line_numbers'].append(line_number)
+
+		### Controlling nodes are interned like the ports. Controlling voltage sources may be given later so only their names are stored here.
+		if len(element_dependencies) == 2:
+			growing['controls'].extend((self.intern_node(element_dependencies[0]), self.intern_node(element_dependencies[1])))
+
+		elif element_name[0] == 'M':
+			growing['controls'].extend((self.intern_node(element_dependencies[0]), -1))
+
+		else:
+			if len(element_dependencies) == 1:
+				self.control_names[len(self.names) - 1] = element_dependencies[0]
+
+			growing['controls'].extend((-1, -1))
+
+	## Function to add an instance of a subcircuit given its finished template and the nodes connected to its ports
+	### Only the port nodes are interned here. The components of the instance are added when the template is expanded in finish().
+	def add_instance(self, instance_name, subcircuit_name, template, port_names, line_number = 0):
+		if subcircuit_name not in self.instances:
+			self.instances[subcircuit_name] = (template, [], array.array('q'), array.array('q'))
+
+		_, instance_names, instance_ports, instance_lines = self.instances[subcircuit_name]
+		instance_names.append(instance_name)
+		instance_ports.extend(self.intern_node(port_name) for port_name in port_names)
+		instance_lines.append(line_number)
+
+	## Function to expand all the instances of a subcircuit at once
+	### Each instance gets a map from the nodes of the template to its own nodes - the ports to the nodes it is connected to, GND to GND and
+	### the internal nodes to new nodes named 'instance.node'. The node arrays of all the instances are then a single lookup in these maps.
+	### Components are named 'instance.component' and controlling voltage sources of H and F are shifted to the components of the instance.
+	### Returns the arrays of the components of all the instances along with the number of components before them.
+	def expand(self, template, instance_names, instance_ports, instance_lines, element_offset):
+		instance_count = len(instance_names)
+		element_count = len(template)
+		ports = np.frombuffer(instance_ports, dtype = np.int64).reshape(instance_count, template.port_count)
+
+		internal = [node for node in range(template.port_count, len(template.node_names)) if template.node_names[node] != 'GND']
+		node_map = np.empty((instance_count, len(template.node_names)), dtype = np.int64)
+		node_map[:, :template.port_count] = ports
+
+		if 'GND' in template.node_index:
+			node_map[:, template.node_index['GND']] = self.intern_node('GND')
+
+		node_map[:, internal] = len(self.node_names) + np.arange(instance_count * len(internal)).reshape(instance_count, len(internal))
+
+		self.node_names.extend(instance_name + '.' + template.node_names[node] for instance_name in instance_names for node in internal)
+		self.node_index.update(zip(self.node_names[len(self.node_index):], range(len(self.node_index), len(self.node_names))))
+
+		### Controls are nodes for E, G and M, components for H and F and unused (-1) otherwise
+		rows = np.arange(instance_count)[:, None]
+		nodes = node_map[rows, template.nodes.reshape(1, -1)].reshape(-1, 2)
+		node_controls = template.mask('E', 'G', 'M')[:, None] & (template.controls >= 0)
+		element_controls = template.mask('H', 'F')[:, None] & (template.controls >= 0)
+		controls = np.where(node_controls.ravel()[None, :], node_map[rows, template.controls.reshape(1, -1).clip(0)], template.controls.reshape(1, -1))
+		controls = np.where(element_controls.ravel()[None, :], controls + element_offset + element_count * rows, controls).reshape(-1, 2)
+
+		self.names.extend(instance_name + '.' + element_name for instance_name in instance_names for element_name in template.names)
+
+		return (np.tile(template.types, instance_count), nodes, controls, np.tile(template.values, instance_count), np.tile(template.ac, instance_count),
+				np.tile(template.parameters, instance_count), np.repeat(np.frombuffer(instance_lines, dtype = np.int64), element_count))
+
+	## Function to form the arrays once all the components have been added
+	### Instances of subcircuits are expanded after the components given directly, one subcircuit at a time in the order they are first used
+	### Controlling voltage sources of H and F are resolved and the controlling nodes of E and G are checked here
+	def finish(self, port_count = 0):
+		growing = self.growing
+		self.port_count = port_count
+		self.types = np.frombuffer(growing['types'], dtype = np.int8).copy()
+		self.nodes = np.frombuffer(growing['nodes'], dtype = np.int64).reshape(-1, 2).copy()
+		self.controls = np.frombuffer(growing['controls'], dtype = np.int64).reshape(-1, 2).copy()
+		self.values = Parse_Values(self.value_tokens).astype(complex)
+		self.ac = np.frombuffer(growing['ac'], dtype = np.int8).astype(bool)
+		self.parameters = np.frombuffer(growing['parameters'], dtype = float).copy()
+		self.line_numbers = np.frombuffer(growing['line_numbers'], dtype = np.int64).copy()
+		self.growing = None
+
+		## Tokens which aren't values may still be complex numbers for Python
+		for element in np.flatnonzero(np.isnan(self.values)):
+			try:
+				self.values[element] = complex(self.value_tokens[element])
+			except ValueError:
+				print("Error: Invalid value given for", self.names[element],"in the netlist file")
+				print("\nValue has to be specified as a numeric or a string in scientific notation, optionally followed by a suffix such as k, u or meg")
+				exit()
+
+		for element, element_value in self.given_values.items():
+			self.values[element] = element_value
+
+		self.value_tokens = None
+		self.given_values = None
+
+		## Expanding the instances of subcircuits
+		if len(self.instances) != 0:
+			element_offset = len(self.names)
+			expanded = []
+
+			for template, instance_names, instance_ports, instance_lines in self.instances.values():
+				expanded.append(self.expand(template, instance_names, instance_ports, instance_lines, element_offset))
+				element_offset += len(instance_names) * len(template)
+
+			arrays = [np.concatenate([own] + [instance_arrays[position] for instance_arrays in expanded]) for position, own in enumerate((self.types, self.nodes, self.controls, self.values, self.ac, self.parameters, self.line_numbers))]
+			self.types, self.nodes, self.controls, self.values, self.ac, self.parameters, self.line_numbers = arrays
+			self.name_index.update(zip(self.names[len(self.name_index):], range(len(self.name_index), len(self.names))))
+
+		self.instances = {}
+
+		## Controlling voltage sources of current controlled sources need to be present in the circuit
+		source_names = {'H': "CCVS", 'F': "CCCS"}
+		for element, control_name in self.control_names.items():
+			control = self.name_index.get(control_name, -1)
+
+			if control < 0 or ELEMENT_TYPES[self.types[control]] not in BRANCH_TYPES:
+				print(source_names[self.names[element][0]], "(", self.names[element], ") has invalid dependencies.")
+				exit()
+
+			self.controls[element, 0] = control
+
+		self.control_names = None
+
+		## Controlling nodes of voltage controlled sources and gates of MOSFETs need to be connected to some component of the circuit
+		### Ports of a subcircuit are taken as connected since they are connected to the components outside it
+		connected = np.zeros(len(self.node_names), dtype = bool)
+		connected[self.nodes.ravel()] = True
+		connected[:port_count] = True
+		### Controls of H and F are components and not nodes, so only those of E, G and M are looked up
+		node_controls = np.where(self.mask('E', 'G', 'M')[:, None], self.controls, -1)
+		connected_controls = connected[node_controls[:, 0].clip(0)] & np.where(node_controls[:, 1] < 0, True, connected[node_controls[:, 1].clip(0)])
+		invalid = np.flatnonzero(self.mask('E', 'G', 'M') & ~connected_controls)
+
+		if len(invalid) != 0:
+			element = invalid[0]
+			print({'E': "VCVS", 'G': "VCCS", 'M': "MOSFET"}[self.names[element][0]], "(", self.names[element], ") has invalid dependencies.")
+			exit()
+
+		return self
+
+	## Function to get a finished circuit with only the given components (indices in increasing order) and the nodes they use
+	### Ground is always kept. Nodes and components keep their relative order, and controls are renumbered to the new indices.
+	def select(self, elements):
+		elements = np.asarray(elements, dtype = np.int64)
+		node_controls = self.mask('E', 'G', 'M')[elements][:, None] & (self.controls[elements] >= 0)
+		element_controls = self.mask('H', 'F')[elements][:, None] & (self.controls[elements] >= 0)
+
+		nodes = np.unique(np.concatenate((self.nodes[elements].ravel(), self.controls[elements][node_controls], [self.node_index['GND']])))
+		node_map = np.full(len(self.node_names), -1, dtype = np.int64)
+		node_map[nodes] = np.arange(len(nodes))
+		element_map = np.full(len(self), -1, dtype = np.int64)
+		element_map[elements] = np.arange(len(elements))
+
+		selected = CircuitArrays()
+		selected.growing = None
+		selected.control_names = None
+		selected.names = [self.names[element] for element in elements]
+		selected.name_index = {name: element for element, name in enumerate(selected.names)}
+		selected.node_names = [self.node_names[node] for node in nodes]
+		selected.node_index = {name: node for node, name in enumerate(selected.node_names)}
+
+		selected.types = self.types[elements]
+		selected.nodes = node_map[self.nodes[elements]]
+		selected.controls = np.where(node_controls, node_map[self.controls[elements].clip(0)], np.where(element_controls, element_map[self.controls[elements].clip(0)], self.controls[elements]))
+		selected.values = self.values[elements]
+		selected.ac = self.ac[elements]
+		selected.parameters = self.parameters[elements]
+		selected.line_numbers = self.line_numbers[elements]
+
+		return selected
+
+	## Function to get a mask of the components of the given types
+	def mask(self, *element_types):
+		return np.isin(self.types, [TYPE_CODE[element_type] for element_type in element_types])
+
+	## Function to get the indices of the components of the given types, grouped by type in the order the types are given
+	### Components are sorted by their type codes once (a stable sort, so the components of a type stay in the order they are given) and the
+	### components of each type are then a slice of that order. This avoids a pass over all the components for every type while stamping.
+	def group(self, *element_types):
+		if self.type_groups is None:
+			type_order = np.argsort(self.types, kind = 'stable')
+			self.type_groups = (type_order, np.searchsorted(self.types[type_order], np.arange(len(ELEMENT_TYPES) + 1)))
+
+		type_order, type_starts = self.type_groups
+		return np.concatenate([type_order[type_starts[TYPE_CODE[element_type]]:type_starts[TYPE_CODE[element_type] + 1]] for element_type in element_types])
+
+	## Function to view the details of a component as a Component object
+	def component(self, element):
+		element_type = self.names[element][0]
+
+		if element_type in ('E', 'G'):
+			dependencies = [self.node_names[node] for node in self.controls[element]]
+		elif element_type == 'M':
+			dependencies = [self.node_names[self.controls[element, 0]]]
+		elif element_type in ('H', 'F'):
+			dependencies = [self.names[self.controls[element, 0]]]
+		else:
+			dependencies = []
+
+		ports = [self.node_names[node] for node in self.nodes[element]]
+		return Component(self.names[element], ports, dependencies, self.values[element], int(self.line_numbers[element]), bool(self.ac[element]), float(self.parameters[element]))
+
+	def __len__(self):
+		return len(self.names)
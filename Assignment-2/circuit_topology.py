@@ -0,0 +1,112 @@
+'''
+Title	 : Circuit Topology
+Purpose  : To find the errors in the connections of a circuit before its MNA equations are formed, and to split it into parts which can be solved separately
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a circuit stored as arrays
+Outputs  : Loops of voltage sources, nodes cut off from ground and the components of each independent part of the circuit
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.csgraph as csgraph
+
+
+# Constants used in the code
+VOLTAGE_TYPES = ('V', 'E', 'H')						# Components which fix the voltage between their nodes
+CURRENT_TYPES = ('I', 'G', 'F')						# Components which fix the current through them and so don't connect their nodes
+MAX_LISTED = 5										# Largest number of nodes or components named in an error message
+
+
+# Function to label the connected parts of a graph given as the two ends of each edge
+## All the parts are found in a single pass over the edges (linear in the number of edges). Returns the number of parts and the part of each vertex.
+def Connected_Parts(vertex_count, ends1, ends2):
+	graph = sparse.coo_matrix((np.ones(len(ends1), dtype = np.int8), (ends1, ends2)), shape = (vertex_count, vertex_count))
+	return csgraph.connected_components(graph, directed = False)
+
+
+# Function to list a few names in an error message
+def Listed_Names(names):
+	names = list(names)
+
+	if len(names) > MAX_LISTED:
+		return ', '.join(names[:MAX_LISTED]) + " and " + str(len(names) - MAX_LISTED) + " more"
+
+	return ', '.join(names)
+
+
+# Function to find the errors in the connections of a circuit due to which its MNA equations would have no unique solution
+## Loops of voltage sources - a part of the graph of V, E and H with more components than its nodes less one has a loop, and the currents around it are undetermined.
+## Nodes cut off from ground - nodes which aren't connected to ground through components other than current sources have undetermined voltages.
+## They are reported as a cutset of current sources if current sources connect them to the rest of the circuit, and as floating if nothing does.
+## Capacitors and inductors are taken to connect their nodes in all the analyses since they are stamped as very small and very large admittances at DC.
+## Returns the list of errors, which is empty if there are none
+def Check_Topology(circuit):
+	errors = []
+	node_count = len(circuit.node_names)
+	node_gnd = circuit.node_index['GND']
+	node1 = circuit.nodes[:, 0]
+	node2 = circuit.nodes[:, 1]
+
+	## Loops of voltage sources
+	voltage_sources = np.flatnonzero(circuit.mask(*VOLTAGE_TYPES))
+	part_count, parts = Connected_Parts(node_count, node1[voltage_sources], node2[voltage_sources])
+	edges = np.bincount(parts[node1[voltage_sources]], minlength = part_count)
+	vertices = np.bincount(parts, minlength = part_count)
+
+	for part in np.flatnonzero(edges > vertices - 1):
+		names = [circuit.names[element] for element in voltage_sources[parts[node1[voltage_sources]] == part]]
+		errors.append("Error: Voltage sources " + Listed_Names(names) + " form a loop")
+
+	## Nodes cut off from ground
+	connecting = np.flatnonzero(~circuit.mask(*CURRENT_TYPES))
+	_, parts = Connected_Parts(node_count, node1[connecting], node2[connecting])
+
+	used = np.zeros(node_count, dtype = bool)
+	used[circuit.nodes.ravel()] = True
+	cut_off = used & (parts != parts[node_gnd])
+
+	current_sources = np.flatnonzero(circuit.mask(*CURRENT_TYPES))
+	crossing = current_sources[parts[node1[current_sources]] != parts[node2[current_sources]]]
+
+	for part in np.unique(parts[cut_off]):
+		nodes = [circuit.node_names[node] for node in np.flatnonzero(parts == part)]
+		cutset = crossing[(parts[node1[crossing]] == part) | (parts[node2[crossing]] == part)]
+
+		if len(cutset) != 0:
+			errors.append("Error: Nodes " + Listed_Names(nodes) + " are connected to the rest of the circuit only through current sources " + Listed_Names(circuit.names[element] for element in cutset))
+		else:
+			errors.append("Error: Nodes " + Listed_Names(nodes) + " are floating (not connected to GND)")
+
+	return errors
+
+
+# Function to split a circuit into parts whose MNA equations are independent of each other
+## The voltage of ground is known, so parts which are connected only through ground can be solved separately. A graph is formed with the nodes
+## and the components as vertices, where each component is joined to its nodes, to its controlling nodes (E, G and M) and to its controlling
+## voltage source (H and F). Ground is left out of this graph and the components in each connected part of it form an independent part.
+## Returns the indices of the components of each part, in the order in which the parts are first given
+def Independent_Parts(circuit):
+	node_count = len(circuit.node_names)
+	node_gnd = circuit.node_index['GND']
+	elements = np.arange(len(circuit))
+
+	node_controls = circuit.mask('E', 'G', 'M')[:, None] & (circuit.controls >= 0)
+	element_controls = circuit.mask('H', 'F')
+
+	### Components are numbered after the nodes in the graph
+	ends1 = np.concatenate((np.repeat(elements, 2), np.repeat(elements, 2)[node_controls.ravel()], elements[element_controls]))
+	ends2 = np.concatenate((circuit.nodes.ravel(), circuit.controls[node_controls], node_count + circuit.controls[element_controls, 0]))
+	ends1 = ends1 + node_count
+
+	kept = ends2 != node_gnd
+	_, parts = Connected_Parts(node_count + len(circuit), ends1[kept], ends2[kept])
+
+	element_parts = parts[node_count:]
+	_, first, part_order = np.unique(element_parts, return_index = True, return_inverse = True)
+	part_order = np.argsort(np.argsort(first))[part_order]
+
+	grouped = np.argsort(part_order, kind = 'stable')
+	return np.split(grouped, np.cumsum(np.bincount(part_order))[:-1])
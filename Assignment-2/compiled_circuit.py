@@ -0,0 +1,220 @@
+'''
+Title	 : Compiled Circuit
+Purpose  : To store parsed circuits in a binary file which can be memory mapped, so that large netlists are parsed only once
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Circuit blocks given by the netlist parser, or a compiled circuit file
+Outputs  : Compiled circuit file, or circuit blocks whose arrays are views of the memory mapped file
+'''
+
+
+# Importing libraries
+import json
+import os
+import tempfile
+import numpy as np
+
+from circuit_store import CircuitArrays
+from file_store import Replace_File
+from netlist_parser import CircuitBlock
+
+
+# Constants used in the code
+COMPILED_FILE_TYPE = '.cnet'			# Extension of compiled circuit files
+COMPILED_MAGIC = b'EE19CKT1'			# First bytes of a compiled circuit file, changed whenever the layout of the file changes
+ARRAY_ALIGNMENT = 64					# Arrays start at multiples of this many bytes so that their views are aligned
+CIRCUIT_ARRAYS = ('types', 'nodes', 'controls', 'values', 'ac', 'parameters', 'line_numbers')		# Arrays of CircuitArrays which are stored as they are
+
+
+# Layout of a compiled circuit file:
+## The magic bytes followed by the position of the index (8 byte unsigned integer), then the arrays of every circuit block one after the other
+## and finally the index, which is JSON. The index holds the directives of each block along with the position, type and shape of each of its arrays.
+## Names of components and nodes are stored as string tables (see StringTable). Frequencies of sources are stored as the indices of the sources
+## and their frequencies so that the index stays small for circuits with many sources.
+
+
+# Defining a Class StringTable to view a list of strings stored as arrays
+## The strings are stored one after the other as UTF-8 bytes (blob) and the i-th string is blob[offsets[i]:offsets[i + 1]].
+## order holds the indices of the strings in sorted order so that a string can be found by binary search without building a dictionary.
+## Strings are decoded only when they are accessed, so a table of millions of strings can be used as soon as its arrays are mapped.
+class StringTable:
+	## Function to initialise the table from its arrays
+	def __init__(self, blob, offsets, order):
+		self.blob = blob
+		self.offsets = offsets
+		self.order = order
+
+	def __len__(self):
+		return len(self.offsets) - 1
+
+	def __getitem__(self, index):
+		if index < 0:
+			index += len(self)
+
+		if index < 0 or index >= len(self):
+			raise IndexError("string table index out of range")
+
+		return self.blob[self.offsets[index]:self.offsets[index + 1]].tobytes().decode()
+
+	def __iter__(self):
+		for index in range(len(self)):
+			yield self[index]
+
+	## Function to find the index of a string by binary search over the sorted order. -1 is returned if it isn't present.
+	def find(self, string):
+		low = 0
+		high = len(self)
+
+		while low < high:
+			middle = (low + high) // 2
+
+			if self[self.order[middle]] < string:
+				low = middle + 1
+			else:
+				high = middle
+
+		if low < len(self) and self[self.order[low]] == string:
+			return int(self.order[low])
+
+		return -1
+
+
+# Defining a Class NameIndex to map names to their indices through a string table, like the dictionaries name_index and node_index of CircuitArrays
+class NameIndex:
+	## Function to initialise the map of the given string table
+	def __init__(self, string_table):
+		self.string_table = string_table
+
+	def __getitem__(self, name):
+		index = self.string_table.find(name)
+
+		if index < 0:
+			raise KeyError(name)
+
+		return index
+
+	def __contains__(self, name):
+		return self.string_table.find(name) >= 0
+
+	def get(self, name, default = None):
+		index = self.string_table.find(name)
+		return default if index < 0 else index
+
+
+# Function to get the UTF-8 bytes of a list of strings one after the other (blob) along with the offset of each string in it
+def Encode_Strings(strings):
+	if type(strings) == StringTable:
+		return strings.blob, strings.offsets
+
+	encoded = [string.encode() for string in strings]
+	offsets = np.zeros(len(encoded) + 1, dtype = np.int64)
+	offsets[1:] = np.cumsum(np.fromiter(map(len, encoded), dtype = np.int64, count = len(encoded)))
+
+	return np.frombuffer(b''.join(encoded), dtype = np.uint8), offsets
+
+
+# Function to get the arrays (blob, offsets, order) of the string table of a list of strings
+def String_Arrays(strings):
+	if type(strings) == StringTable:
+		return strings.blob, strings.offsets, strings.order
+
+	blob, offsets = Encode_Strings(strings)
+	return blob, offsets, np.array(sorted(range(len(strings)), key = strings.__getitem__), dtype = np.int64)
+
+
+# Function to write an array to the file at the next aligned position
+## Returns the entry of the array in the index - its position, type and shape
+def Write_Array(f, array):
+	array = np.ascontiguousarray(array)
+	f.write(b'\0' * (-f.tell() % ARRAY_ALIGNMENT))
+	entry = [f.tell(), array.dtype.str, list(array.shape)]
+	f.write(array.tobytes())
+	return entry
+
+
+# Function to compile the circuit blocks given by the netlist parser into a binary file
+## Blocks are written as they are given, so only one of them is held in memory at a time. Returns the number of blocks written.
+### The file is written under a temporary name and then renamed, so that an error in the netlist doesn't leave a partly written file behind
+def Compile_Circuits(circuit_blocks, compiled_file):
+	index = []
+	file_descriptor, temporary_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(compiled_file)), suffix = '.tmp')
+
+	### Errors in the netlist stop the program while the file is being written
+	try:
+		with os.fdopen(file_descriptor, 'wb') as f:
+			f.write(COMPILED_MAGIC + np.uint64(0).tobytes())
+
+			for circuit_block in circuit_blocks:
+				circuit = circuit_block.circuit_components
+				arrays = {name: Write_Array(f, getattr(circuit, name)) for name in CIRCUIT_ARRAYS}
+
+				for table_name, strings in (('names', circuit.names), ('node_names', circuit.node_names)):
+					for part, array in zip(('blob', 'offsets', 'order'), String_Arrays(strings)):
+						arrays[table_name + '_' + part] = Write_Array(f, array)
+
+				source_names = list(circuit_block.source_frequencies)
+				arrays['source_elements'] = Write_Array(f, np.array([circuit.name_index[name] for name in source_names], dtype = np.int64))
+				arrays['source_frequencies'] = Write_Array(f, np.array([circuit_block.source_frequencies[name] for name in source_names], dtype = float))
+
+				index.append({'begin_line': circuit_block.begin_line, 'ac_sweep': circuit_block.ac_sweep, 'transient': circuit_block.transient, 'transfer_function': circuit_block.transfer_function,
+							  'reduction': circuit_block.reduction, 'steps': {name: np.asarray(values, dtype = float).tolist() for name, values in circuit_block.steps.items()}, 'arrays': arrays})
+
+			index_position = f.tell()
+			f.write(json.dumps(index).encode())
+			f.seek(len(COMPILED_MAGIC))
+			f.write(np.uint64(index_position).tobytes())
+
+	except:
+		os.remove(temporary_path)
+		raise
+
+	Replace_File(temporary_path, compiled_file)
+	return len(index)
+
+
+# Function to read the circuit blocks of a compiled circuit file
+## The whole file is memory mapped once and the arrays of each block are views of it, so nothing but the index is read here.
+## The map is copy-on-write - a solver which changes an array (e.g. removing DC sources in a sweep) changes only its own copy of the pages it writes.
+## Yields the blocks in the order they were compiled
+def Load_Circuits(compiled_file):
+	try:
+		mapped = np.memmap(compiled_file, dtype = np.uint8, mode = 'c')
+	except (OSError, ValueError):
+		print("Unable to locate file.")
+		exit()
+
+	if mapped[:len(COMPILED_MAGIC)].tobytes() != COMPILED_MAGIC:
+		print("Error:", compiled_file, "is not a compiled circuit file or was compiled by another version")
+		exit()
+
+	index_position = int(mapped[len(COMPILED_MAGIC):len(COMPILED_MAGIC) + 8].view(np.uint64)[0])
+	index = json.loads(mapped[index_position:].tobytes().decode())
+
+	for entry in index:
+		arrays = {}
+		for name, (position, dtype, shape) in entry['arrays'].items():
+			dtype = np.dtype(dtype)
+			arrays[name] = mapped[position:position + dtype.itemsize * int(np.prod(shape))].view(dtype).reshape(shape)
+
+		### The circuit is formed as finish() would have left it
+		circuit = CircuitArrays()
+		circuit.growing = None
+		circuit.control_names = None
+		for name in CIRCUIT_ARRAYS:
+			setattr(circuit, name, arrays[name])
+
+		circuit.names = StringTable(arrays['names_blob'], arrays['names_offsets'], arrays['names_order'])
+		circuit.node_names = StringTable(arrays['node_names_blob'], arrays['node_names_offsets'], arrays['node_names_order'])
+		circuit.name_index = NameIndex(circuit.names)
+		circuit.node_index = NameIndex(circuit.node_names)
+
+		circuit_block = CircuitBlock(entry['begin_line'])
+		circuit_block.circuit_components = circuit
+		circuit_block.ac_sweep = tuple(entry['ac_sweep']) if entry['ac_sweep'] != None else None
+		circuit_block.transient = tuple(entry['transient']) if entry['transient'] != None else None
+		circuit_block.steps = {name: np.array(values) for name, values in entry['steps'].items()}
+		circuit_block.transfer_function = tuple(entry['transfer_function']) if entry.get('transfer_function') != None else None
+		circuit_block.reduction = (entry['reduction'][0], tuple(entry['reduction'][1])) if entry.get('reduction') != None else None
+		circuit_block.source_frequencies = {circuit.names[element]: float(frequency) for element, frequency in zip(arrays['source_elements'], arrays['source_frequencies'])}
+
+		yield circuit_block
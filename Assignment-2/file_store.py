@@ -0,0 +1,111 @@
+'''
+Title	 : File Store
+Purpose  : To keep named sets of arrays as files in a directory within a limit on their total size, removing the least recently used ones first
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Directory, limit on its size and the arrays to be stored under each key
+Outputs  : Arrays stored under a key, if they are still present
+'''
+
+
+# Importing libraries
+import os
+import tempfile
+import numpy as np
+
+
+# Constants used in the code
+STORE_FILE_TYPE = '.npz'			# Extension of the files holding the arrays
+STORE_MAX_BYTES = 2**30				# Default limit on the total size of the files
+STORE_EVICT_FRACTION = 0.9			# Once the limit is crossed, files are removed till the store is within this fraction of the limit so that it isn't crossed again at the next file
+
+
+# Function to put a file written under a temporary name (by tempfile.mkstemp()) in place of the given path
+## mkstemp() makes the file readable only by its owner, so it is first given the permissions which open() would have given it
+def Replace_File(temporary_path, path):
+	umask = os.umask(0)
+	os.umask(umask)
+	os.chmod(temporary_path, 0o666 & ~umask)
+
+	os.replace(temporary_path, path)
+
+
+# Defining a Class FileStore to store sets of arrays as files in a directory, one file per key
+## The time of last use of a file is kept as its modification time, so that the least recently used files are removed first
+## once the total size of the files goes above max_bytes.
+class FileStore:
+	## Function to open the store in the given directory, creating the directory if it isn't present
+	def __init__(self, directory, max_bytes = STORE_MAX_BYTES):
+		self.directory = directory
+		self.max_bytes = max_bytes
+
+		os.makedirs(directory, exist_ok = True)
+
+		### Sizes and times of last use of the stored files are read once and kept up to date by this object
+		self.entries = {}
+		for file_name in os.listdir(directory):
+			if file_name.endswith(STORE_FILE_TYPE):
+				file_status = os.stat(os.path.join(directory, file_name))
+				self.entries[file_name[:-len(STORE_FILE_TYPE)]] = [file_status.st_mtime, file_status.st_size]
+
+		self.total_bytes = sum(size for _, size in self.entries.values())
+		self.evict()
+
+	## Function to get the path of the file holding the arrays with the given key
+	def path(self, key):
+		return os.path.join(self.directory, key + STORE_FILE_TYPE)
+
+	## Function to read the arrays stored under a key as a dictionary. None is returned if they aren't present or can't be read.
+	def read(self, key):
+		if key not in self.entries:
+			return None
+
+		try:
+			with np.load(self.path(key), allow_pickle = False) as stored:
+				return {name: stored[name] for name in stored.files}
+
+		except (OSError, ValueError):
+			self.remove(key)
+			return None
+
+	## Function to store arrays (given as a dictionary) under a key, replacing those stored under it before
+	### The file is written under a temporary name and then renamed so that a partly written file is never read
+	def write(self, key, arrays):
+		file_descriptor, temporary_path = tempfile.mkstemp(dir = self.directory, suffix = '.tmp')
+		with os.fdopen(file_descriptor, 'wb') as f:
+			np.savez(f, **arrays)
+
+		Replace_File(temporary_path, self.path(key))
+
+		if key in self.entries:
+			self.total_bytes -= self.entries[key][1]
+
+		self.entries[key] = [0, os.path.getsize(self.path(key))]
+		self.total_bytes += self.entries[key][1]
+		self.touch(key)
+		self.evict()
+
+	## Function to mark a file as just used
+	def touch(self, key):
+		os.utime(self.path(key))
+		self.entries[key][0] = os.path.getmtime(self.path(key))
+
+	## Function to remove a file from the store
+	def remove(self, key):
+		try:
+			os.remove(self.path(key))
+		except OSError:
+			pass
+
+		self.total_bytes -= self.entries.pop(key)[1]
+
+	## Function to remove the least recently used files until the store is within its size limit
+	def evict(self):
+		if self.total_bytes <= self.max_bytes:
+			return
+
+		for key in sorted(self.entries, key = lambda key: self.entries[key][0]):
+			if self.total_bytes <= STORE_EVICT_FRACTION * self.max_bytes:
+				break
+
+			self.remove(key)
@@ -0,0 +1,205 @@
+'''
+Title	 : Incremental Solver
+Purpose  : To solve a large DC circuit again after its netlist file is edited, reusing the factorisation and solution found when it was last solved
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a DC circuit, its node table and the directory in which the states of circuits solved before are kept
+Outputs  : Nodal voltages and currents through voltage sources, and how the earlier state of the circuit was used
+'''
+
+
+# Importing libraries
+import hashlib
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.linalg as sparse_linalg
+
+from compiled_circuit import Encode_Strings
+from file_store import FileStore
+from mna_engine import SPARSE_THRESHOLD, Assemble_MNA, Solve_Linear_Equations, Source_Vectors
+from node_ordering import DEFAULT_ORDERING, OrderedLU
+from parameter_step import Stamped_Values, Update_Vectors
+from phase_profiler import Profiled
+
+
+# Constants used in the code
+STATE_VERSION = 1					# Changed whenever the way states are stored changes, so that older states are not used
+STATE_MAX_BYTES = 4 * 2**30			# Default limit on the total size of the states. Factors of large circuits take a few hundred MB each.
+MAX_UPDATE_RANK = 16				# Largest number of changed components (other than independent sources) handled by low rank updates of the saved factors
+RESULT_KEY_SUFFIX = '.result'		# Added to the key of the structure of a circuit to get the key of its last solution
+INCREMENTAL_KINDS = ('reused', 'updated', 'refactored', 'solved')		# Ways in which a circuit can be solved (see Solve_DC_Incremental())
+
+
+# States of circuits:
+## A circuit is identified by its structure - the names, types and connections of its components without their values. Two states are kept for each:
+## its factors - the LU factors of its MNA matrix along with the values of the components and the ordering with which they were found, and
+## its last solution along with the values of the components it was found for. Circuits of up to SPARSE_THRESHOLD unknowns have no state
+## since they are solved faster than a state is read.
+## DC circuits which are split into independent parts (see Split_Block()) have a state for each part, so an edit to one part leaves the states
+## of the others as they are.
+
+STATES = {}			# Directory to the store of states opened in it by this process
+
+
+# Defining a Class StoredFactors to solve equations with LU factors which have been saved, in the way splu() does
+## The factors are Pr A Pc = L U, where Pr and Pc are the permutations of the rows and columns given by perm_r and perm_c.
+class StoredFactors:
+	## Function to initialise the factors from their arrays
+	def __init__(self, lower, upper, perm_r, perm_c):
+		self.L = lower
+		self.U = upper
+		self.perm_r = perm_r
+		self.perm_c = perm_c
+		self.shape = lower.shape
+
+	## Function to solve the equations for a vector or for the columns of a matrix
+	### Real factors are kept as real, so the real and imaginary parts of a complex B vector are solved separately
+	def solve(self, b_vector):
+		b_vector = np.asarray(b_vector)
+
+		if np.iscomplexobj(b_vector) and not np.iscomplexobj(self.L.data):
+			return self.solve(b_vector.real) + 1j * self.solve(b_vector.imag)
+
+		permuted = np.empty_like(b_vector)
+		permuted[self.perm_r] = b_vector
+
+		permuted = sparse_linalg.spsolve_triangular(self.L, permuted, lower = True, unit_diagonal = True)
+		permuted = sparse_linalg.spsolve_triangular(self.U, permuted, lower = False)
+		return permuted[self.perm_c]
+
+
+# Function to get the store of states in a directory, opening it once per process
+def Open_States(directory):
+	if directory not in STATES:
+		STATES[directory] = FileStore(directory, STATE_MAX_BYTES)
+
+	return STATES[directory]
+
+
+# Function to find the key of the structure of a circuit
+## The key is a hash of everything the MNA matrix depends on except the values of the components, along with the ordering used by sparse LU
+def Structure_Key(circuit, ordering = DEFAULT_ORDERING):
+	key = hashlib.sha256()
+
+	key.update(repr((STATE_VERSION, ordering)).encode())
+	for strings in (circuit.names, circuit.node_names):
+		for array in Encode_Strings(strings):
+			key.update(np.ascontiguousarray(array).tobytes())
+
+	for array in (circuit.types, circuit.nodes, circuit.controls, circuit.ac, circuit.parameters):
+		key.update(np.ascontiguousarray(array).tobytes())
+
+	return key.hexdigest()
+
+
+# Function to get the arrays of the factorisation of a matrix so that it can be stored
+## Factors whose entries are all real are stored as real, which halves their size
+def Factor_Arrays(ordered_lu, values):
+	factors = ordered_lu.factors
+	arrays = {'values': values, 'order': ordered_lu.column_order(), 'perm_r': factors.perm_r, 'perm_c': factors.perm_c}
+
+	for name, factor in (('lower', factors.L), ('upper', factors.U)):
+		factor = factor.tocsr()
+		arrays[name + '_data'] = factor.data.real if not np.any(factor.data.imag) else factor.data
+		arrays[name + '_indices'] = factor.indices
+		arrays[name + '_indptr'] = factor.indptr
+
+	### The order applied before factorising is kept only if the ordering wasn't left to SuperLU
+	if ordered_lu.order is not None:
+		arrays['factor_order'] = ordered_lu.order
+
+	return arrays
+
+
+# Function to get the factorisation stored by Factor_Arrays() back as an OrderedLU
+@Profiled('load_state')
+def Stored_LU(stored, ordering = DEFAULT_ORDERING):
+	size = len(stored['perm_r'])
+	lower = sparse.csr_matrix((stored['lower_data'], stored['lower_indices'], stored['lower_indptr']), shape = (size, size))
+	upper = sparse.csr_matrix((stored['upper_data'], stored['upper_indices'], stored['upper_indptr']), shape = (size, size))
+
+	return OrderedLU(None, ordering, stored.get('factor_order'), StoredFactors(lower, upper, stored['perm_r'], stored['perm_c']))
+
+
+# Function to solve a DC circuit with the factors of its MNA matrix for other values of some of its components
+## By the Sherman-Morrison-Woodbury formula as in Solve_Step_At(), with A the factorised matrix, U and W the update vectors of the changed
+## components and D the changes in their admittances (or values for controlled sources),
+##		(A + U D W^T)^-1 b = x - Z (I + D W^T Z)^-1 D W^T x,		where x = A^-1 b and Z = A^-1 U
+## Values of independent sources change only the B vector, which is formed afresh. Returns the solution or False if the updated matrix is singular
+@Profiled('update')
+def Update_Solve(circuit, node_table, ordered_lu, factor_values, changed):
+	b_vector = Source_Vectors(circuit, node_table, np.flatnonzero(circuit.mask('V', 'I'))).sum(axis = 1)
+	update_vectors = [Update_Vectors(circuit, node_table, element) for element in changed]
+
+	solved = ordered_lu.solve(np.column_stack([b_vector] + [u_vector for u_vector, _ in update_vectors]))
+	x_vector = solved[:, 0]
+
+	if len(changed) != 0:
+		z_matrix = solved[:, 1:]
+		w_matrix = np.column_stack([w_vector for _, w_vector in update_vectors])
+		changes = np.array([Stamped_Values(circuit, element, [circuit.values[element].real])[0] - Stamped_Values(circuit, element, [factor_values[element].real])[0] for element in changed])
+
+		try:
+			x_vector = x_vector - z_matrix @ np.linalg.solve(np.eye(len(changed)) + changes[:, None] * (w_matrix.T @ z_matrix), changes * (w_matrix.T @ x_vector))
+		except np.linalg.LinAlgError:
+			return False
+
+	if not np.all(np.isfinite(x_vector)):
+		return False
+
+	return x_vector
+
+
+# Function to solve a DC circuit using the state kept for its structure in the directory of states
+## reused		- The values of the components are those of its last solution, which is given as it is.
+## updated		- At most MAX_UPDATE_RANK components other than independent sources and none of the inductors have values other than those of the saved factors.
+##				  The saved factors are used through low rank updates (see Update_Solve()) and are kept as they are.
+## refactored	- More components than that have been changed. The matrix is factorised again with the order of the saved factors, so the
+##				  ordering (the symbolic analysis) isn't repeated, and the new factors are saved.
+## solved		- There is no state for the structure of the circuit, i.e. it is new or its connections have been changed. It is solved afresh.
+## Returns the solution as a column vector (or False if the MNA equations have no unique solution) and how it was solved (see INCREMENTAL_KINDS)
+def Solve_DC_Incremental(circuit, node_table, directory, solver_options = {}):
+	ordering = solver_options.get('ordering', DEFAULT_ORDERING)
+
+	if len(node_table) <= SPARSE_THRESHOLD:
+		mna_matrix, b_vector = Assemble_MNA(circuit, node_table)
+		return Solve_Linear_Equations(mna_matrix, b_vector, solver_options), 'solved'
+
+	states = Open_States(directory)
+	key = Structure_Key(circuit, ordering)
+
+	last_result = states.read(key + RESULT_KEY_SUFFIX)
+	if last_result != None and np.array_equal(last_result['values'], circuit.values):
+		states.touch(key + RESULT_KEY_SUFFIX)
+		return last_result['result'][:, None], 'reused'
+
+	stored = states.read(key)
+	x_vector = False
+
+	if stored != None:
+		changed = np.flatnonzero((stored['values'] != circuit.values) & ~circuit.mask('V', 'I'))
+
+		### Inductors are stamped as very large admittances at DC, so changes in them are left to a new factorisation
+		if len(changed) <= MAX_UPDATE_RANK and not np.any(circuit.mask('L')[changed]):
+			x_vector = Update_Solve(circuit, node_table, Stored_LU(stored, ordering), stored['values'], changed)
+			kind = 'updated'
+			states.touch(key)
+
+	## The matrix is factorised if the saved factors couldn't be used
+	if type(x_vector) == bool:
+		mna_matrix, b_vector = Assemble_MNA(circuit, node_table)
+
+		try:
+			ordered_lu = OrderedLU(mna_matrix, ordering, stored['order'] if stored != None else None)
+			x_vector = ordered_lu.solve(b_vector)[:, 0]
+		except RuntimeError:
+			return False, 'solved'
+
+		if not np.all(np.isfinite(x_vector)):
+			return False, 'solved'
+
+		kind = 'refactored' if stored != None else 'solved'
+		states.write(key, Factor_Arrays(ordered_lu, circuit.values))
+
+	states.write(key + RESULT_KEY_SUFFIX, {'values': circuit.values, 'result': x_vector})
+	return x_vector[:, None], kind
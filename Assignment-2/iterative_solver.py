@@ -0,0 +1,229 @@
+'''
+Title	 : Iterative Solver
+Purpose  : To solve very large resistive grids through preconditioned Krylov iterations, which need memory only in proportion to the size of the circuit
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a DC circuit and the method, preconditioner, tolerance and limit on the iterations to be used
+Outputs  : Nodal voltages and currents through voltage sources along with the iterations taken and the residual left
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.linalg as sparse_linalg
+
+from mna_engine import Assemble_MNA, MNAStamps
+from phase_profiler import Profiled
+
+## Algebraic multigrid is optional and only needed for the 'amg' preconditioner
+try:
+	import pyamg
+except ImportError:
+	pyamg = None
+
+
+# Constants used in the code
+SOLVERS = ('direct', 'cg', 'gmres', 'bicgstab')		# Accepted solvers. The first one is the default and is sparse LU (see Solve_Linear_Equations()).
+DEFAULT_SOLVER = SOLVERS[0]
+PRECONDITIONERS = ('ilu', 'amg', 'jacobi', 'none')	# Accepted preconditioners. The first one is the default.
+DEFAULT_PRECONDITIONER = PRECONDITIONERS[0]
+DEFAULT_TOLERANCE = 1e-10			# Iterations stop once the residual is below this fraction of the norm of the B vector
+DEFAULT_MAX_ITERATIONS = 1000		# Limit on the number of iterations (inner iterations for GMRES)
+ILU_DROP_TOLERANCE = 1e-4			# Entries of the incomplete factors smaller than this fraction of their column are dropped
+ILU_FILL_FACTOR = 10				# Incomplete factors are limited to this many times the nonzeros of the matrix, so that memory stays linear
+GMRES_RESTART = 50					# Number of inner iterations of GMRES after which it is restarted
+
+
+# Solvers:
+## cg		- Conjugate gradient. Needs a symmetric positive definite matrix, which the MNA equations are not. It is used on the nodal equations of
+##			  circuits of resistors, current sources and voltage sources from a node to ground, i.e. resistive grids (see Reduce_Resistive_Grid()).
+##			  For any other circuit GMRES is used instead.
+## gmres	- Restarted generalised minimal residual. Works for any nonsingular matrix.
+## bicgstab	- Biconjugate gradient stabilised. Works for any nonsingular matrix with less memory than GMRES but may break down.
+## Preconditioners:
+## ilu		- Incomplete LU, or incomplete Cholesky for CG (see Incomplete_Cholesky()).
+## amg		- Smoothed aggregation algebraic multigrid (needs pyamg). Best suited to the nodal equations of large grids.
+## jacobi	- Inverse of the diagonal of the matrix.
+
+
+# Function to get the incomplete LU factorisation of a matrix
+## For symmetric matrices the rows and columns are reordered together by minimum degree and diagonal pivots are used, so that U is close to D L^T
+def Incomplete_LU(matrix, symmetric = False):
+	if symmetric:
+		return sparse_linalg.spilu(matrix, drop_tol = ILU_DROP_TOLERANCE, fill_factor = ILU_FILL_FACTOR, permc_spec = 'MMD_AT_PLUS_A', diag_pivot_thresh = 0, options = {'SymmetricMode': True})
+
+	return sparse_linalg.spilu(matrix, drop_tol = ILU_DROP_TOLERANCE, fill_factor = ILU_FILL_FACTOR)
+
+
+# Function to get an incomplete Cholesky factorisation L D L^T of a symmetric positive definite matrix as a LinearOperator applying its inverse
+## It is got from the incomplete LU, keeping only L and the diagonal of U. Entries dropped from L and U differ slightly, so U isn't
+## exactly D L^T and CG needs the preconditioner to be exactly symmetric.
+def Incomplete_Cholesky(matrix):
+	factors = Incomplete_LU(matrix, True)
+	lower = factors.L.tocsr()
+	upper = factors.L.T.tocsr()
+	diagonal = factors.U.diagonal()
+	order = factors.perm_r
+
+	### Solves P^T L D L^T P x = b, where P is the reordering
+	def Apply(b_vector):
+		b_vector = np.asarray(b_vector).reshape(-1)
+		permuted = np.empty_like(b_vector)
+		permuted[order] = b_vector
+
+		permuted = sparse_linalg.spsolve_triangular(lower, permuted, lower = True, unit_diagonal = True) / diagonal
+		permuted = sparse_linalg.spsolve_triangular(upper, permuted, lower = False, unit_diagonal = True)
+		return permuted[order]
+
+	return sparse_linalg.LinearOperator(matrix.shape, Apply, dtype = matrix.dtype)
+
+
+# Function to get the preconditioner of a matrix as a LinearOperator which applies an approximate inverse of the matrix
+## The preconditioner has to be symmetric for CG. Returns None if no preconditioner is to be used
+@Profiled('preconditioner')
+def Preconditioner(matrix, preconditioner, method, symmetric = False):
+	if preconditioner == 'ilu' and method == 'cg':
+		return Incomplete_Cholesky(matrix)
+
+	if preconditioner == 'ilu':
+		return sparse_linalg.LinearOperator(matrix.shape, Incomplete_LU(matrix, symmetric).solve, dtype = matrix.dtype)
+
+	if preconditioner == 'amg':
+		multigrid = pyamg.smoothed_aggregation_solver(matrix, symmetry = 'symmetric' if symmetric else 'nonsymmetric')
+		return multigrid.aspreconditioner()
+
+	if preconditioner == 'jacobi':
+		diagonal = matrix.diagonal()
+		diagonal[diagonal == 0] = 1
+		return sparse_linalg.LinearOperator(matrix.shape, lambda vector: vector / diagonal if vector.ndim == 1 else vector / diagonal[:, None], dtype = matrix.dtype)
+
+	return None
+
+
+# Function to solve A x = b by a preconditioned Krylov method
+## symmetric tells whether the matrix is symmetric, so that a symmetric preconditioner can be used.
+## Returns the solution along with the number of iterations taken, the residual ||b - A x|| / ||b|| at the end and whether the method converged
+@Profiled('solve')
+def Krylov_Solve(matrix, b_vector, method, preconditioner = DEFAULT_PRECONDITIONER, tolerance = DEFAULT_TOLERANCE, max_iterations = DEFAULT_MAX_ITERATIONS, symmetric = False):
+	matrix = sparse.csr_matrix(matrix)
+	iterations = [0]
+
+	### Called once at every iteration so that the iterations can be counted
+	def Count_Iteration(_):
+		iterations[0] += 1
+
+	preconditioner_operator = Preconditioner(matrix.tocsc(), preconditioner, method, symmetric)
+
+	if method == 'cg':
+		x_vector, information = sparse_linalg.cg(matrix, b_vector, rtol = tolerance, atol = 0, maxiter = max_iterations, M = preconditioner_operator, callback = Count_Iteration)
+
+	elif method == 'bicgstab':
+		x_vector, information = sparse_linalg.bicgstab(matrix, b_vector, rtol = tolerance, atol = 0, maxiter = max_iterations, M = preconditioner_operator, callback = Count_Iteration)
+
+	else:
+		restart = min(GMRES_RESTART, max_iterations)
+		x_vector, information = sparse_linalg.gmres(matrix, b_vector, rtol = tolerance, atol = 0, restart = restart, maxiter = -(-max_iterations // restart), M = preconditioner_operator, callback = Count_Iteration, callback_type = 'pr_norm')
+
+	b_norm = np.linalg.norm(b_vector)
+	residual = np.linalg.norm(b_vector - matrix @ x_vector) / b_norm if b_norm != 0 else np.linalg.norm(matrix @ x_vector)
+
+	return x_vector, iterations[0], residual, information == 0
+
+
+# Function to reduce a resistive grid to its nodal equations G V = I, which are symmetric positive definite
+## This is possible when the circuit has only resistors, current sources and voltage sources with a node at ground. The voltage of the other
+## node of each voltage source is then known, and only the voltages of the remaining nodes are unknowns.
+## Returns the conductance matrix of all the nodes (ground included), the currents entering the nodes from the current sources,
+## the nodes with known voltages and those voltages, or None if the circuit isn't a resistive grid
+def Reduce_Resistive_Grid(circuit):
+	node_gnd = circuit.node_index['GND']
+	node1 = circuit.nodes[:, 0]
+	node2 = circuit.nodes[:, 1]
+	values = circuit.values.real
+
+	resistors = circuit.mask('R')
+	voltage_sources = circuit.mask('V')
+	current_sources = circuit.mask('I')
+
+	if not np.all(resistors | voltage_sources | current_sources) or np.any(circuit.ac) or np.any(values[resistors] == 0):
+		return None
+
+	## Each voltage source fixes the voltage of its node which isn't ground, and no node may be fixed twice
+	if np.any((node1[voltage_sources] != node_gnd) & (node2[voltage_sources] != node_gnd)):
+		return None
+
+	fixed_nodes = np.where(node2[voltage_sources] == node_gnd, node1[voltage_sources], node2[voltage_sources])
+	fixed_voltages = np.where(node2[voltage_sources] == node_gnd, values[voltage_sources], -values[voltage_sources])
+
+	if np.any(fixed_nodes == node_gnd) or len(np.unique(fixed_nodes)) != len(fixed_nodes):
+		return None
+
+	node_count = len(circuit.node_names)
+	conductance_stamps = MNAStamps(node_count)
+	conductance_stamps.add_admittances(node1[resistors], node2[resistors], 1/values[resistors])
+	conductance_matrix = conductance_stamps.to_matrix(float)
+
+	### Current is assumed to flow from the first node of the source to the second node through it (see Source_Vectors())
+	node_currents = np.zeros(node_count)
+	np.add.at(node_currents, node1[current_sources], -values[current_sources])
+	np.add.at(node_currents, node2[current_sources], values[current_sources])
+
+	return conductance_matrix, node_currents, fixed_nodes, fixed_voltages
+
+
+# Function to solve a DC circuit by the iterative method given in solver_options
+## Resistive grids are solved through their nodal equations (see Reduce_Resistive_Grid()) and all other circuits through their MNA equations,
+## with GMRES in place of CG since the MNA matrix isn't positive definite.
+## Returns the solution as a column vector in the order of node_table (or False if the iterations don't converge) and a report of
+## (method, preconditioner, iterations, residual, converged)
+def Solve_DC_Iterative(circuit, node_table, solver_options = {}):
+	method = solver_options.get('solver', 'cg')
+	preconditioner = solver_options.get('preconditioner', DEFAULT_PRECONDITIONER)
+	tolerance = solver_options.get('tolerance', DEFAULT_TOLERANCE)
+	max_iterations = solver_options.get('max_iterations', DEFAULT_MAX_ITERATIONS)
+
+	grid = Reduce_Resistive_Grid(circuit)
+
+	try:
+		if grid != None:
+			conductance_matrix, node_currents, fixed_nodes, fixed_voltages = grid
+
+			### Voltages of ground and of the fixed nodes are moved to the right hand side
+			node_voltages = np.zeros(len(node_currents))
+			node_voltages[fixed_nodes] = fixed_voltages
+			free_nodes = np.ones(len(node_currents), dtype = bool)
+			free_nodes[fixed_nodes] = False
+			free_nodes[circuit.node_index['GND']] = False
+
+			free_matrix = conductance_matrix[free_nodes][:, free_nodes]
+			free_currents = node_currents[free_nodes] - conductance_matrix[free_nodes] @ node_voltages
+
+			node_voltages[free_nodes], iterations, residual, converged = Krylov_Solve(free_matrix, free_currents, method, preconditioner, tolerance, max_iterations, True)
+
+			### Current through each voltage source is what is left over by KCL at its fixed node
+			leftover_currents = conductance_matrix @ node_voltages - node_currents
+			voltage_sources = np.flatnonzero(circuit.mask('V'))
+			source_currents = np.where(circuit.nodes[voltage_sources, 1] == circuit.node_index['GND'], leftover_currents[fixed_nodes], -leftover_currents[fixed_nodes])
+
+			x_vector = np.zeros(len(node_table))
+			x_vector[:len(node_voltages)] = node_voltages
+			x_vector[node_table.branch_index[voltage_sources]] = source_currents
+
+		else:
+			if method == 'cg':
+				method = 'gmres'
+
+			mna_matrix, b_vector = Assemble_MNA(circuit, node_table)
+			x_vector, iterations, residual, converged = Krylov_Solve(mna_matrix.real, b_vector[:, 0].real, method, preconditioner, tolerance, max_iterations)
+
+	### The incomplete factorisation fails if a pivot is exactly 0
+	except RuntimeError:
+		return False, (method, preconditioner, 0, np.inf, False)
+
+	solver_report = (method, preconditioner, iterations, float(residual), bool(converged))
+
+	if not converged or not np.all(np.isfinite(x_vector)):
+		return False, solver_report
+
+	return x_vector.astype(complex)[:, None], solver_report
@@ -0,0 +1,326 @@
+'''
+Title	 : MNA Engine
+Purpose  : To assemble the MNA matrix of a circuit in sparse form and to solve the resulting linear equations
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Circuit stored as CircuitArrays
+Outputs  : Sparse MNA matrix and the solution of the MNA equations
+'''
+
+
+# Importing libraries
+import sys
+import numpy as np
+import scipy.sparse as sparse
+
+from circuit_store import BRANCH_TYPES, TYPE_CODE
+from node_ordering import DEFAULT_ORDERING, OrderedLU
+from phase_profiler import Profiled
+
+
+# Constants used in the code
+SPARSE_THRESHOLD = 200		# Circuits with more unknowns than this are solved through sparse LU instead of a dense solver
+MIN_FLOAT = sys.float_info.min * 1e100  	# Slightly more than python's minimum value to prevent errors
+
+
+# Defining a Class NodeTable to give every node and pseudo node (current through a voltage source) an integer index.
+## Names are stored in a dictionary so that looking up the index of a node takes constant time.
+## Nodes are named 'V_'+'node_name' and pseudo nodes are named 'I_'+'element_name' as done in the solvers.
+## branch_index holds the index of the pseudo node of each component of the circuit (-1 if it has none).
+class NodeTable:
+	## Function to initialise an empty table
+	def __init__(self):
+		self.names = []				# Index to name
+		self.index_of = {}			# Name to index
+		self.branch_index = None	# Component to index of its pseudo node
+
+	## Function to add a name to the table if it isn't present and to return its index
+	def add(self, name):
+		if name not in self.index_of:
+			self.index_of[name] = len(self.names)
+			self.names.append(name)
+
+		return self.index_of[name]
+
+	## Function to get the index of a name. KeyError is raised if the name isn't present
+	def index(self, name):
+		return self.index_of[name]
+
+	## Function to get the indices of a list of names as an integer array
+	def indices(self, names):
+		return np.fromiter((self.index_of[name] for name in names), dtype = np.int64, count = len(names))
+
+	def __contains__(self, name):
+		return name in self.index_of
+
+	def __len__(self):
+		return len(self.names)
+
+
+# Function to build the node table of a circuit once so that it can be shared by the DC and AC solvers
+## Nodes keep the indices given to them in the circuit and are followed by the pseudo nodes in the order of the components
+## Here ground is included and its equation is later replaced by V_GND = 0 by the solvers
+## If inductor_currents is True, currents through inductors are also taken as unknowns (needed when the MNA matrix is split as G + jwC)
+def Build_Node_Table(circuit, inductor_currents = False):
+	node_table = NodeTable()
+
+	for node_name in circuit.node_names:
+		node_table.add('V_' + node_name)
+
+	## Pseudo nodes are being identified and added here for voltage sources and controlled voltage sources
+	branch_types = BRANCH_TYPES + ('L',) if inductor_currents else BRANCH_TYPES
+	branch_elements = np.flatnonzero(circuit.mask(*branch_types))
+
+	for element in branch_elements:
+		node_table.add('I_' + circuit.names[element])
+
+	node_table.branch_index = np.full(len(circuit), -1, dtype = np.int64)
+	node_table.branch_index[branch_elements] = len(circuit.node_names) + np.arange(len(branch_elements))
+
+	return node_table
+
+
+# Defining a Class MNAStamps to collect the entries of the MNA matrix in coordinate (COO) form.
+## Each stamp is only appended here and entries at the same position are added together when the matrix is formed.
+## This way, the memory needed is proportional to the number of stamps instead of the square of the number of unknowns.
+## Single entries are collected in lists while stamps of many elements at once are collected as blocks of arrays.
+class MNAStamps:
+	## Function to initialise an empty set of stamps for a matrix of given size
+	def __init__(self, mna_size):
+		self.mna_size = mna_size
+		self.rows = []
+		self.cols = []
+		self.values = []
+		self.blocks = []
+		self.ground = None
+		self.ground_diagonal = 0
+
+	## Function to replace the equation of the ground node by V_GND = 0 (diagonal is the value left at (ground, ground))
+	### The KCL equation of ground follows from those of the other nodes, so it is dropped along with the column of V_GND which is known to be 0.
+	### This way the ground node, which is connected to most of the components, doesn't form a dense row and column of the matrix.
+	def set_ground(self, node_gnd, diagonal = 1):
+		self.ground = node_gnd
+		self.ground_diagonal = diagonal
+
+	## Function to add value to the entry (row, col) of the MNA matrix
+	def add(self, row, col, value):
+		self.rows.append(row)
+		self.cols.append(col)
+		self.values.append(value)
+
+	## Function to add many entries at once given as arrays of rows, columns and values
+	def add_block(self, rows, cols, values):
+		self.blocks.append((np.asarray(rows, dtype = np.int64), np.asarray(cols, dtype = np.int64), np.asarray(values)))
+
+	## Function to add the stamps of admittances connected between the arrays of nodes node1 and node2
+	### For transconductances (VCCS), the current between node1 and node2 depends on the voltage between the nodes control1 and control2 instead
+	def add_admittances(self, node1, node2, admittance, control1 = None, control2 = None):
+		node1 = np.asarray(node1, dtype = np.int64)
+		node2 = np.asarray(node2, dtype = np.int64)
+		control1 = node1 if control1 is None else np.asarray(control1, dtype = np.int64)
+		control2 = node2 if control2 is None else np.asarray(control2, dtype = np.int64)
+		admittance = np.asarray(admittance)
+
+		self.add_block(np.concatenate((node1, node1, node2, node2)), np.concatenate((control1, control2, control2, control1)), np.concatenate((admittance, -admittance, admittance, -admittance)))
+
+	## Function to convert the collected stamps into a sparse matrix in CSC form (the form needed by the LU factorisation)
+	### Duplicate entries are summed up during the conversion. The blocks are joined straight into arrays of the final types (32 bit indices
+	### when they fit, as scipy would convert them to anyway), with a last entry kept for the diagonal of ground so that it isn't appended later.
+	def to_matrix(self, dtype = complex):
+		index_type = np.int32 if self.mna_size < 2**31 else np.int64
+		rows = np.concatenate([np.array(self.rows, dtype = index_type)] + [block[0] for block in self.blocks] + [[-1]], dtype = index_type)
+		cols = np.concatenate([np.array(self.cols, dtype = index_type)] + [block[1] for block in self.blocks] + [[-1]], dtype = index_type)
+		values = np.concatenate([np.array(self.values, dtype = dtype)] + [block[2] for block in self.blocks] + [[self.ground_diagonal]], dtype = dtype)
+
+		if self.ground != None:
+			kept = (rows != self.ground) & (cols != self.ground)		### The last entry is kept since -1 isn't the ground
+			rows[-1] = cols[-1] = self.ground
+			rows = rows[kept]
+			cols = cols[kept]
+			values = values[kept]
+		else:
+			rows = rows[:-1]
+			cols = cols[:-1]
+			values = values[:-1]
+
+		return sparse.coo_matrix((values, (rows, cols)), shape = (self.mna_size, self.mna_size)).tocsc()
+
+
+
+# Function to add the stamps of the components which are independent of frequency, other than resistors
+## These are the voltage sources and all the controlled sources. Values of independent sources go to the B vector and not here.
+## Every type is stamped as a whole through the indices of its group of components (see CircuitArrays.group())
+def Stamp_Sources(mna_stamps, circuit, node_table):
+	node1 = circuit.nodes[:, 0]
+	node2 = circuit.nodes[:, 1]
+	pseudo_node = node_table.branch_index
+	values = circuit.values
+
+	## Voltage sources, VCVS and CCVS have their currents as unknowns.
+	### Here I am assuming the first node to be at higher potential and the current flowing from the first node
+	branches = circuit.group('V', 'E', 'H')
+	ones = np.ones(len(branches))
+	mna_stamps.add_block(np.concatenate((node1[branches], node2[branches], pseudo_node[branches], pseudo_node[branches])),
+						 np.concatenate((pseudo_node[branches], pseudo_node[branches], node1[branches], node2[branches])), np.concatenate((-ones, ones, ones, -ones)))
+
+	## VCVS. Here I am assuming the first dependent node to be at higher potential
+	vcvs = circuit.group('E')
+	mna_stamps.add_block(np.tile(pseudo_node[vcvs], 2), circuit.controls[vcvs].T.ravel(), np.concatenate((-values[vcvs], values[vcvs])))
+
+	## VCCS. Here I am assuming the current to flow from the first node to the second node and the first dependent node to be at higher potential
+	vccs = circuit.group('G')
+	mna_stamps.add_admittances(node1[vccs], node2[vccs], values[vccs], circuit.controls[vccs, 0], circuit.controls[vccs, 1])
+
+	## CCVS. The controlling current is the pseudo node of the controlling voltage source
+	ccvs = circuit.group('H')
+	mna_stamps.add_block(pseudo_node[ccvs], pseudo_node[circuit.controls[ccvs, 0]], -values[ccvs])
+
+	## CCCS. Here I am assuming the current to flow from the first node to the second node
+	cccs = circuit.group('F')
+	mna_stamps.add_block(np.concatenate((node1[cccs], node2[cccs])), np.tile(pseudo_node[circuit.controls[cccs, 0]], 2), np.concatenate((values[cccs], -values[cccs])))
+
+
+# Function to add the stamps of all the linear components of a circuit in one pass over the groups of components of each type
+## With c_stamps as None, the MNA matrix at frequency f (f = 0 for DC) is stamped into g_stamps. The admittances of the resistors, inductors and
+## capacitors are found for each type by a single array operation and are stamped together as one block.
+## With c_stamps given, the matrix is split as G + jwC instead (see Assemble_G_C()): conductances go to g_stamps, capacitances to c_stamps and
+## inductors are stamped as V_1 - V_2 - jwL*I_L = 0 through their currents, which need to be unknowns in the node table.
+def Stamp_Circuit(g_stamps, circuit, node_table, f = 0, c_stamps = None):
+	node1 = circuit.nodes[:, 0]
+	node2 = circuit.nodes[:, 1]
+	values = circuit.values
+
+	resistors = circuit.group('R')
+	inductors = circuit.group('L')
+	capacitors = circuit.group('C')
+
+	if c_stamps == None:
+		passives = np.concatenate((resistors, inductors, capacitors))
+		admittances = np.empty(len(passives), dtype = complex)
+		inductor_start = len(resistors)
+		capacitor_start = len(resistors) + len(inductors)
+
+		## For DC, I am adding a factor to make the effective resistance of inductors close to 0 and that of capacitors extremely large at steady state.
+		admittances[:inductor_start] = 1/values[resistors]
+		if f == 0:
+			admittances[inductor_start:capacitor_start] = 1/(MIN_FLOAT * values[inductors])
+			admittances[capacitor_start:] = MIN_FLOAT * values[capacitors]
+		else:
+			admittances[inductor_start:capacitor_start] = 1/( (1j) * 2*np.pi*f * values[inductors] )
+			admittances[capacitor_start:] = (1j) * 2*np.pi*f * values[capacitors]
+
+		g_stamps.add_admittances(node1[passives], node2[passives], admittances)
+
+	else:
+		## Resistor's conductance goes to G and capacitor's capacitance goes to C
+		g_stamps.add_admittances(node1[resistors], node2[resistors], 1/values[resistors])
+		c_stamps.add_admittances(node1[capacitors], node2[capacitors], values[capacitors])
+
+		## Inductor's current is an unknown. Here I am assuming the current to flow from the first node to the second node
+		pseudo_node = node_table.branch_index[inductors]
+		ones = np.ones(len(pseudo_node))
+		g_stamps.add_block(np.concatenate((node1[inductors], node2[inductors], pseudo_node, pseudo_node)),
+						   np.concatenate((pseudo_node, pseudo_node, node1[inductors], node2[inductors])), np.concatenate((ones, -ones, ones, -ones)))
+		c_stamps.add_block(pseudo_node, pseudo_node, -values[inductors])
+
+	Stamp_Sources(g_stamps, circuit, node_table)
+
+
+# Function to assemble the MNA matrix and the corresponding B vector of a circuit at frequency f (f = 0 for DC)
+## The matrix is returned in sparse form and does not depend on the values of the independent sources
+@Profiled('assemble')
+def Assemble_MNA(circuit, node_table, f = 0):
+	## Size of the system is pre-determined. The MNA matrix is collected as sparse stamps since most of its entries are 0
+	mna_stamps = MNAStamps(len(node_table))
+	Stamp_Circuit(mna_stamps, circuit, node_table, f)
+
+	## Additional modification to the matrix to make the potential of ground 0
+	mna_stamps.set_ground(circuit.node_index['GND'])
+
+	## All the independent sources act together in the B vector
+	b_vector = Source_Vectors(circuit, node_table, circuit.group('V', 'I')).sum(axis = 1, keepdims = True)
+
+	return mna_stamps.to_matrix(), b_vector
+
+
+# Function to get the B vectors of the given independent sources (indices of components) as columns of a matrix, i.e. each source acting alone
+## These can be solved together as multiple right hand sides since the MNA matrix is the same for all of them
+def Source_Vectors(circuit, node_table, source_elements):
+	source_elements = np.asarray(source_elements, dtype = np.int64)
+	b_vectors = np.zeros((len(node_table), len(source_elements)), dtype = complex)
+	columns = np.arange(len(source_elements))
+	types = circuit.types[source_elements]
+	values = circuit.values[source_elements]
+
+	## Voltage source's value goes to the equation of its pseudo node
+	voltage_sources = types == TYPE_CODE['V']
+	b_vectors[node_table.branch_index[source_elements[voltage_sources]], columns[voltage_sources]] += values[voltage_sources]
+
+	## Current source's value goes to the equations of its nodes. Here I am assuming that the current is flowing from the first node
+	current_sources = types == TYPE_CODE['I']
+	np.add.at(b_vectors, (circuit.nodes[source_elements[current_sources], 0], columns[current_sources]), -values[current_sources])
+	np.add.at(b_vectors, (circuit.nodes[source_elements[current_sources], 1], columns[current_sources]), values[current_sources])
+
+	## Equation of ground is V_GND = 0
+	b_vectors[circuit.node_index['GND']] = 0
+
+	return b_vectors
+
+
+# Function to get the B vector of an independent source at unit value, i.e. the B vector of the source with value 1
+def Unit_Source_Vector(circuit, node_table, source):
+	b_vector = np.zeros(len(node_table))
+
+	### Voltage source's value goes to its pseudo node and current source's value flows from its first node to its second
+	if circuit.types[source] == TYPE_CODE['V']:
+		b_vector[node_table.branch_index[source]] = 1
+	else:
+		b_vector[circuit.nodes[source, 0]] -= 1
+		b_vector[circuit.nodes[source, 1]] += 1
+
+	b_vector[circuit.node_index['GND']] = 0
+	return b_vector
+
+
+# Function to solve linear equations given in the form of a matrix
+## Small systems are solved densely since it is faster for them. Larger systems are factorised through sparse LU after reordering
+## the unknowns by the ordering given in solver_options (see node_ordering.py).
+## If the solution is not unique then a Bool value will be returned instead of a vector
+@Profiled('solve')
+def Solve_Linear_Equations(A_matrix, B_vector, solver_options = {}):
+	try:
+		if not sparse.issparse(A_matrix):
+			vector_result = np.linalg.solve(A_matrix, B_vector)
+
+		elif A_matrix.shape[0] <= SPARSE_THRESHOLD:
+			vector_result = np.linalg.solve(A_matrix.toarray(), B_vector)
+
+		else:
+			vector_result = OrderedLU(A_matrix, solver_options.get('ordering', DEFAULT_ORDERING)).solve(B_vector)
+
+			### A sparse LU may finish even for a nearly singular matrix, so the result is checked
+			if not np.all(np.isfinite(vector_result)):
+				vector_result = False
+
+	except (np.linalg.LinAlgError, RuntimeError):
+		vector_result = False
+
+	return vector_result
+
+
+# Function to assemble the MNA matrix of a circuit split into two parts G and C such that the MNA matrix at angular frequency w is G + jwC
+## The node table needs to have been built with inductor_currents = True. Inductors are stamped as V_1 - V_2 - jwL*I_L = 0 for this purpose.
+## The vector of source values is frequency independent and is also returned along with the matrices
+@Profiled('assemble')
+def Assemble_G_C(circuit, node_table):
+	g_stamps = MNAStamps(len(node_table))
+	c_stamps = MNAStamps(len(node_table))
+	Stamp_Circuit(g_stamps, circuit, node_table, c_stamps = c_stamps)
+
+	## Additional modification to the matrix to make the potential of ground 0
+	g_stamps.set_ground(circuit.node_index['GND'])
+	c_stamps.set_ground(circuit.node_index['GND'], 0)
+
+	b_vector = Source_Vectors(circuit, node_table, circuit.group('V', 'I')).sum(axis = 1, keepdims = True)
+
+	return g_stamps.to_matrix(), c_stamps.to_matrix(), b_vector
@@ -0,0 +1,355 @@
+'''
+Title	 : Model Reduction
+Purpose  : To reduce a large linear RC/RLC circuit to a small passive model at its ports by a Krylov projection (PRIMA), on which frequency sweeps and transients are run
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a linear circuit, the nodes kept as outputs and the order of the reduction (given by a .reduce directive)
+Outputs  : Voltages of the kept nodes over a frequency sweep or in time, found from the reduced model
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.linalg as linalg
+import scipy.sparse as sparse
+import scipy.sparse.linalg as sparse_linalg
+
+from ac_sweep import SWEEP_BATCH_BYTES
+from mna_engine import Assemble_G_C, Build_Node_Table
+from node_ordering import DEFAULT_ORDERING, OrderedLU
+from phase_profiler import Phase, Profiled
+from transient import TRAN_GMIN, Source_Phasors, TransientStepper, Write_Waveforms
+
+
+# Constants used in the code
+REDUCE_DEFLATION = 1e-10		# Krylov vectors smaller than this (relative to the largest of their block) after orthogonalisation are dropped as dependent on the others
+REDUCE_SHIFT = 1e-3				# Expansion point (relative to the scale of the circuit) used in place of DC when the matrix at DC is singular
+REDUCE_POINTS = 4				# Largest number of expansion points over which the moments of a reduced model are split
+REDUCE_TOLERANCE = 1e-3			# Largest estimated error of a reduced model, relative to the largest value of each of its outputs, for which it isn't refined further
+REDUCE_CHECKS = 2				# Number of new frequencies at which a reduced model is compared with the whole circuit each time its error is estimated
+REDUCE_REFINEMENTS = 4			# Largest number of expansion points added to a reduced model whose estimated error is more than REDUCE_TOLERANCE
+REDUCE_GRID = 50				# Number of frequencies (spread logarithmically) over which a reduced model used for a transient is checked
+
+
+# Reduced models (PRIMA):
+## With G and C as in Assemble_G_C(), the circuit is (G + sC) x = B u with the independent sources as inputs u and the voltages of the kept nodes
+## as outputs y = L^T x. The moments of x about an expansion point s0 span the block Krylov space of (G + s0 C)^-1 C starting from (G + s0 C)^-1 P,
+## where P holds B along with a unit current into each kept node, so that the kept nodes are ports as well. A single expansion point is accurate
+## only near it, so the order (number of blocks of moments) is split over a few points s0 spread over the frequencies of the analysis (multipoint PRIMA).
+## An orthonormal basis V of the blocks at all the points is found by block Arnoldi with one LU factorisation of G + s0 C per point, and the reduced model is the congruence
+##		Gr = V^T G V,	Cr = V^T C V,	Br = V^T B,		Lr = V^T L
+## which matches the moments of the response to every port at each point. It has at most order * (inputs + outputs) unknowns however large the circuit is.
+## The equations of the inductors are negated first, so that G + G^T and C are positive semi-definite for circuits of R, L, C and independent sources.
+## A congruence keeps both of these, so the reduced model is passive and its transients are stable. Every column of V is 0 in the row of ground,
+## so the equation V_GND = 0 drops out of the reduced model. Controlled sources are reduced in the same way but without the guarantee of passivity.
+## Moments matched at real points s0 say little about the response at s = jw far from them (e.g. for long RC lines), so the model is checked against
+## a solve of the whole circuit at a few of the frequencies at which it is used. While the error is too large, the worst of those frequencies is
+## added as an expansion point s0 = jw (see Reduce_Model()), and if it is still too large after REDUCE_REFINEMENTS points the error is reported.
+
+
+# Defining a Class ReducedModel to hold the matrices of a reduced model and solve them
+## b_matrix holds the reduced B vectors of the inputs along its columns, output_matrix gives the outputs (named by output_names) from the reduced unknowns
+## and dc_matrix is the reduced G with the conductances TRAN_GMIN to ground used only for the initial operating point of a transient.
+## full_size is the number of unknowns of the circuit which was reduced and error is the estimated error of the model (see Reduction_Error()),
+## or None if it couldn't be estimated.
+class ReducedModel:
+	## Function to initialise the model from its matrices
+	def __init__(self, g_matrix, c_matrix, b_matrix, dc_matrix, output_matrix, output_names, full_size):
+		self.g_matrix = g_matrix
+		self.c_matrix = c_matrix
+		self.b_matrix = b_matrix
+		self.dc_matrix = dc_matrix
+		self.output_matrix = output_matrix
+		self.output_names = output_names
+		self.full_size = full_size
+		self.error = None
+
+	def __len__(self):
+		return len(self.g_matrix)
+
+	## Function to find the outputs at the given angular frequencies for each of the inputs along the columns of b_matrix (reduced B vectors)
+	### Returns a matrix of the outputs (along the rows) for each input (along the columns) at each frequency. The dense matrices are solved
+	### in batches limited by SWEEP_BATCH_BYTES.
+	def transfer(self, omegas, b_matrix):
+		size = len(self)
+		results = np.zeros((len(omegas), len(self.output_names), b_matrix.shape[1]), dtype = complex)
+		batch_size = max(1, SWEEP_BATCH_BYTES // (16 * size * (size + b_matrix.shape[1])))
+
+		for start in range(0, len(omegas), batch_size):
+			batch_omegas = omegas[start:start + batch_size]
+			mna_matrices = self.g_matrix[None, :, :] + (1j * batch_omegas[:, None, None]) * self.c_matrix[None, :, :]
+			results[start:start + batch_size] = self.output_matrix @ np.linalg.solve(mna_matrices, np.broadcast_to(b_matrix, (len(batch_omegas),) + b_matrix.shape))
+
+		return results
+
+	## Function to find the outputs at the given angular frequencies for all the inputs acting together
+	### Returns the outputs at each frequency along the rows
+	@Profiled('solve')
+	def sweep(self, omegas):
+		return self.transfer(omegas, self.b_matrix.sum(axis = 1, keepdims = True))[:, :, 0]
+
+
+# Function to get G and C of a circuit with the equations of the inductors negated (see Reduced models) along with its node table and B vector
+## The matrices are real unless values of components are given as complex numbers
+def Passive_G_C(circuit):
+	node_table = Build_Node_Table(circuit, inductor_currents = True)
+	g_matrix, c_matrix, b_vector = Assemble_G_C(circuit, node_table)
+
+	if not np.any(g_matrix.data.imag) and not np.any(c_matrix.data.imag):
+		g_matrix = g_matrix.real
+		c_matrix = c_matrix.real
+
+	signs = np.ones(len(node_table))
+	signs[node_table.branch_index[circuit.group('L')]] = -1
+	signs = sparse.diags(signs)
+
+	return node_table, (signs @ g_matrix).tocsc(), (signs @ c_matrix).tocsc(), b_vector
+
+
+# Function to get the expansion points of a reduced model and the number of moments matched at each
+## The order is split as evenly as possible over up to REDUCE_POINTS points spread logarithmically over the angular frequencies from omega_min
+## to omega_max (with more moments at the lower points), so that the model is accurate over the whole range rather than only near one point.
+## If dc is True, the first point is moved to DC so that the DC response is matched.
+def Expansion_Points(omega_min, omega_max, order, dc = False):
+	points = min(order, REDUCE_POINTS)
+	shifts = np.geomspace(omega_min, omega_max, points) if points > 1 else np.array([np.sqrt(omega_min * omega_max)])
+	moments = np.full(points, order // points)
+	moments[:order % points] += 1
+
+	if dc:
+		shifts[0] = 0
+
+	return list(zip(shifts.tolist(), moments.tolist()))
+
+
+# Function to factorise G + s0 C for an expansion point s0, which is moved off the origin if G is singular
+## Returns the OrderedLU or None if the matrix couldn't be factorised
+def Shifted_LU(g_matrix, c_matrix, shift, ordering = DEFAULT_ORDERING):
+	scale = sparse_linalg.norm(g_matrix, 1) / max(sparse_linalg.norm(c_matrix, 1), np.finfo(float).tiny)
+
+	for sigma in ([shift] if shift != 0 else [0, REDUCE_SHIFT * scale]):
+		try:
+			return OrderedLU((g_matrix + sigma * c_matrix).tocsc(), ordering)
+		except RuntimeError:
+			pass
+
+	return None
+
+
+# Function to orthonormalise the columns of block against the orthonormal columns of basis
+## The block is orthogonalised twice against the basis (block modified Gram-Schmidt) and then by QR with column pivoting within itself, dropping
+## the columns which depend on the others. Returns the new orthonormal columns.
+def Orthonormal_Columns(block, basis):
+	tolerance = REDUCE_DEFLATION * max(np.linalg.norm(block, axis = 0), default = 0)
+	for _ in range(2):
+		block = block - basis @ (basis.conj().T @ block)
+
+	q_matrix, r_matrix, _ = linalg.qr(block, mode = 'economic', pivoting = True)
+	rank = np.count_nonzero(abs(np.diag(r_matrix)) > tolerance)
+
+	return q_matrix[:, :rank]
+
+
+# Function to find an orthonormal basis of the Krylov spaces of (G + s0 C)^-1 C starting from (G + s0 C)^-1 ports at each expansion point s0
+## expansion_points holds (s0, moments) as given by Expansion_Points(). G + s0 C is factorised once per point. If basis is given, its columns are
+## kept in front and the new blocks are orthonormalised against them (see Orthonormal_Columns()).
+## For real matrices, the blocks at a complex s0 are orthonormalised among themselves and their real and imaginary parts are added to the basis,
+## which keeps the basis real and matches the moments at both s0 and its conjugate.
+## Returns the basis along the columns of a matrix, or False if G + s0 C couldn't be factorised at any point
+def Krylov_Basis(g_matrix, c_matrix, ports, expansion_points, ordering = DEFAULT_ORDERING, basis = None):
+	if basis is None:
+		basis = np.zeros((g_matrix.shape[0], 0), dtype = np.result_type(g_matrix.dtype, c_matrix.dtype, ports.dtype))
+
+	for shift, moments in expansion_points:
+		ordered_lu = Shifted_LU(g_matrix, c_matrix, shift, ordering)
+		if ordered_lu == None:
+			return False
+
+		split = np.iscomplexobj(shift) and not np.iscomplexobj(basis)
+		point_basis = np.zeros((g_matrix.shape[0], 0), dtype = complex)
+
+		block = ordered_lu.solve(ports)
+		for moment in range(moments):
+			if not np.all(np.isfinite(block)):
+				return False
+
+			if split:
+				q_matrix = Orthonormal_Columns(block, point_basis)
+				point_basis = np.column_stack((point_basis, q_matrix))
+				basis = np.column_stack((basis, Orthonormal_Columns(np.column_stack((q_matrix.real, q_matrix.imag)), basis)))
+			else:
+				q_matrix = Orthonormal_Columns(block, basis)
+				basis = np.column_stack((basis, q_matrix))
+
+			if q_matrix.shape[1] == 0:
+				break
+
+			if moment + 1 < moments:
+				block = ordered_lu.solve(c_matrix @ q_matrix)
+
+	return basis
+
+
+# Function to project G and C (with the equations of inductors negated) onto a basis, giving a model with inputs along the columns of b_matrix and
+# the unknowns in output_rows as outputs
+## gmin holds the conductance to ground of every unknown which is added to the reduced G for the initial operating point of a transient.
+def Project_Model(g_matrix, c_matrix, b_matrix, basis, output_rows, output_names, gmin = None):
+	with Phase('project'):
+		basis_h = basis.conj().T
+		g_reduced = basis_h @ (g_matrix @ basis)
+		c_reduced = basis_h @ (c_matrix @ basis)
+		dc_reduced = g_reduced if gmin is None else g_reduced + (basis_h * gmin) @ basis
+
+	return ReducedModel(g_reduced, c_reduced, basis_h @ b_matrix, dc_reduced, basis[output_rows], output_names, g_matrix.shape[0])
+
+
+# Function to estimate the error of a reduced model over the angular frequencies omegas at which it is used
+## The outputs of the model for each input are compared with those of the whole circuit at every frequency in full_outputs, after REDUCE_CHECKS new
+## frequencies are added to it. These are the ones of omegas farthest (on a log scale) from the expansion points jw and from the frequencies already
+## checked, and the whole circuit is solved once at each of them. Real expansion points aren't counted, as the model is exact at s0 but not at jw.
+## The error at a frequency is relative to the largest value of the same output for the same input over all of omegas and DC (if it is an
+## expansion point). full_outputs holds the outputs of the whole circuit against each frequency checked (None if G + jwC is singular there).
+## Returns the largest error and the frequency at which it was found, or None for both if the circuit couldn't be solved at any of the frequencies
+def Reduction_Error(reduced_model, g_matrix, c_matrix, b_matrix, output_rows, omegas, expansion_points, full_outputs, ordering = DEFAULT_ORDERING):
+	log_omegas = np.log(omegas)
+	log_checked = np.log([abs(shift) for shift, _ in expansion_points if np.iscomplexobj(shift)] + list(full_outputs))
+
+	for _ in range(min(REDUCE_CHECKS, len(omegas))):
+		distances = abs(log_omegas[:, None] - log_checked[None, :]).min(axis = 1, initial = np.inf)
+		omega = float(omegas[np.argmax(distances)])
+		log_checked = np.append(log_checked, np.log(omega))
+
+		if omega in full_outputs:
+			continue
+
+		try:
+			full_outputs[omega] = OrderedLU((g_matrix + 1j * omega * c_matrix).tocsc(), ordering).solve(b_matrix)[output_rows]
+		except RuntimeError:
+			full_outputs[omega] = None
+
+	checked = np.array([omega for omega, outputs in full_outputs.items() if outputs is not None])
+	if len(checked) == 0:
+		return None, None
+
+	scales = abs(reduced_model.transfer(omegas, reduced_model.b_matrix)).max(axis = 0)
+
+	### The response at DC (where the model is exact) is part of the scale when DC is an expansion point, since the response of a transient
+	### driven by DC sources is almost entirely at DC and tiny at every jw
+	if any(shift == 0 for shift, _ in expansion_points):
+		try:
+			scales = np.maximum(scales, abs(reduced_model.transfer(np.zeros(1), reduced_model.b_matrix))[0])
+		except np.linalg.LinAlgError:
+			pass
+
+	reduced_outputs = reduced_model.transfer(checked, reduced_model.b_matrix)
+	errors = np.zeros(len(checked))
+
+	for index, omega in enumerate(checked):
+		full = full_outputs[omega]
+		scale = np.maximum(scales, abs(full))
+		errors[index] = np.max(np.divide(abs(reduced_outputs[index] - full), scale, out = np.zeros(scale.shape), where = scale > 0), initial = 0)
+
+	return errors.max(), checked[np.argmax(errors)]
+
+
+# Function to reduce G and C (with the equations of inductors negated) to a model with inputs along the columns of b_matrix and the unknowns in output_rows as outputs
+## For real matrices the real and imaginary parts of the inputs are taken as separate ports, so that the basis and the reduced matrices are real.
+## The moments are first matched at the given expansion points. While the estimated error of the model over the angular frequencies omegas (see
+## Reduction_Error()) is more than REDUCE_TOLERANCE, the frequency with the largest error is added as an expansion point jw with as many moments as
+## the most at any other point, up to REDUCE_REFINEMENTS times. Only the new point is factorised and its blocks are added to the basis found so far.
+## gmin holds the conductance to ground of every unknown which is added to the reduced G for the initial operating point of a transient.
+## Returns the ReducedModel (with its estimated error) or False if the basis couldn't be found
+@Profiled('reduce')
+def Reduce_Model(g_matrix, c_matrix, b_matrix, output_rows, output_names, expansion_points, omegas, gmin = None, ordering = DEFAULT_ORDERING):
+	inputs = b_matrix if np.iscomplexobj(g_matrix.data) or np.iscomplexobj(c_matrix.data) else np.column_stack((b_matrix.real, b_matrix.imag))
+	ports = np.zeros((g_matrix.shape[0], len(output_rows)))
+	ports[output_rows, np.arange(len(output_rows))] = 1
+	ports = np.column_stack((inputs, ports))
+
+	moments = max(moments for _, moments in expansion_points)
+	full_outputs = {}
+	basis = Krylov_Basis(g_matrix, c_matrix, ports, expansion_points, ordering)
+
+	for refinement in range(REDUCE_REFINEMENTS + 1):
+		if type(basis) == bool:
+			return False
+
+		reduced_model = Project_Model(g_matrix, c_matrix, b_matrix, basis, output_rows, output_names, gmin)
+
+		try:
+			reduced_model.error, worst_omega = Reduction_Error(reduced_model, g_matrix, c_matrix, b_matrix, output_rows, omegas, expansion_points, full_outputs, ordering)
+		except np.linalg.LinAlgError:
+			return reduced_model
+
+		if reduced_model.error == None or reduced_model.error <= REDUCE_TOLERANCE:
+			break
+
+		if refinement < REDUCE_REFINEMENTS:
+			expansion_points = expansion_points + [(1j * worst_omega, moments)]
+			basis = Krylov_Basis(g_matrix, c_matrix, ports, expansion_points[-1:], ordering, basis)
+
+	return reduced_model
+
+
+# Function to solve a frequency sweep of a circuit on its reduced model
+## reduction holds the order and the nodes kept as outputs. The moments are matched at points spread over the frequencies of the sweep, and the model is
+## refined until it is accurate at those frequencies (see Reduce_Model()). Returns the voltages of the kept nodes at each frequency along the rows
+## (or False if the model couldn't be found or solved), their names and the ReducedModel
+def Solve_Reduced_Sweep(circuit, frequencies, reduction, solver_options = {}):
+	order, output_nodes = reduction
+	output_names = ['V_' + node for node in output_nodes]
+
+	node_table, g_matrix, c_matrix, b_vector = Passive_G_C(circuit)
+	omegas = 2 * np.pi * np.asarray(frequencies, dtype = float)
+
+	expansion_points = Expansion_Points(omegas.min(), omegas.max(), order)
+	reduced_model = Reduce_Model(g_matrix, c_matrix, b_vector, node_table.indices(output_names), output_names, expansion_points, omegas, ordering = solver_options.get('ordering', DEFAULT_ORDERING))
+	if type(reduced_model) == bool:
+		return False, output_names, None
+
+	try:
+		results = reduced_model.sweep(omegas)
+	except np.linalg.LinAlgError:
+		return False, output_names, reduced_model
+
+	if not np.all(np.isfinite(results)):
+		return False, output_names, reduced_model
+
+	return results, output_names, reduced_model
+
+
+# Function to simulate a circuit in time on its reduced model
+## As in Solve_Transient(). The moments are matched at DC, so that the operating point at t = 0 is exact, and at points up to the highest
+## frequency the time step resolves (half the rate of the steps). The model is refined until it is accurate at REDUCE_GRID frequencies over
+## that range and at the frequencies of the sources (see Reduce_Model()).
+## The waveforms of only the kept nodes are written. Returns their values at the end time (or False if the model couldn't be found or solved),
+## their names and the ReducedModel
+def Solve_Reduced_Transient(circuit, source_frequencies, transient_settings, reduction, waveform_file, solver_options = {}):
+	tstep, tstop, method = transient_settings
+	steps = int(round(tstop / tstep))
+	order, output_nodes = reduction
+	output_names = ['V_' + node for node in output_nodes]
+	ordering = solver_options.get('ordering', DEFAULT_ORDERING)
+
+	node_table, g_matrix, c_matrix, _ = Passive_G_C(circuit)
+	g_matrix = g_matrix.real.tocsc()
+	c_matrix = c_matrix.real.tocsc()
+	frequencies, b_phasors = Source_Phasors(circuit, node_table, source_frequencies)
+
+	gmin = np.zeros(len(node_table))
+	gmin[:len(circuit.node_names)] = TRAN_GMIN
+	gmin[circuit.node_index['GND']] = 0
+
+	expansion_points = Expansion_Points(2 * np.pi / tstop, np.pi / tstep, order, dc = True)
+	omegas = np.union1d(np.geomspace(2 * np.pi / tstop, np.pi / tstep, REDUCE_GRID), 2 * np.pi * np.asarray(frequencies, dtype = float))
+	reduced_model = Reduce_Model(g_matrix, c_matrix, b_phasors, node_table.indices(output_names), output_names, expansion_points, omegas[omegas > 0], gmin, ordering)
+	if type(reduced_model) == bool:
+		return False, output_names, None
+
+	try:
+		x_vector = np.linalg.solve(reduced_model.dc_matrix, reduced_model.b_matrix.real.sum(axis = 1))
+		stepper = TransientStepper(sparse.csc_matrix(reduced_model.g_matrix), sparse.csc_matrix(reduced_model.c_matrix), tstep, method, ordering)
+	except (np.linalg.LinAlgError, RuntimeError, ValueError):
+		return False, output_names, reduced_model
+
+	return Write_Waveforms(stepper, x_vector, frequencies, reduced_model.b_matrix, tstep, steps, waveform_file, output_names, reduced_model.output_matrix), output_names, reduced_model
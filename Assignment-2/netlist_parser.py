@@ -0,0 +1,666 @@
+'''
+Title	 : Netlist Parser
+Purpose  : To read and verify a .netlist file in a single pass and to give its circuits one at a time
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : '.netlist' file
+Outputs  : Components of each circuit (Spice code between .circuit and .end) stored as CircuitArrays along with the .ac, .tran, .step, .tf and .pz directives given after it
+'''
+
+
+# Importing libraries
+import numpy as np
+
+from ac_sweep import SWEEP_TYPES, Sweep_Frequencies
+from circuit_store import CircuitArrays
+from phase_profiler import Profiled
+from pole_zero import PZ_COUNT
+from transient import TRAN_METHODS
+from value_parser import Parse_Value, Parse_Values
+
+
+# Constants used in the code
+SPICE_BEGIN = '.circuit'		# Directive indicating start of Spice code
+SPICE_END = '.end'				# Directive indicating end of Spice code
+SPICE_AC = '.ac' 				# Directive containing the frequency of an AC source or a frequency sweep
+SPICE_TRAN = '.tran'			# Directive containing the time step and end time of a transient analysis
+SPICE_STEP = '.step'			# Directive containing the values of a component at the points of a parameter step
+SPICE_TF = '.tf'				# Directive containing the output node and input source of a DC transfer function
+SPICE_PZ = '.pz'				# Directive containing the output node and input source of a pole-zero analysis
+SPICE_REDUCE = '.reduce'		# Directive containing the order and the kept nodes of a reduced model used for a frequency sweep or a transient analysis
+SPICE_SUBCKT = '.subckt'		# Directive indicating start of the definition of a subcircuit
+SPICE_ENDS = '.ends'			# Directive indicating end of the definition of a subcircuit
+STEP_LIST = 'list'				# Values of a step given one by one
+COMMENT = '#'					# Everything after this character in a line is a comment
+
+
+# Here I am classifying the types of components on the basis of number and type of nodes
+element_type1 = ['R','L','C','V','I','D']
+element_type2 = ['E','G']
+element_type3 = ['H','F']
+element_type4 = ['M']
+instance_type = ['X']			# Instances of subcircuits, given as 'name n1 n2 ... subcircuit_name'
+
+
+# Function to check validity of the tokens of a component
+def Check_Validity(element_name, element_ports, element_dependencies, index = None):
+	## Checking if the Port names are alpha-numeric
+	for port_name in element_ports:
+		if not port_name.isalnum():
+			print("Error: Invalid Port name (" , port_name, ") at line" , index, "in the netlist file")
+			print("\nOnly alpha-numeric node names are allowed")
+			exit()
+
+	## Checking for dependencies
+	### Gate of a MOSFET is a node, so its name is checked like the port names
+	if element_name[0] in element_type4 and not element_dependencies[0].isalnum():
+		print("Error: Invalid Port name (" , element_dependencies[0], ") at line" , index, "in the netlist file")
+		print("\nOnly alpha-numeric node names are allowed")
+		exit()
+
+	if element_name[0] in element_type3:
+		if element_dependencies[0][0] != 'V':
+			print("Error: Invalid dependency (", element_dependencies,") at line", index,".\nDependencies of current controlled sources need to start with V")
+			exit()
+
+
+# Defining a Class CircuitBlock to store a verified circuit along with the .ac, .tran, .step, .tf, .pz and .reduce directives given after it
+class CircuitBlock:
+	## Function to initialise an empty circuit which starts at the given line
+	def __init__(self, begin_line):
+		self.begin_line = begin_line
+		self.circuit_components = CircuitArrays()		# Components of the circuit in the order they are given
+		self.source_frequencies = {}		# Frequencies of the independent sources. DC sources have frequency 0
+		self.ac_sweep = None				# Settings (type, number of points, start and stop frequencies) of a frequency sweep if it is given
+		self.transient = None				# Settings (time step, end time and integration method) of a transient analysis if it is given
+		self.steps = {}						# Values at every point of the step of each stepped component
+		self.transfer_function = None		# Settings (.tf or .pz, output node, input source and number of poles and zeros for .pz) of a transfer function if it is given
+		self.reduction = None				# Order and kept nodes of the reduced model if one is asked for
+
+
+# Function to read a netlist file line by line without loading the whole file
+## Comments and trailing whitespaces are removed. Note that there cannot be components with names containing '#'.
+## Yields the line number along with the line for every line which is not empty
+def Read_Lines(file_input):
+	try:
+		f = open(file_input)
+
+	except:
+		print("Unable to locate file.")
+		exit()
+
+	with f:
+		for line_number, line in enumerate(f, 1):
+			if line.find(COMMENT) >= 0:
+				line = line[:line.find(COMMENT)]
+
+			line = line.strip()
+
+			if line:
+				yield line_number, line
+
+
+# Function to extract the tokens of a line of Spice code
+## First, the component which the line of code is dealing with is identified based on the name of the component
+## Second, the number of nodes is fixed according to the type of the component.
+## Third, the function Check_Validity is called to validate the tokens
+## Returns the name, ports, dependencies, value, whether it is an AC source and the second parameter of the component (threshold voltage of MOSFETs, else 0)
+def Parse_Element(words, line_number):
+	element_name = words[0]			# All the components have the first their name as the first token
+	element_ac = False
+	element_parameter = 0
+
+	## Checking of components of type 1
+	### Independent sources can be given as 'name n1 n2 value', 'name n1 n2 dc value' or 'name n1 n2 ac Vp-p phase'
+	if words[0][0] in element_type1:
+		if ( words[0][0] == 'V' or words[0][0] == 'I' ) and len(words) > 3 and ( words[3] == 'ac' or words[3] == 'dc' ):
+			if words[3] == 'ac' and len(words) == 6:
+				element_ports = [words[1], words[2]]
+				element_dependencies = []
+				element_ac = True
+
+				try:
+					phase = Parse_Value(words[5])
+					element_value = Parse_Value(words[4]) * np.exp(1j*np.pi*(phase/180)) * 0.5
+				except:
+					print("Error: Value or phase of AC source given incorrectly at line", line_number)
+					exit()
+
+			elif words[3] == 'dc' and len(words) == 5:
+				element_ports = [words[1], words[2]]
+				element_dependencies = []
+				element_value = words[4]
+
+			else:
+				print("Error: Incorrect syntax for power source at line", line_number)
+				exit()
+
+		elif len(words) == 4:
+			element_ports = [words[1], words[2]]
+			element_dependencies = []
+			element_value = words[3]
+
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()
+
+	## Checking of components of type 2
+	elif words[0][0] in element_type2:
+		if len(words) == 6:
+			element_ports = [words[1], words[2]]
+			element_dependencies = [words[3], words[4]]
+			element_value = words[5]
+
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()
+
+	## Checking of components of type 3
+	elif words[0][0] in element_type3:
+		if len(words) == 5:
+			element_ports = [words[1], words[2]]
+			element_dependencies = [words[3]]
+			element_value = words[4]
+
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()
+
+	## Checking of components of type 4
+	### MOSFETs are given as 'name drain gate source K Vth'. The gate is stored as the dependency and Vth as the second parameter.
+	elif words[0][0] in element_type4:
+		if len(words) == 6:
+			element_ports = [words[1], words[3]]
+			element_dependencies = [words[2]]
+			element_value = words[4]
+
+			try:
+				element_parameter = Parse_Value(words[5])
+			except:
+				print("Error: Invalid threshold voltage given for", element_name,"in the netlist file")
+				exit()
+
+		else:
+			print("Error: Incorrect syntax at line", line_number,". Incorrect set of tokens given for the component.")
+			exit()
+
+	## If the type of component is not valid
+	else:
+		print("""Error: Type-error in the type of component in line""", line_number,""".
+			Accepted types are Resistor(R), Capacitor(C), Inductor(I), Voltage source(V), Current source(I), VCVS(E), VCCS(G), CCVS(H), CCCS(F), Diode(D), MOSFET(M) and Subcircuit instance(X).
+			The component's name should start with the given associated character.""")
+		exit()
+
+	## The tokens are checked for their validity. Values are kept as tokens and the values of all the components of a circuit are converted together
+	## when it is finished (see CircuitArrays.finish()).
+	Check_Validity(element_name, element_ports, element_dependencies, line_number)
+
+	return element_name, element_ports, element_dependencies, element_value, element_ac, element_parameter
+
+
+# Function to extract the tokens of an instance of a subcircuit given as 'name n1 n2 ... subcircuit_name'
+## Returns the name of the instance, the nodes connected to the ports of the subcircuit in order and the name of the subcircuit
+def Parse_Instance(words, line_number):
+	if len(words) < 3:
+		print("Error: Incorrect syntax at line", line_number,". Instance of a subcircuit has to be given as name n1 n2 ... subcircuit_name")
+		exit()
+
+	Check_Validity(words[0], words[1:-1], [], line_number)
+
+	return words[0], words[1:-1], words[-1]
+
+
+# Function to check the definition of a subcircuit given as .subckt name port1 port2 ...
+## Returns the name of the subcircuit and the names of its ports
+def Parse_Subckt_Directive(words, line_number):
+	if len(words) < 3:
+		print("Error: Syntax error at line", line_number)
+		print("\nSubcircuit has to be given as .subckt name port1 port2 ...")
+		exit()
+
+	Check_Validity(words[1], words[2:], [], line_number)
+
+	if 'GND' in words[2:] or len(set(words[2:])) != len(words[2:]):
+		print("Error: Ports of subcircuit", words[1], "at line", line_number, "have to be distinct and cannot be GND")
+		exit()
+
+	return words[1], words[2:]
+
+
+# Function to go through a netlist file once and yield typed records as they are read
+## Records are tuples of (kind, line number, data) where kind is one of:
+##		SPICE_BEGIN	- start of a Spice code (data is None)
+##		'element'	- verified tokens of a component of the current Spice code or subcircuit as given by Parse_Element()
+##		'instance'	- verified tokens of an instance of a subcircuit as given by Parse_Instance()
+##		SPICE_END	- end of the current Spice code (data is None)
+##		SPICE_SUBCKT - start of the definition of a subcircuit (data is its name and ports as given by Parse_Subckt_Directive())
+##		SPICE_ENDS	- end of the definition of the current subcircuit (data is None)
+##		SPICE_AC	- an .ac directive (data is the list of its tokens)
+##		SPICE_TRAN	- a .tran directive (data is the list of its tokens)
+##		SPICE_STEP	- a .step directive (data is the list of its tokens)
+##		SPICE_TF, SPICE_PZ - a .tf or a .pz directive (data is the list of its tokens)
+##		SPICE_REDUCE - a .reduce directive (data is the list of its tokens)
+## Order of .circuit and .end (and of .subckt and .ends) is checked here. Lines outside Spice codes and subcircuits which aren't directives are ignored.
+## If element_parser is given, it is called as element_parser(words, line_number) for every line of a Spice code or subcircuit in place of
+## Parse_Element() and Parse_Instance(), so that another script can check the components in its own way. Its result is yielded as an 'element'.
+def Parse_Netlist(file_input, element_parser = None):
+	Begin_circuit = 0		# Stores the line at which a Spice code starts. Default value is 0 which is used to check if a Spice code has started.
+	Begin_subckt = 0		# Stores the line at which the definition of a subcircuit starts, in the same way
+
+	for line_number, line in Read_Lines(file_input):
+		words = line.split()		# Variable to store each line as a word array
+
+		## Searching for SPICE_BEGIN which indicates the start of the Spice code
+		if words[0] == SPICE_BEGIN:
+			if Begin_circuit != 0:
+				print("Error: Previous Spice code which started at", Begin_circuit,"hasn't ended before the new start of another one at", line_number)
+				exit()
+
+			if Begin_subckt != 0:
+				print("Error: Subcircuit which started at", Begin_subckt,"hasn't ended before the start of a Spice code at", line_number)
+				exit()
+
+			Begin_circuit = line_number
+			yield SPICE_BEGIN, line_number, None
+
+		## Searching for SPICE_END which indicates the end of the Spice code which starts at line Begin_circuit
+		elif words[0] == SPICE_END:
+			if Begin_circuit == 0:
+				print("Error: Encountered end of a Spice code at line", line_number,"without the start of a Spice code.")
+				exit()
+
+			Begin_circuit = 0
+			yield SPICE_END, line_number, None
+
+		## Subcircuits are defined outside Spice codes and can be used by any Spice code (or subcircuit) after them
+		elif words[0] == SPICE_SUBCKT:
+			if Begin_circuit != 0 or Begin_subckt != 0:
+				print("Error: Encountered an unexpected", words[0], "directive at line", line_number)
+				exit()
+
+			Begin_subckt = line_number
+			yield SPICE_SUBCKT, line_number, Parse_Subckt_Directive(words, line_number)
+
+		elif words[0] == SPICE_ENDS:
+			if Begin_subckt == 0:
+				print("Error: Encountered end of a subcircuit at line", line_number,"without the start of a subcircuit.")
+				exit()
+
+			Begin_subckt = 0
+			yield SPICE_ENDS, line_number, None
+
+		## Directives are only accepted outside Spice codes
+		elif words[0] in (SPICE_AC, SPICE_TRAN, SPICE_STEP, SPICE_TF, SPICE_PZ, SPICE_REDUCE):
+			if Begin_circuit != 0 or Begin_subckt != 0:
+				print("Error: Encountered an unexpected", words[0], "directive at line", line_number)
+				exit()
+
+			yield words[0], line_number, words
+
+		elif ( Begin_circuit != 0 or Begin_subckt != 0 ) and element_parser != None:
+			yield 'element', line_number, element_parser(words, line_number)
+
+		elif ( Begin_circuit != 0 or Begin_subckt != 0 ) and words[0][0] in instance_type:
+			yield 'instance', line_number, Parse_Instance(words, line_number)
+
+		elif Begin_circuit != 0 or Begin_subckt != 0:
+			yield 'element', line_number, Parse_Element(words, line_number)
+
+	## If a Spice code or a subcircuit hasn't been ended, then it prints an error
+	if Begin_circuit != 0:
+		print("Error: End of Spice code missing for Start code present at line", Begin_circuit)
+		exit()
+
+	if Begin_subckt != 0:
+		print("Error: End of subcircuit missing for the subcircuit starting at line", Begin_subckt)
+		exit()
+
+
+# Function to store the frequency of an AC source or a frequency sweep given by an .ac directive in the circuit block
+def Parse_AC_Directive(words, line_number, circuit_block):
+	## Frequency of a source given as .ac source_name frequency. Sources inside instances of subcircuits are named instance.source_name
+	if len(words) == 3 and words[1].split('.')[-1][0] in ('V', 'I'):
+		if words[1] in circuit_block.source_frequencies:
+			print("Error: Reassignment of frequency to AC source", words[1], "at line", line_number)
+			exit()
+
+		try:
+			circuit_block.source_frequencies[words[1]] = Parse_Value(words[2])
+		except:
+			print("Error: Specified frequency at line", line_number, "is not valid.")
+			print("\nValue has to be specified as a numeric or a string in scientific notation, optionally followed by a suffix such as k, u or meg")
+			exit()
+
+	## Frequency sweep given as .ac dec|lin|oct N fstart fstop
+	elif len(words) == 5 and words[1] in SWEEP_TYPES:
+		if circuit_block.ac_sweep != None:
+			print("Error: Reassignment of frequency sweep at line", line_number)
+			exit()
+
+		try:
+			circuit_block.ac_sweep = (words[1], int(words[2]), Parse_Value(words[3]), Parse_Value(words[4]))
+		except:
+			print("Error: Specified frequency sweep at line", line_number, "is not valid.")
+			print("\nNumber of points has to be an integer and frequencies have to be specified as a numeric or a string in scientific notation, optionally followed by a suffix such as k, u or meg")
+			exit()
+
+		if circuit_block.ac_sweep[1] <= 0 or circuit_block.ac_sweep[2] <= 0 or circuit_block.ac_sweep[3] < circuit_block.ac_sweep[2]:
+			print("Error: Specified frequency sweep at line", line_number, "is not valid.")
+			print("\nNumber of points has to be positive and frequencies have to satisfy 0 < fstart <= fstop")
+			exit()
+
+	else:
+		print("Error: Syntax error at line", line_number)
+		exit()
+
+
+# Function to store the settings of a transient analysis given by a .tran directive in the circuit block
+## Transient analysis is given as .tran tstep tstop [be|trap]. Trapezoidal integration is used if the method isn't given.
+def Parse_Tran_Directive(words, line_number, circuit_block):
+	if circuit_block.transient != None:
+		print("Error: Reassignment of transient analysis at line", line_number)
+		exit()
+
+	if len(words) not in (3, 4) or ( len(words) == 4 and words[3] not in TRAN_METHODS ):
+		print("Error: Syntax error at line", line_number)
+		print("\nTransient analysis has to be given as .tran tstep tstop [be|trap]")
+		exit()
+
+	try:
+		circuit_block.transient = (Parse_Value(words[1]), Parse_Value(words[2]), words[3] if len(words) == 4 else 'trap')
+	except:
+		print("Error: Specified transient analysis at line", line_number, "is not valid.")
+		print("\nTime step and end time have to be specified as a numeric or a string in scientific notation, optionally followed by a suffix such as k, u or meg")
+		exit()
+
+	if circuit_block.transient[0] <= 0 or circuit_block.transient[1] < circuit_block.transient[0]:
+		print("Error: Specified transient analysis at line", line_number, "is not valid.")
+		print("\nTimes have to satisfy 0 < tstep <= tstop")
+		exit()
+
+
+# Function to store the values of a stepped component given by a .step directive in the circuit block
+## Values are given as .step name lin|dec|oct N start stop (like a frequency sweep) or as .step name list value1 value2 ...
+def Parse_Step_Directive(words, line_number, circuit_block):
+	if len(words) < 4 or ( words[2] != STEP_LIST and ( len(words) != 6 or words[2] not in SWEEP_TYPES ) ):
+		print("Error: Syntax error at line", line_number)
+		print("\nStep has to be given as .step name lin|dec|oct N start stop or .step name list value1 value2 ...")
+		exit()
+
+	if words[1] in circuit_block.steps:
+		print("Error: Reassignment of step of", words[1], "at line", line_number)
+		exit()
+
+	try:
+		if words[2] == STEP_LIST:
+			circuit_block.steps[words[1]] = Parse_Values(words[3:])
+
+			if np.any(np.isnan(circuit_block.steps[words[1]])):
+				raise ValueError
+
+		else:
+			step_settings = (words[2], int(words[3]), Parse_Value(words[4]), Parse_Value(words[5]))
+
+			if step_settings[1] <= 0 or ( words[2] != 'lin' and ( step_settings[2] <= 0 or step_settings[3] < step_settings[2] ) ):
+				raise ValueError
+
+			circuit_block.steps[words[1]] = Sweep_Frequencies(*step_settings)
+
+	except ValueError:
+		print("Error: Specified step at line", line_number, "is not valid.")
+		print("\nNumber of points has to be a positive integer and values have to be specified as a numeric or a string in scientific notation.")
+		print("For dec and oct, values have to satisfy 0 < start <= stop")
+		exit()
+
+
+# Function to store the output node and input source of a transfer function given by a .tf or a .pz directive in the circuit block
+## Given as .tf node source for the DC gain, input and output resistances, or as .pz node source [count] for the poles and zeros as well.
+## count is the number of poles and of zeros found for large circuits (see Solve_Transfer_Function()). The output is the voltage of the node.
+def Parse_Transfer_Directive(words, line_number, circuit_block):
+	if circuit_block.transfer_function != None:
+		print("Error: Reassignment of transfer function at line", line_number)
+		exit()
+
+	if len(words) != 3 and ( words[0] != SPICE_PZ or len(words) != 4 ):
+		print("Error: Syntax error at line", line_number)
+		print("\nTransfer function has to be given as .tf node source or .pz node source [count]")
+		exit()
+
+	try:
+		count = int(words[3]) if len(words) == 4 else PZ_COUNT
+	except ValueError:
+		count = 0
+
+	if count <= 0:
+		print("Error: Specified number of poles and zeros at line", line_number, "is not valid. It has to be a positive integer.")
+		exit()
+
+	circuit_block.transfer_function = (words[0], words[1], words[2], count)
+
+
+# Function to store the order and the kept nodes of a reduced model given by a .reduce directive in the circuit block
+## Given as .reduce order node1 node2 ... The frequency sweep or transient analysis of the circuit is then performed on a model reduced to its
+## independent sources and the given nodes (see model_reduction.py), which matches order moments of their response. Only the voltages of
+## the given nodes are found.
+def Parse_Reduce_Directive(words, line_number, circuit_block):
+	if circuit_block.reduction != None:
+		print("Error: Reassignment of reduced model at line", line_number)
+		exit()
+
+	if len(words) < 3:
+		print("Error: Syntax error at line", line_number)
+		print("\nReduced model has to be given as .reduce order node1 node2 ...")
+		exit()
+
+	try:
+		order = int(words[1])
+	except ValueError:
+		order = 0
+
+	if order <= 0:
+		print("Error: Specified order of reduced model at line", line_number, "is not valid. It has to be a positive integer.")
+		exit()
+
+	circuit_block.reduction = (order, tuple(dict.fromkeys(words[2:])))
+
+
+# Function to check a circuit block once all its .ac, .tran, .step, .tf, .pz and .reduce directives are known
+## The arrays of the circuit are formed here. DC sources are given frequency 0 and every AC source needs to have a frequency unless a frequency sweep is given
+@Profiled('finish')
+def Finish_Block(circuit_block):
+	circuit = circuit_block.circuit_components.finish()
+
+	## In a frequency sweep all the AC sources are swept together so they cannot have frequencies of their own
+	if circuit_block.ac_sweep != None and len(circuit_block.source_frequencies) != 0:
+		print("Error: Frequencies of AC sources cannot be assigned along with a frequency sweep")
+		exit()
+
+	if circuit_block.ac_sweep != None and circuit_block.transient != None:
+		print("Error: Frequency sweep and transient analysis cannot be given for the same circuit")
+		exit()
+
+	## Operating point of nonlinear components is found only for DC circuits
+	if np.any(circuit.mask('D', 'M')) and ( len(circuit_block.source_frequencies) != 0 or circuit_block.ac_sweep != None or circuit_block.transient != None or len(circuit_block.steps) != 0 or circuit_block.transfer_function != None ):
+		print("Error: Diodes and MOSFETs are accepted only in DC circuits without any other analysis")
+		exit()
+
+	## Components are stepped only for DC and AC circuits, and all of them together through the same number of points
+	if len(circuit_block.steps) != 0:
+		if circuit_block.ac_sweep != None or circuit_block.transient != None:
+			print("Error: Step cannot be given along with a frequency sweep or a transient analysis")
+			exit()
+
+		for step_name in circuit_block.steps:
+			if step_name not in circuit.name_index:
+				print("Error: Step given for", step_name, "which is not a component of the circuit")
+				exit()
+
+		if len(set(len(step_values) for step_values in circuit_block.steps.values())) != 1:
+			print("Error: All the stepped components need to have the same number of points")
+			exit()
+
+	## Reduced models are used only for frequency sweeps and transient analyses, and keep nodes other than GND
+	if circuit_block.reduction != None:
+		if circuit_block.ac_sweep == None and circuit_block.transient == None:
+			print("Error: Reduced model can only be given along with a frequency sweep or a transient analysis")
+			exit()
+
+		for node in circuit_block.reduction[1]:
+			if node not in circuit.node_index or node == 'GND':
+				print("Error: Node", node, "kept by the reduced model is not a node of the circuit other than GND")
+				exit()
+
+	## Transfer function is found from an independent source to a node of a circuit which isn't analysed in any other way
+	### Frequencies of AC sources don't matter for it, so they aren't given
+	if circuit_block.transfer_function != None:
+		_, output_node, source_name, _ = circuit_block.transfer_function
+
+		if len(circuit_block.source_frequencies) != 0 or circuit_block.ac_sweep != None or circuit_block.transient != None or len(circuit_block.steps) != 0:
+			print("Error: Transfer function cannot be given along with .ac, .tran or .step directives")
+			exit()
+
+		if output_node not in circuit.node_index or output_node == 'GND':
+			print("Error: Output of transfer function", output_node, "is not a node of the circuit other than GND")
+			exit()
+
+		if source_name not in circuit.name_index or not circuit.mask('V', 'I')[circuit.name_index[source_name]]:
+			print("Error: Input of transfer function", source_name, "is not an independent source of the circuit")
+			exit()
+
+		return circuit_block
+
+	for source_name in circuit_block.source_frequencies:
+		if source_name not in circuit.name_index or not circuit.ac[circuit.name_index[source_name]]:
+			print("Error: Frequency assigned to", source_name, "which is not an AC source")
+			exit()
+
+	if circuit_block.ac_sweep == None:
+		for element in np.flatnonzero(circuit.ac):
+			if circuit.names[element] not in circuit_block.source_frequencies:
+				print("Error: AC source with unassigned frequency at line", circuit.line_numbers[element])
+				exit()
+
+	## DC sources are included only if the circuit has AC sources since the frequencies are used only then
+	if len(circuit_block.source_frequencies) != 0 or circuit_block.ac_sweep != None:
+		for element in np.flatnonzero(circuit.mask('V', 'I') & ~circuit.ac):
+			circuit_block.source_frequencies[circuit.names[element]] = 0
+
+	return circuit_block
+
+
+# Function to read a netlist file in one pass and yield its circuits one at a time
+## A circuit is given out only after the directives following it have been read, so only one circuit is held in memory at a time
+## .ac, .tran, .step, .tf, .pz and .reduce directives apply to the circuit which was given just before them
+## Each subcircuit is compiled once into a template (CircuitArrays with its ports as the first nodes) when its .ends is read.
+## Instances of it in later circuits and subcircuits only store their port nodes until the circuit is finished (see CircuitArrays.finish()).
+def Read_Circuits(file_input):
+	circuit_block = None		# Circuit which is being read
+	FLAG_GND = False 			# Variable to indicate if node GND is present
+	subcircuits = {}			# Name of a subcircuit to its template
+	subcircuit = None			# Name and template of the subcircuit which is being read
+	instance_names = set()		# Names of the instances in the circuit or subcircuit which is being read
+
+	for kind, line_number, data in Parse_Netlist(file_input):
+		if kind == SPICE_BEGIN:
+			if circuit_block != None:
+				yield Finish_Block(circuit_block)
+
+			circuit_block = CircuitBlock(line_number)
+			FLAG_GND = False
+			instance_names = set()
+
+		elif kind == SPICE_SUBCKT:
+			if data[0] in subcircuits:
+				print("Error: Redefinition of subcircuit", data[0]," at line", line_number)
+				exit()
+
+			subcircuit = (data[0], CircuitArrays(), len(data[1]))
+			instance_names = set()
+
+			### Ports are the first nodes of the template
+			for port_name in data[1]:
+				subcircuit[1].intern_node(port_name)
+
+		elif kind == SPICE_ENDS:
+			subcircuits[subcircuit[0]] = subcircuit[1].finish(subcircuit[2])
+			subcircuit = None
+
+		elif kind in ('element', 'instance'):
+			circuit_components = circuit_block.circuit_components if subcircuit == None else subcircuit[1]
+			element_name, element_ports = data[0], data[1]
+
+			### Checking if any element is being redefined
+			if element_name in circuit_components.name_index or element_name in instance_names:
+				print("Error: Redefinition of", element_name," at line", line_number)
+				exit()
+
+			### If GND node is encountered, flag is set True
+			if 'GND' in element_ports:
+				FLAG_GND = True
+
+			if kind == 'element':
+				circuit_components.add(*data, line_number)
+				continue
+
+			### Subcircuits need to be defined before they are used and need to be given as many nodes as they have ports
+			template = subcircuits.get(data[2])
+			if template == None:
+				print("Error: Subcircuit", data[2], "used at line", line_number, "is not defined before it")
+				exit()
+
+			if len(element_ports) != template.port_count:
+				print("Error: Subcircuit", data[2], "has", template.port_count, "ports but", len(element_ports), "nodes are given at line", line_number)
+				exit()
+
+			if 'GND' in template.node_index:
+				FLAG_GND = True
+
+			instance_names.add(element_name)
+			circuit_components.add_instance(element_name, data[2], template, element_ports, line_number)
+
+		elif kind == SPICE_END:
+			if not FLAG_GND:			# If GND node wasn't found then error is displayed
+				print("Error: No component connected to GND found.")
+				exit()
+
+		elif kind == SPICE_AC:
+			if circuit_block == None:
+				print("Error: Encountered an unexpected .ac directive at line", line_number)
+				exit()
+
+			Parse_AC_Directive(data, line_number, circuit_block)
+
+		elif kind == SPICE_TRAN:
+			if circuit_block == None:
+				print("Error: Encountered an unexpected .tran directive at line", line_number)
+				exit()
+
+			Parse_Tran_Directive(data, line_number, circuit_block)
+
+		elif kind == SPICE_STEP:
+			if circuit_block == None:
+				print("Error: Encountered an unexpected .step directive at line", line_number)
+				exit()
+
+			Parse_Step_Directive(data, line_number, circuit_block)
+
+		elif kind in (SPICE_TF, SPICE_PZ):
+			if circuit_block == None:
+				print("Error: Encountered an unexpected", kind, "directive at line", line_number)
+				exit()
+
+			Parse_Transfer_Directive(data, line_number, circuit_block)
+
+		elif kind == SPICE_REDUCE:
+			if circuit_block == None:
+				print("Error: Encountered an unexpected .reduce directive at line", line_number)
+				exit()
+
+			Parse_Reduce_Directive(data, line_number, circuit_block)
+
+	## If a Spice code was not found in the netlist file then it prints an error.
+	if circuit_block == None:
+		print("The given netlist file has no identifiable Spice code.")
+		exit()
+
+	yield Finish_Block(circuit_block)
@@ -0,0 +1,127 @@
+'''
+Title	 : Node Ordering
+Purpose  : To reorder the unknowns of the MNA equations before sparse LU factorisation so that less fill-in is created
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Sparse MNA matrix and the name of an ordering
+Outputs  : Factorisation of the reordered matrix, and the fill-in and operations of LU for each ordering
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.sparse as sparse
+import scipy.sparse.csgraph as csgraph
+import scipy.sparse.linalg as sparse_linalg
+
+from phase_profiler import Phase
+
+
+# Constants used in the code
+ORDERINGS = ('colamd', 'amd', 'rcm', 'natural')		# Accepted orderings. The first one is the default.
+DEFAULT_ORDERING = ORDERINGS[0]
+SUPERLU_ORDERINGS = {'colamd': 'COLAMD', 'amd': 'MMD_AT_PLUS_A'}		# Orderings which are computed by SuperLU itself
+PIVOT_THRESHOLD = 1e-3				# A diagonal entry is used as the pivot if it is at least this fraction of the largest entry of its column (for symmetric orderings)
+
+
+# Orderings:
+## colamd	- Column approximate minimum degree on the columns of A. Rows are chosen by partial pivoting. This is what SuperLU does by default.
+## amd		- Minimum degree on the graph of the circuit (the pattern of A + A^T), computed by SuperLU.
+## rcm		- Reverse Cuthill-McKee on the graph of the circuit. Keeps the nonzeros within a narrow band around the diagonal.
+## natural	- Order in which the nodes first appear in the netlist followed by the pseudo nodes.
+## All but colamd are symmetric orderings, i.e. the same permutation is applied to the rows and the columns. Diagonal pivots are preferred
+## for them (see PIVOT_THRESHOLD) so that the fill-in predicted by the ordering is what the factorisation actually has.
+
+
+# Function to get the keyword arguments of splu() which set the pivoting for an ordering
+def Pivot_Options(symmetric):
+	if symmetric:
+		return {'diag_pivot_thresh': PIVOT_THRESHOLD, 'options': {'SymmetricMode': True}}
+
+	return {}
+
+
+# Function to find the permutation of an ordering which isn't computed by SuperLU
+## Returns the indices of the unknowns in their new order
+def Fill_Reducing_Order(matrix, ordering):
+	if ordering == 'natural':
+		return np.arange(matrix.shape[0])
+
+	### Graph of the circuit - unknowns are connected if either of the entries between them is nonzero
+	graph = (abs(matrix) + abs(matrix).T).tocsr()
+	return csgraph.reverse_cuthill_mckee(graph, symmetric_mode = True).astype(np.int64)
+
+
+# Defining a Class OrderedLU to factorise a sparse matrix after reordering it
+## The ordering is found from the matrix unless the order is given, e.g. the order found for a matrix with the same pattern (see column_order)
+## If factors are given, they are taken to be those of the matrix reordered by order and the matrix isn't factorised again (see incremental_solver.py)
+class OrderedLU:
+	## Function to reorder and factorise a square sparse matrix
+	def __init__(self, matrix, ordering = DEFAULT_ORDERING, order = None, factors = None):
+		self.symmetric = ordering != 'colamd'
+		self.order = order
+
+		if factors != None:
+			self.factors = factors
+			return
+
+		matrix = sparse.csc_matrix(matrix)
+
+		if order is None and ordering in SUPERLU_ORDERINGS:
+			with Phase('factorise'):
+				self.factors = sparse_linalg.splu(matrix, permc_spec = SUPERLU_ORDERINGS[ordering], **Pivot_Options(self.symmetric))
+
+		else:
+			if order is None:
+				self.order = Fill_Reducing_Order(matrix, ordering)
+
+			permuted = matrix[self.order][:, self.order] if self.symmetric else matrix[:, self.order]
+			with Phase('factorise'):
+				self.factors = sparse_linalg.splu(permuted.tocsc(), permc_spec = 'NATURAL', **Pivot_Options(self.symmetric))
+
+	## Function to get the order of the columns used by the factorisation so that it can be reused for matrices with the same pattern
+	def column_order(self):
+		if self.order is None:
+			return np.argsort(self.factors.perm_c)
+
+		return self.order
+
+	## Function to solve the equations for a vector or for the columns of a matrix
+	def solve(self, b_vector):
+		b_vector = np.asarray(b_vector)
+
+		if self.order is None:
+			return self.factors.solve(b_vector)
+
+		permuted_result = self.factors.solve(b_vector[self.order] if self.symmetric else b_vector)
+		result = np.empty_like(permuted_result)
+		result[self.order] = permuted_result
+		return result
+
+	## Function to get the number of nonzeros in L and U, with the unit diagonal of L left out
+	def factor_nonzeros(self):
+		return self.factors.L.nnz + self.factors.U.nnz - self.factors.shape[0]
+
+	## Function to get the number of floating point operations taken by the factorisation
+	### Eliminating the k-th unknown takes a division for each nonzero below the pivot in L and a multiplication and subtraction
+	### for every pair of nonzeros below the pivot in L and to the right of it in U
+	def flops(self):
+		below = np.diff(self.factors.L.tocsc().indptr) - 1
+		right = np.diff(self.factors.U.tocsr().indptr) - 1
+		return int(np.sum(below + 2 * below * right))
+
+
+# Function to compare the orderings on a matrix
+## Returns a list of (ordering, nonzeros in L and U, operations) for every ordering in ORDERINGS. Orderings for which the factorisation fails are left out.
+def Ordering_Report(matrix):
+	report = []
+
+	for ordering in ORDERINGS:
+		try:
+			ordered_lu = OrderedLU(matrix, ordering)
+		except RuntimeError:
+			continue
+
+		report.append((ordering, ordered_lu.factor_nonzeros(), ordered_lu.flops()))
+
+	return report
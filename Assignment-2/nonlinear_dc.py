@@ -0,0 +1,275 @@
+'''
+Title	 : Nonlinear DC
+Purpose  : To find the DC operating point of a circuit with diodes and square-law MOSFETs by Newton-Raphson iterations on the MNA equations
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a circuit stored as CircuitArrays
+Outputs  : Nodal voltages and currents through voltage sources at the operating point
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.sparse as sparse
+
+from mna_engine import Assemble_MNA, Build_Node_Table, Solve_Linear_Equations
+
+
+# Constants used in the code
+THERMAL_VOLTAGE = 0.025852		# Thermal voltage of diodes at room temperature (in V)
+NR_MAX_ITERATIONS = 100			# Maximum number of Newton-Raphson iterations for one value of gmin or of the sources
+NR_VOLTAGE_TOLERANCE = 1e-6		# Absolute tolerance on the change of the unknowns between iterations
+NR_RELATIVE_TOLERANCE = 1e-6	# Relative tolerance on the change of the unknowns between iterations
+NR_MAX_STEP = 1.0				# Largest change in the voltages across a MOSFET (gate-source and drain-source) in one iteration
+GMIN = 1e-12					# Conductance across every diode and MOSFET, which keeps the Jacobian non-singular when they are off
+GMIN_START = 1e-2				# First conductance from every node to ground during gmin stepping
+GMIN_DECADES = 2				# First reduction of that conductance (in decades) during gmin stepping
+GMIN_MIN_DECADES = 0.05			# Gmin stepping is given up once the reduction becomes smaller than this
+SOURCE_STEP = 0.1				# First increase in the fraction of the sources during source stepping
+SOURCE_MIN_STEP = 1e-3			# Source stepping is given up once the increase becomes smaller than this
+
+
+# Function to limit the change in the voltage across diodes between iterations (junction limiting as done in SPICE)
+## Large forward steps are replaced by the step which gives the same change in current on the logarithmic scale, so that exp() doesn't overflow
+def Limit_Junction(v_new, v_old, v_critical):
+	v_limited = v_new.copy()
+	large = (v_new > v_critical) & (abs(v_new - v_old) > 2 * THERMAL_VOLTAGE)
+
+	forward = large & (v_old > 0)
+	argument = 1 + (v_new - v_old) / THERMAL_VOLTAGE
+	v_limited[forward] = np.where(argument[forward] > 0, v_old[forward] + THERMAL_VOLTAGE * np.log(np.maximum(argument[forward], 1e-300)), v_critical[forward])
+
+	starting = large & (v_old <= 0)
+	v_limited[starting] = THERMAL_VOLTAGE * np.log(v_new[starting] / THERMAL_VOLTAGE)
+
+	return v_limited
+
+
+# Function to get the currents and conductances of diodes given the voltages across them
+## Current is I_s * (exp(V/V_T) - 1) from the first node (anode) to the second node (cathode)
+def Diode_Model(voltages, saturation_currents):
+	exponential = np.exp(voltages / THERMAL_VOLTAGE)
+	currents = saturation_currents * (exponential - 1) + GMIN * voltages
+	conductances = saturation_currents / THERMAL_VOLTAGE * exponential + GMIN
+	return currents, conductances
+
+
+# Function to get the drain currents and their derivatives (gm with respect to V_GS and gds with respect to V_DS) of square-law MOSFETs
+## Cut-off:		I_D = 0								if V_GS <= V_th
+## Triode:		I_D = K * (V_GS - V_th - V_DS/2) * V_DS	if V_DS < V_GS - V_th
+## Saturation:	I_D = K/2 * (V_GS - V_th)^2			otherwise
+## A negative K gives a PMOS, for which all the voltages and the current are reversed. V_th is given as a positive value for both.
+## The drain and the source are interchanged when V_DS is negative. Returns the current from drain to source along with gm and gds.
+def MOSFET_Model(v_gs, v_ds, k_values, thresholds):
+	polarity = np.where(k_values < 0, -1.0, 1.0)
+	k_values = abs(k_values)
+	v_gs = polarity * v_gs
+	v_ds = polarity * v_ds
+
+	### Interchanging the drain and the source for negative V_DS. V_GS then becomes V_GD.
+	reverse = v_ds < 0
+	v_gs = np.where(reverse, v_gs - v_ds, v_gs)
+	v_ds = abs(v_ds)
+
+	overdrive = np.maximum(v_gs - thresholds, 0)
+	triode = v_ds < overdrive
+
+	currents = np.where(triode, k_values * (overdrive - v_ds/2) * v_ds, k_values/2 * overdrive**2)
+	gm = np.where(triode, k_values * v_ds, k_values * overdrive)
+	gds = np.where(triode, k_values * (overdrive - v_ds), 0)
+
+	### Derivatives in terms of the voltages of the given drain and source when they have been interchanged
+	### I = -f(V_GS - V_DS, -V_DS) so dI/dV_GS = -gm and dI/dV_DS = gm + gds with the derivatives of f
+	currents = polarity * np.where(reverse, -currents, currents)
+	gds = np.where(reverse, gm + gds, gds)
+	gm = np.where(reverse, -gm, gm)
+
+	### GMIN between the drain and the source
+	return currents + GMIN * polarity * np.where(reverse, -v_ds, v_ds), gm, gds + GMIN
+
+
+# Defining a Class NewtonSystem to hold the MNA equations of a circuit with diodes and MOSFETs for Newton-Raphson iterations
+## The linear components are assembled once through Assemble_MNA() as for a DC circuit and the Jacobian is kept on a fixed sparsity pattern.
+## The entries of the nonlinear components are at fixed positions of the pattern, so each iteration only adds their values to a copy
+## of the linear values instead of assembling the matrix again.
+class NewtonSystem:
+	## Function to assemble the linear components and to find the positions of the entries of the nonlinear components
+	def __init__(self, circuit, solver_options = {}):
+		self.solver_options = solver_options
+		self.node_table = Build_Node_Table(circuit)
+		linear_matrix, b_vector = Assemble_MNA(circuit, self.node_table)
+		self.linear_matrix = sparse.csc_matrix(linear_matrix.real)
+		self.linear_matrix.sum_duplicates()
+		self.b_vector = b_vector[:, 0].real
+		self.mna_size = len(self.node_table)
+
+		diodes = np.flatnonzero(circuit.mask('D'))
+		self.anodes, self.cathodes = circuit.nodes[diodes, 0], circuit.nodes[diodes, 1]
+		self.saturation_currents = circuit.values[diodes].real
+		self.v_critical = THERMAL_VOLTAGE * np.log(THERMAL_VOLTAGE / (np.sqrt(2) * self.saturation_currents))
+
+		mosfets = np.flatnonzero(circuit.mask('M'))
+		self.drains, self.sources, self.gates = circuit.nodes[mosfets, 0], circuit.nodes[mosfets, 1], circuit.controls[mosfets, 0]
+		self.k_values = circuit.values[mosfets].real
+		self.thresholds = circuit.parameters[mosfets]
+
+		### Nodes to which gmin is connected during gmin stepping (all the nodes other than ground)
+		self.node_gnd = circuit.node_index['GND']
+		self.gmin_nodes = np.setdiff1d(np.arange(len(circuit.node_names)), [self.node_gnd])
+
+		### Positions of the entries of the nonlinear components. Diodes: (a,a), (a,k), (k,a), (k,k). MOSFETs: (d,g), (d,s), (d,d), (s,g), (s,s), (s,d)
+		### Entries in the row and column of ground are left out since its equation is V_GND = 0 (see MNAStamps.set_ground())
+		rows = np.concatenate((self.anodes, self.anodes, self.cathodes, self.cathodes, self.drains, self.drains, self.drains, self.sources, self.sources, self.sources, self.gmin_nodes))
+		cols = np.concatenate((self.anodes, self.cathodes, self.anodes, self.cathodes, self.gates, self.sources, self.drains, self.gates, self.sources, self.drains, self.gmin_nodes))
+		self.kept = (rows != self.node_gnd) & (cols != self.node_gnd)
+		rows = rows[self.kept]
+		cols = cols[self.kept]
+
+		### Union of both the patterns. Absolute values are added so that no entry of the union cancels out
+		pattern = (abs(self.linear_matrix) + sparse.csc_matrix((np.ones(len(rows)), (rows, cols)), shape = self.linear_matrix.shape)).tocsc()
+		pattern.sort_indices()
+		pattern_keys = self.keys(pattern)
+
+		self.linear_data = np.zeros(pattern.nnz)
+		self.linear_data[np.searchsorted(pattern_keys, self.keys(self.linear_matrix))] = self.linear_matrix.data
+		self.positions = np.searchsorted(pattern_keys, np.asarray(cols, dtype = np.int64) * self.mna_size + rows)
+		self.indices = pattern.indices
+		self.indptr = pattern.indptr
+
+	## Function to get the positions of the entries of a sparse matrix in column-major order
+	def keys(self, matrix):
+		matrix.sum_duplicates()
+		columns = np.repeat(np.arange(self.mna_size, dtype = np.int64), np.diff(matrix.indptr))
+		return columns * self.mna_size + matrix.indices
+
+	## Function to form the Jacobian given the values of the nonlinear entries in the order of their positions
+	def jacobian(self, values):
+		data = self.linear_data.copy()
+		np.add.at(data, self.positions, values[self.kept])
+		return sparse.csc_matrix((data, self.indices, self.indptr), shape = (self.mna_size, self.mna_size))
+
+	## Function to run Newton-Raphson iterations from x_vector with a conductance gmin from every node to ground and the sources scaled by source_factor
+	### In each iteration the diodes and MOSFETs are replaced by their linearised models (a conductance, or transconductances, with a current source)
+	### at the present voltages, i.e. x is updated as
+	###		J(x) dx = -F(x),	F(x) = A x + i(x) - b
+	### where i(x) are the currents of the nonlinear components leaving each node and J is the Jacobian.
+	### The voltages at which each component is linearised are limited - diodes as in SPICE and MOSFETs to a change of NR_MAX_STEP -
+	### which damps the iterations without slowing down the components which are far from their limits.
+	### Iterations can't stop while any voltage is being limited. Returns the final x along with whether it converged and the number of iterations taken.
+	def iterate(self, x_vector, gmin = 0, source_factor = 1):
+		v_diodes = x_vector[self.anodes] - x_vector[self.cathodes]
+		v_gs = x_vector[self.gates] - x_vector[self.sources]
+		v_ds = x_vector[self.drains] - x_vector[self.sources]
+		b_vector = source_factor * self.b_vector
+
+		for iteration in range(1, NR_MAX_ITERATIONS + 1):
+			#### Voltages at which the components are linearised
+			v_unlimited = x_vector[self.anodes] - x_vector[self.cathodes]
+			v_diodes = Limit_Junction(v_unlimited, v_diodes, self.v_critical)
+			limited = np.any(abs(v_diodes - v_unlimited) > NR_VOLTAGE_TOLERANCE)
+
+			for v_limited, v_unlimited in ((v_gs, x_vector[self.gates] - x_vector[self.sources]), (v_ds, x_vector[self.drains] - x_vector[self.sources])):
+				change = np.clip(v_unlimited - v_limited, -NR_MAX_STEP, NR_MAX_STEP)
+				limited = limited or np.any(abs(v_limited + change - v_unlimited) > NR_VOLTAGE_TOLERANCE)
+				v_limited += change
+
+			i_diodes, g_diodes = Diode_Model(v_diodes, self.saturation_currents)
+			i_mosfets, gm, gds = MOSFET_Model(v_gs, v_ds, self.k_values, self.thresholds)
+
+			values = np.concatenate((g_diodes, -g_diodes, -g_diodes, g_diodes, gm, -gm - gds, gds, -gm, gm + gds, -gds, np.full(len(self.gmin_nodes), gmin)))
+			jacobian = self.jacobian(values)
+
+			#### Residual with the currents of the linearised components at x, i.e. F of the linearised circuit
+			i_diodes = i_diodes + g_diodes * (x_vector[self.anodes] - x_vector[self.cathodes] - v_diodes)
+			i_mosfets = i_mosfets + gm * (x_vector[self.gates] - x_vector[self.sources] - v_gs) + gds * (x_vector[self.drains] - x_vector[self.sources] - v_ds)
+
+			currents = np.zeros(self.mna_size)
+			np.add.at(currents, self.anodes, i_diodes)
+			np.add.at(currents, self.cathodes, -i_diodes)
+			np.add.at(currents, self.drains, i_mosfets)
+			np.add.at(currents, self.sources, -i_mosfets)
+			currents[self.gmin_nodes] += gmin * x_vector[self.gmin_nodes]
+			currents[self.node_gnd] = 0
+
+			residual = self.linear_matrix @ x_vector + currents - b_vector
+			step = Solve_Linear_Equations(jacobian, -residual, self.solver_options)
+
+			if type(step) == bool:
+				return x_vector, False, iteration
+
+			step = step.real
+			x_vector = x_vector + step
+
+			if not limited and np.all(abs(step) <= NR_VOLTAGE_TOLERANCE + NR_RELATIVE_TOLERANCE * abs(x_vector)):
+				return x_vector, True, iteration
+
+		return x_vector, False, NR_MAX_ITERATIONS
+
+
+# Function to find the DC operating point of a circuit which has diodes and MOSFETs
+## Newton-Raphson iterations are started from all the unknowns at 0. If they don't converge, two continuation methods are tried as done in SPICE.
+## Gmin stepping:	A conductance from every node to ground which is reduced step by step, starting each step from the solution of the previous one.
+## Source stepping:	All the sources are raised from 0 to their values, starting each step from the solution of the previous one.
+##					The step is doubled after every success and reduced after a failure, for which the previous solution is used again.
+## Returns the operating point as a column vector along with the node names and the total number of iterations. If it isn't found, False is returned instead.
+def Solve_Operating_Point(circuit, solver_options = {}):
+	newton_system = NewtonSystem(circuit, solver_options)
+	x_zero = np.zeros(newton_system.mna_size)
+
+	x_vector, converged, iterations = newton_system.iterate(x_zero)
+
+	## Gmin stepping
+	if not converged:
+		x_vector = x_zero
+		log_gmin = None						# Smallest gmin (in decades) for which the iterations have converged
+		log_next = np.log10(GMIN_START)
+		log_step = GMIN_DECADES
+
+		while log_step >= GMIN_MIN_DECADES:
+			x_next, converged, step_iterations = newton_system.iterate(x_vector, 10**log_next)
+			iterations += step_iterations
+
+			if converged:
+				x_vector = x_next
+				log_gmin = log_next
+				log_step *= 2
+
+				### Once gmin has come down to GMIN, it is removed
+				if log_gmin <= np.log10(GMIN):
+					x_vector, converged, step_iterations = newton_system.iterate(x_vector)
+					iterations += step_iterations
+					break
+
+			elif log_gmin == None:
+				break
+
+			else:
+				log_step /= 4
+
+			if log_gmin != None:
+				log_next = max(log_gmin - log_step, np.log10(GMIN))
+
+	## Source stepping
+	if not converged:
+		x_vector = x_zero
+		source_factor = 0
+		source_step = SOURCE_STEP
+
+		while source_factor < 1 and source_step >= SOURCE_MIN_STEP:
+			x_next, converged, step_iterations = newton_system.iterate(x_vector, 0, min(source_factor + source_step, 1))
+			iterations += step_iterations
+
+			if converged:
+				x_vector = x_next
+				source_factor = min(source_factor + source_step, 1)
+				source_step *= 2
+
+			else:
+				source_step /= 4
+
+		converged = source_factor == 1
+
+	if converged:
+		return x_vector[:, None], newton_system.node_table.names, iterations
+
+	return False, newton_system.node_table.names, iterations
@@ -0,0 +1,164 @@
+'''
+Title	 : Parameter Step
+Purpose  : To solve a circuit for many values of a few of its components (.step) through low rank updates of a single factorisation
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a circuit, the components being stepped and their values at each point of the step
+Outputs  : Nodal voltages and currents through voltage sources at every point of the step
+'''
+
+
+# Importing libraries
+import numpy as np
+
+from mna_engine import MIN_FLOAT, Assemble_MNA, Solve_Linear_Equations, Source_Vectors, Unit_Source_Vector
+
+
+# Function to get the admittances of resistors, inductors and capacitors of given values at frequency f as they are stamped by Assemble_MNA()
+def Element_Admittances(element_type, values, f = 0):
+	values = np.asarray(values, dtype = complex)
+
+	with np.errstate(divide = 'ignore', invalid = 'ignore'):
+		if element_type == 'R':
+			return 1/values
+
+		elif element_type == 'L':
+			return 1/(MIN_FLOAT * values) if f == 0 else 1/( (1j) * 2*np.pi*f * values )
+
+		else:
+			return MIN_FLOAT * values if f == 0 else (1j) * 2*np.pi*f * values
+
+
+# Function to get the change in the MNA matrix due to a change in the value of one component as vectors u, w such that the change is d * u w^T
+## d is the change in the admittance for R, L and C and the change in the value for controlled sources
+## Returns None for independent sources since their values change only the B vector
+def Update_Vectors(circuit, node_table, element):
+	mna_size = len(node_table)
+	element_type = circuit.names[element][0]
+	node1, node2 = circuit.nodes[element]
+	u_vector = np.zeros(mna_size)
+	w_vector = np.zeros(mna_size)
+
+	if element_type in ('V', 'I'):
+		return None
+
+	## Admittances, VCCS and CCCS change the currents leaving their nodes
+	if element_type in ('R', 'L', 'C', 'G', 'F'):
+		u_vector[node1] += 1
+		u_vector[node2] -= 1
+
+	## VCVS and CCVS change the equation of their pseudo node
+	else:
+		u_vector[node_table.branch_index[element]] = -1
+
+	## What the change multiplies - the voltage across the component, the controlling voltage or the controlling current
+	if element_type in ('R', 'L', 'C'):
+		w_vector[node1] += 1
+		w_vector[node2] -= 1
+
+	elif element_type in ('E', 'G'):
+		w_vector[circuit.controls[element, 0]] += 1
+		w_vector[circuit.controls[element, 1]] -= 1
+
+	else:
+		w_vector[node_table.branch_index[circuit.controls[element, 0]]] = 1
+
+	## The row and column of ground are not part of the MNA matrix (see MNAStamps.set_ground())
+	node_gnd = circuit.node_index['GND']
+	u_vector[node_gnd] = 0
+	w_vector[node_gnd] = 0
+
+	return u_vector, w_vector
+
+
+# Function to get the values of the stepped components as they are used in the MNA equations
+## R, L and C are converted to their admittances at frequency f. AC sources keep their phase and the step value is taken as their peak to peak value.
+def Stamped_Values(circuit, element, values, f = 0):
+	element_type = circuit.names[element][0]
+
+	if element_type in ('R', 'L', 'C'):
+		return Element_Admittances(element_type, values, f)
+
+	if circuit.ac[element]:
+		return np.asarray(values) * 0.5 * np.exp(1j * np.angle(circuit.values[element]))
+
+	return np.asarray(values, dtype = complex)
+
+
+# Function to solve a circuit at frequency f for every point of a step of a few of its components
+## The MNA matrix with the values given in the netlist is factorised once. By the Sherman-Morrison-Woodbury formula, with A the MNA matrix,
+## U and W the update vectors of the stepped components as columns and D the diagonal matrix of the changes in their values at a point,
+##		(A + U D W^T)^-1 b = x - Z (I + D W^T Z)^-1 D W^T x,		where x = A^-1 b and Z = A^-1 U
+## so every point costs only a k x k solve for k stepped components. All the points are solved together as a stack of these small systems.
+## B vectors of stepped sources are solved as separate columns and are scaled by their values at each point.
+## source_elements are the independent sources acting at frequency f. Returns the results along the rows for each point, or False if A is singular.
+## The row of a point at which the matrix is singular (including stepped values with no finite admittance, e.g. a resistor of 0) is all NaN.
+def Solve_Step_At(circuit, node_table, source_elements, step_elements, step_values, f = 0, solver_options = {}):
+	mna_matrix, _ = Assemble_MNA(circuit, node_table, f)
+	points = step_values.shape[0]
+
+	## Stepped sources acting at this frequency and the sources which are the same at every point
+	stepped_sources = [column for column, element in enumerate(step_elements) if element in source_elements]
+	fixed_sources = [element for element in source_elements if element not in step_elements]
+
+	b_columns = [Source_Vectors(circuit, node_table, fixed_sources).sum(axis = 1)]
+	b_columns += [Unit_Source_Vector(circuit, node_table, step_elements[column]) for column in stepped_sources]
+
+	## Stepped components which change the MNA matrix
+	updated = []
+	u_columns = []
+	w_columns = []
+	for column, element in enumerate(step_elements):
+		update_vectors = Update_Vectors(circuit, node_table, element)
+
+		if update_vectors != None:
+			updated.append(column)
+			u_columns.append(update_vectors[0])
+			w_columns.append(update_vectors[1])
+
+	## One factorisation for the B vectors and the update vectors together
+	solved = Solve_Linear_Equations(mna_matrix, np.column_stack(b_columns + u_columns), solver_options)
+	if type(solved) == bool:
+		return False
+
+	x_base = solved[:, :len(b_columns)]
+	z_matrix = solved[:, len(b_columns):]
+
+	## Solutions with only the B vector changed at each point
+	source_weights = np.ones((points, len(b_columns)), dtype = complex)
+	for position, column in enumerate(stepped_sources):
+		source_weights[:, position + 1] = Stamped_Values(circuit, step_elements[column], step_values[:, column], f)
+
+	results = source_weights @ x_base.T
+
+	if len(updated) == 0:
+		return results
+
+	## Low rank corrections for the changes in the matrix
+	w_matrix = np.column_stack(w_columns)
+	changes = np.column_stack([Stamped_Values(circuit, step_elements[column], step_values[:, column], f) - Stamped_Values(circuit, step_elements[column], [circuit.values[step_elements[column]].real], f) for column in updated])
+
+	### Points with a stepped value of no finite admittance are left out of the solve below and are given as NaN at the end
+	singular = ~np.isfinite(changes).all(axis = 1)
+	changes[singular] = 0
+
+	small_matrices = np.eye(len(updated))[None, :, :] + changes[:, :, None] * (w_matrix.T @ z_matrix)[None, :, :]
+	small_vectors = changes * (results @ w_matrix)
+
+	## If the matrix at some point is singular, the points are solved one at a time and that point is given as NaN
+	try:
+		corrections = np.linalg.solve(small_matrices, small_vectors[:, :, None])[:, :, 0]
+
+	except np.linalg.LinAlgError:
+		corrections = np.full(small_vectors.shape, np.nan, dtype = complex)
+
+		for point in range(points):
+			try:
+				corrections[point] = np.linalg.solve(small_matrices[point], small_vectors[point])
+			except np.linalg.LinAlgError:
+				pass
+
+	results = results - corrections @ z_matrix.T
+	results[singular] = np.nan
+
+	return results
@@ -0,0 +1,173 @@
+'''
+Title	 : Phase Profiler
+Purpose  : To record the wall time, allocations and peak memory of each phase of reading and solving the circuits of a netlist file
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Phases marked in the code of the solvers, recorded only while memory is being traced
+Outputs  : Statistics of every phase for each circuit block, written as JSON
+'''
+
+
+# Importing libraries
+import functools
+import json
+import resource
+import sys
+import time
+import tracemalloc
+
+
+# Constants used in the code
+PROFILE_VERSION = 1				# Changed whenever the layout of the JSON report changes
+PHASE_SEPARATOR = '/'			# Joins the names of nested phases, e.g. 'analysis/solve' is the solve within an analysis
+
+
+# Phases:
+## A phase is marked with 'with Phase(name):' around the code it covers, or with '@Profiled(name)' on a function which is a phase. Phases are recorded only while tracemalloc is tracing, which is
+## started by --profile (and in every process of the pool, see Solve_Batch()), so marking a phase costs nothing otherwise.
+## For every phase of a circuit block, the following are recorded:
+## calls				- Number of times the phase was entered, e.g. once per frequency for the assembly of a sweep
+## seconds				- Wall time spent in it
+## allocated_blocks		- Memory blocks allocated by the interpreter and still held at the end of the phase (sys.getallocatedblocks()), summed over the calls
+## allocated_bytes		- Bytes traced by tracemalloc (numpy arrays included) and still held at the end of the phase, summed over the calls
+## peak_bytes			- Largest memory traced above that at the start of the phase, over the calls
+## Nested phases are recorded under the names of all the phases they are in, and their time is a part of the time of those phases.
+
+PHASES = {}			# Statistics of the phases recorded in this process since they were last taken (see Take_Phases())
+OPEN_PHASES = []	# Phases which have been entered and not yet left, innermost last
+PEAK_BYTES = [0]	# Largest memory traced in this process, which is otherwise lost when the peak is reset at the start of a phase
+
+
+# Defining a Class Phase to record a phase of the code as a context manager
+class Phase:
+	## Function to initialise the phase with its name
+	def __init__(self, name):
+		self.name = name
+
+	def __enter__(self):
+		self.recorded = tracemalloc.is_tracing()
+		if not self.recorded:
+			return self
+
+		### The peak is reset at the start of every phase, so the peak reached so far is handed to the phase this is in
+		current, peak = tracemalloc.get_traced_memory()
+		PEAK_BYTES[0] = max(PEAK_BYTES[0], peak)
+		if OPEN_PHASES:
+			OPEN_PHASES[-1].peak = max(OPEN_PHASES[-1].peak, peak)
+
+		tracemalloc.reset_peak()
+		self.path = PHASE_SEPARATOR.join([phase.path for phase in OPEN_PHASES[-1:]] + [self.name])
+		self.start_bytes = current
+		self.peak = current
+		self.start_blocks = sys.getallocatedblocks()
+		self.start_time = time.perf_counter()
+
+		OPEN_PHASES.append(self)
+		return self
+
+	def __exit__(self, *exception):
+		if not self.recorded:
+			return False
+
+		seconds = time.perf_counter() - self.start_time
+		current, peak = tracemalloc.get_traced_memory()
+		self.peak = max(self.peak, peak)
+		OPEN_PHASES.pop()
+
+		statistics = PHASES.setdefault(self.path, {'calls': 0, 'seconds': 0.0, 'allocated_blocks': 0, 'allocated_bytes': 0, 'peak_bytes': 0})
+		statistics['calls'] += 1
+		statistics['seconds'] += seconds
+		statistics['allocated_blocks'] += sys.getallocatedblocks() - self.start_blocks
+		statistics['allocated_bytes'] += current - self.start_bytes
+		statistics['peak_bytes'] = max(statistics['peak_bytes'], self.peak - self.start_bytes)
+
+		if OPEN_PHASES:
+			OPEN_PHASES[-1].peak = max(OPEN_PHASES[-1].peak, self.peak)
+
+		return False
+
+
+# Function to get a decorator which records every call of a function as a phase
+def Profiled(name):
+	def Decorate(function):
+		@functools.wraps(function)
+		def Profiled_Function(*arguments, **keywords):
+			with Phase(name):
+				return function(*arguments, **keywords)
+
+		return Profiled_Function
+
+	return Decorate
+
+
+# Function to start recording phases in this process
+def Start_Profiling():
+	if not tracemalloc.is_tracing():
+		tracemalloc.start()
+
+
+# Function to tell whether phases are being recorded in this process
+def Profiling():
+	return tracemalloc.is_tracing()
+
+
+# Function to take the statistics of the phases recorded since they were last taken
+## Returns None if phases aren't being recorded
+def Take_Phases():
+	if not Profiling():
+		return None
+
+	phases = dict(PHASES)
+	PHASES.clear()
+	return phases
+
+
+# Function to add up the statistics of the phases of many records (e.g. of the parts of a circuit), any of which may be None
+## Returns None if all the records are None
+def Merge_Phases(*records):
+	records = [phases for phases in records if phases != None]
+	if len(records) == 0:
+		return None
+
+	merged = {}
+	for phases in records:
+		for path, statistics in phases.items():
+			total = merged.setdefault(path, {'calls': 0, 'seconds': 0.0, 'allocated_blocks': 0, 'allocated_bytes': 0, 'peak_bytes': 0})
+
+			for name, value in statistics.items():
+				total[name] = max(total[name], value) if name == 'peak_bytes' else total[name] + value
+
+	return merged
+
+
+# Function to read the circuit blocks while recording the parsing of each as a phase
+## The statistics of each block are kept in block_phases against the line at which it starts, along with its number of components
+def Profile_Blocks(circuit_blocks, block_phases):
+	circuit_blocks = iter(circuit_blocks)
+
+	while True:
+		with Phase('parse'):
+			circuit_block = next(circuit_blocks, None)
+
+		if circuit_block == None:
+			Take_Phases()
+			return
+
+		block_phases[circuit_block.begin_line] = (len(circuit_block.circuit_components), Take_Phases())
+		yield circuit_block
+
+
+# Function to write the report of the phases of every circuit block as JSON
+## blocks is a list of (begin_line, components, unknowns, phases) in the order of the blocks. Totals of every phase over the blocks are added,
+## along with the wall time of the whole run, the peak memory traced in this process and the largest resident set of this process and of the pool
+## (ru_maxrss is in kilobytes on Linux).
+def Write_Profile(profile_file, netlist_file, jobs, seconds, blocks):
+	report = {'version': PROFILE_VERSION, 'netlist': netlist_file, 'jobs': jobs, 'seconds': seconds,
+			  'peak_traced_bytes': max(PEAK_BYTES[0], tracemalloc.get_traced_memory()[1]),
+			  'max_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+			  'max_rss_pool_bytes': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024,
+			  'phases': Merge_Phases(*[phases for _, _, _, phases in blocks]) or {},
+			  'blocks': [{'begin_line': begin_line, 'components': components, 'unknowns': unknowns, 'phases': phases} for begin_line, components, unknowns, phases in blocks]}
+
+	with open(profile_file, 'w') as f:
+		json.dump(report, f, indent = 1)
@@ -0,0 +1,198 @@
+'''
+Title	 : Pole Zero
+Purpose  : To find the DC transfer function (.tf) and the poles and zeros (.pz) from an independent source to a node directly from the MNA matrices
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a linear circuit, the output node and the input source
+Outputs  : DC gain, input and output resistances, and the poles and zeros of the transfer function in rad/s
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.linalg as linalg
+import scipy.sparse as sparse
+import scipy.sparse.linalg as sparse_linalg
+
+from circuit_store import TYPE_CODE
+from mna_engine import SPARSE_THRESHOLD, Assemble_G_C, Build_Node_Table, Unit_Source_Vector
+from node_ordering import DEFAULT_ORDERING, OrderedLU
+from phase_profiler import Profiled
+
+
+# Constants used in the code
+TRANSFER_QUANTITIES = ['gain', 'input_resistance', 'output_resistance']		# Quantities found at DC, in this order
+PZ_COUNT = 10							# Default number of poles and of zeros (the ones closest to the origin) found for large circuits
+PZ_TOLERANCE = 1e-9						# Eigenvalues of the scaled pencil smaller than this relative to the largest are taken as infinite
+PZ_RESIDUAL = 1e-6						# Largest residual (relative to the size of the terms) of an eigenvector found by Arnoldi for its eigenvalue to be kept
+PZ_SHIFT = 1e-3							# Shift (relative to the scale of the circuit) used when the matrix at DC is singular, i.e. there is a pole or zero at 0
+PZ_NEIGHBOURHOOD = 1e-2					# Distance (relative to its magnitude) of the points around a zero found by Arnoldi at which the transfer function is compared
+PZ_DEPTH = 1e-3							# Largest magnitude of the transfer function at a zero found by Arnoldi relative to the points around it for it to be kept
+
+
+# Poles and zeros:
+## With G and C as in Assemble_G_C(), the MNA equations in the Laplace domain are (G + sC) x = b u, where b is the B vector of the input source u
+## at unit value and the output is y = e^T x for the unknown e of the output node. The transfer function H(s) = e^T (G + sC)^-1 b has
+## poles where det(G + sC) = 0 and zeros where the bordered matrix [[G + sC, b], [e^T, 0]] is singular, so both are the finite eigenvalues
+## of a generalized eigenproblem A v = -s E v. Infinite eigenvalues come from the rows without C (e.g. the equation of ground) and aren't poles.
+## Small circuits are solved densely (QZ) for all the poles and zeros. For large circuits shift-invert Arnoldi finds those closest to a shift
+## sigma, since (A + sigma E)^-1 E v = v / (sigma - s), i.e. the eigenvalues of largest magnitude of that operator. Only one LU factorisation
+## of A + sigma E is needed for all of them.
+## E is scaled by the ratio of the norms of A and E so that the eigenvalues are of order 1 and finite ones can be told from infinite ones.
+## When H(s) is tiny over a wide range (e.g. the far end of a long RC line), Arnoldi also finds spurious zeros whose eigenvectors pass the residual
+## test. At a true zero |H| dips sharply, so each zero found by Arnoldi is kept only if |H| there is far below its value at points around it.
+
+
+# Function to get the finite eigenvalues s of the pencil A v = -s E v
+## Dense QZ gives all of them, and shift-invert Arnoldi (ARPACK) gives up to count of them closest to the origin for large matrices.
+## Returns the eigenvalues sorted by magnitude, or False if the matrix couldn't be factorised at the origin or at the shift
+def Pencil_Eigenvalues(a_matrix, e_matrix, count = PZ_COUNT, ordering = DEFAULT_ORDERING):
+	### Circuits without capacitors and inductors have no poles or zeros
+	if not np.any(e_matrix.data):
+		return np.zeros(0, dtype = complex)
+
+	scale = sparse_linalg.norm(a_matrix, 1) / max(sparse_linalg.norm(e_matrix, 1), np.finfo(float).tiny)
+	e_matrix = e_matrix * scale
+
+	if a_matrix.shape[0] <= SPARSE_THRESHOLD:
+		alpha, beta = linalg.eig(-a_matrix.toarray(), e_matrix.toarray(), right = False, homogeneous_eigvals = True)
+		finite = abs(beta) > PZ_TOLERANCE * abs(alpha)
+		eigenvalues = alpha[finite] / beta[finite]
+
+	else:
+		### The shift is moved off the origin if there is an eigenvalue at it
+		for sigma in (0, PZ_SHIFT):
+			try:
+				ordered_lu = OrderedLU(a_matrix + sigma * e_matrix, ordering)
+				break
+			except RuntimeError:
+				ordered_lu = None
+
+		if ordered_lu == None:
+			return False
+
+		operator = sparse_linalg.LinearOperator(a_matrix.shape, matvec = lambda vector: ordered_lu.solve(e_matrix @ vector), dtype = np.result_type(a_matrix.dtype, e_matrix.dtype))
+		count = min(count, a_matrix.shape[0] - 2)
+
+		### ARPACK is started from a fixed vector rather than a random one, so that a circuit always gives the same poles and zeros
+		start_vector = np.random.default_rng(0).standard_normal(a_matrix.shape[0])
+
+		try:
+			mu, vectors = sparse_linalg.eigs(operator, k = count, which = 'LM', v0 = start_vector)
+		except sparse_linalg.ArpackNoConvergence as error:
+			mu, vectors = error.eigenvalues, error.eigenvectors
+		except sparse_linalg.ArpackError:
+			return False
+
+		kept = abs(mu) > PZ_TOLERANCE * max(abs(mu), default = 0)
+		mu, vectors = mu[kept], vectors[:, kept]
+		eigenvalues = sigma - 1 / mu
+
+		### Infinite eigenvalues of index higher than 1 (e.g. of the bordered matrices of zeros) aren't mapped exactly to 0 and appear as
+		### spurious eigenvalues far from the shift. Only those whose eigenvectors satisfy A v = -s E v are kept.
+		residuals = np.linalg.norm(a_matrix @ vectors + (e_matrix @ vectors) * eigenvalues, axis = 0)
+		scales = np.linalg.norm(abs(a_matrix) @ abs(vectors) + (abs(e_matrix) @ abs(vectors)) * abs(eigenvalues), axis = 0)
+		eigenvalues = eigenvalues[residuals <= PZ_RESIDUAL * scales]
+
+	eigenvalues = eigenvalues * scale
+	if not np.all(np.isfinite(eigenvalues)):
+		return False
+
+	### Conjugate pairs are kept together, the one with negative imaginary part first
+	return eigenvalues[np.lexsort((eigenvalues.imag, abs(eigenvalues)))]
+
+
+# Function to keep only the zeros (found by Arnoldi) at which the transfer function e^T (G + sC)^-1 b dips sharply
+## H is found at each zero and at PZ_NEIGHBOURHOOD of its magnitude on either side of it along the real and imaginary axes (with one LU
+## factorisation per point), and the zero is kept if |H| there is at most PZ_DEPTH of the largest |H| around it. Zeros at the origin are compared
+## with points at PZ_NEIGHBOURHOOD of the smallest pole instead. Zeros at which G + sC is singular (i.e. which are poles as well) are kept,
+## and points around a zero at which it is singular are left out.
+## Returns the zeros which are kept
+def Dipping_Zeros(g_matrix, c_matrix, input_vector, output, zeros, poles, ordering = DEFAULT_ORDERING):
+	### |H| at s, or NaN if G + sC is singular there
+	def Transfer(s):
+		try:
+			return abs(OrderedLU((g_matrix + s * c_matrix).tocsc(), ordering).solve(input_vector)[output])
+		except RuntimeError:
+			return np.nan
+
+	kept = np.ones(len(zeros), dtype = bool)
+	smallest_pole = min(abs(poles[poles != 0]), default = 1)
+
+	for index, zero in enumerate(zeros):
+		radius = PZ_NEIGHBOURHOOD * (abs(zero) if zero != 0 else smallest_pole)
+		around = np.fmax.reduce([Transfer(zero + step) for step in (radius, -radius, 1j * radius, -1j * radius)])
+		kept[index] = not Transfer(zero) > PZ_DEPTH * around
+
+	return zeros[kept]
+
+
+# Function to find the DC gain from the input source to the output node along with the input and output resistances
+## The matrix at DC (G) is factorised once for both right hand sides - the input source at unit value and a unit current into the output node
+## with the input source off. Input resistance is the voltage across the source per unit current through it (or the reverse for a current source),
+## which is infinite if no current flows through a voltage source at DC.
+## Returns [gain, input resistance, output resistance] or False if G is singular
+@Profiled('transfer')
+def Solve_DC_Transfer(circuit, node_table, g_matrix, output_node, source, solver_options = {}):
+	output = node_table.index('V_' + output_node)
+	b_vectors = np.zeros((len(node_table), 2))
+	b_vectors[:, 0] = Unit_Source_Vector(circuit, node_table, source)
+	b_vectors[output, 1] = 1
+
+	try:
+		results = OrderedLU(g_matrix, solver_options.get('ordering', DEFAULT_ORDERING)).solve(b_vectors)
+	except RuntimeError:
+		return False
+
+	if not np.all(np.isfinite(results)):
+		return False
+
+	if circuit.types[source] == TYPE_CODE['V']:
+		input_current = results[node_table.branch_index[source], 0]
+		input_resistance = 1 / input_current if input_current != 0 else np.inf
+	else:
+		input_resistance = results[circuit.nodes[source, 1], 0] - results[circuit.nodes[source, 0], 0]
+
+	return np.array([results[output, 0], input_resistance, results[output, 1]])
+
+
+# Function to find the transfer function of a circuit from an independent source to a node
+## transfer_function holds the directive (.tf or .pz), the output node, the input source and the number of poles and zeros found for large circuits.
+## G and C are assembled once and used for the DC quantities as well as for the poles and zeros, which are found only for .pz
+## Returns the DC quantities (see TRANSFER_QUANTITIES, NaN if G is singular for .pz), the poles, the zeros and the node names.
+## False is returned instead of the DC quantities if they (or the poles and zeros) can't be found.
+def Solve_Transfer_Function(circuit, transfer_function, solver_options = {}):
+	analysis, output_node, source_name, count = transfer_function
+	source = circuit.name_index[source_name]
+
+	node_table = Build_Node_Table(circuit, inductor_currents = True)
+	g_matrix, c_matrix, _ = Assemble_G_C(circuit, node_table)
+
+	### Values of components are real unless given as complex numbers, in which case the pencils are complex
+	if not np.any(g_matrix.data.imag) and not np.any(c_matrix.data.imag):
+		g_matrix = g_matrix.real.tocsc(copy = True)
+		c_matrix = c_matrix.real.tocsc(copy = True)
+
+	dc_values = Solve_DC_Transfer(circuit, node_table, g_matrix, output_node, source, solver_options)
+	if analysis == '.tf':
+		return dc_values, None, None, node_table.names
+
+	if type(dc_values) == bool:
+		dc_values = np.full(len(TRANSFER_QUANTITIES), np.nan)
+
+	ordering = solver_options.get('ordering', DEFAULT_ORDERING)
+	poles = Pencil_Eigenvalues(g_matrix, c_matrix, count, ordering)
+
+	## The input is put in the last column and the output in the last row of the bordered matrices
+	output_row = sparse.csr_matrix(([1.0], ([0], [node_table.index('V_' + output_node)])), shape = (1, len(node_table)))
+	input_column = sparse.csc_matrix(Unit_Source_Vector(circuit, node_table, source)[:, None])
+	zeros = Pencil_Eigenvalues(sparse.bmat([[g_matrix, input_column], [output_row, None]], format = 'csc'),
+							   sparse.bmat([[c_matrix, None], [None, sparse.csc_matrix((1, 1))]], format = 'csc'), count, ordering)
+
+	if type(poles) == bool or type(zeros) == bool:
+		return False, None, None, node_table.names
+
+	if len(node_table) + 1 > SPARSE_THRESHOLD:
+		zeros = Dipping_Zeros(g_matrix, c_matrix, input_column.toarray()[:, 0], output_row.indices[0], zeros, poles, ordering)
+
+	return dc_values, poles, zeros, node_table.names
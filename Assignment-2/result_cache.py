@@ -0,0 +1,134 @@
+'''
+Title	 : Result Cache
+Purpose  : To store the results of solved circuits on disk so that a circuit which has been solved before is not solved again
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Circuit blocks given by the netlist parser, their results and the options of the solver
+Outputs  : Stored result of a circuit block if the same circuit has been solved before with the same options
+'''
+
+
+# Importing libraries
+import hashlib
+import numpy as np
+
+from circuit_solver import ANALYSIS_OP, CircuitResult
+from compiled_circuit import Encode_Strings
+from file_store import STORE_MAX_BYTES, FileStore
+
+
+# Constants used in the code
+CACHE_VERSION = 5					# Changed whenever the way circuits are solved or results are stored changes, so that older results are not used
+CACHE_MAX_BYTES = STORE_MAX_BYTES	# Default limit on the total size of the cache
+
+
+# Function to find the key of a circuit block
+## The key is a hash of everything the result depends on - the components as they are stored after parsing, the .ac, .tran, .step, .tf, .pz and .reduce directives and the options of the solver.
+## Line numbers aren't included, so comments, empty lines and circuits given before it don't change the key of a circuit.
+def Circuit_Key(circuit_block, solver_options = {}):
+	circuit = circuit_block.circuit_components
+	key = hashlib.sha256()
+
+	key.update(repr(CACHE_VERSION).encode())
+	for strings in (circuit.names, circuit.node_names):
+		for array in Encode_Strings(strings):
+			key.update(np.ascontiguousarray(array).tobytes())
+
+	for array in (circuit.types, circuit.nodes, circuit.controls, circuit.values, circuit.ac, circuit.parameters):
+		key.update(np.ascontiguousarray(array).tobytes())
+
+	key.update(repr((sorted((name, float(frequency)) for name, frequency in circuit_block.source_frequencies.items()), circuit_block.ac_sweep, circuit_block.transient, circuit_block.transfer_function, circuit_block.reduction, sorted(solver_options.items()))).encode())
+	for step_name, step_values in circuit_block.steps.items():
+		key.update(step_name.encode())
+		key.update(np.ascontiguousarray(step_values, dtype = float).tobytes())
+
+	return key.hexdigest()
+
+
+# Defining a Class ResultCache to store results of circuits as files in a directory
+## Each result is a file named by the key of its circuit. The least recently used results are removed first once the total size of the files
+## goes above max_bytes (see FileStore). The number of lookups which found a result (hits) and which didn't (misses) are counted.
+class ResultCache(FileStore):
+	## Function to open the cache in the given directory, creating the directory if it isn't present
+	def __init__(self, directory, max_bytes = CACHE_MAX_BYTES):
+		FileStore.__init__(self, directory, max_bytes)
+		self.hits = 0
+		self.misses = 0
+
+	## Function to get the stored result of a circuit block. None is returned if it isn't present.
+	def get(self, key, begin_line = None):
+		stored = self.read(key)
+
+		if stored != None:
+			try:
+				circuit_result = CircuitResult(begin_line, str(stored['analysis']), stored['node_names'].tolist(), stored['frequencies'].tolist(), stored['results'])
+
+				if circuit_result.analysis == ANALYSIS_OP:
+					circuit_result.iterations = int(stored['iterations'])
+
+				if 'step_names' in stored:
+					circuit_result.step_names = stored['step_names'].tolist()
+					circuit_result.step_values = stored['step_values']
+
+				if 'transfer_names' in stored:
+					circuit_result.transfer_names = stored['transfer_names'].tolist()
+					circuit_result.poles = stored['poles'] if 'poles' in stored else None
+					circuit_result.zeros = stored['zeros'] if 'zeros' in stored else None
+
+				if 'reduction_sizes' in stored:
+					reduction_error = float(stored['reduction_error'])
+					circuit_result.reduction_report = tuple(int(size) for size in stored['reduction_sizes']) + (None if np.isnan(reduction_error) else reduction_error,)
+
+				if 'ordering_names' in stored:
+					circuit_result.ordering_report = [(ordering, int(counts[0]), int(counts[1])) for ordering, counts in zip(stored['ordering_names'].tolist(), stored['ordering_counts'])]
+
+				if 'solver_names' in stored:
+					method, preconditioner = stored['solver_names'].tolist()
+					iterations, residual, converged = stored['solver_counts'].tolist()
+					circuit_result.solver_report = (method, preconditioner, int(iterations), residual, bool(converged))
+
+			except (KeyError, ValueError):
+				self.remove(key)
+
+			else:
+				self.hits += 1
+				self.touch(key)
+				return circuit_result
+
+		self.misses += 1
+		return None
+
+	## Function to store the result of a circuit block. Results of circuits which couldn't be solved aren't stored.
+	## Results of transients aren't stored either since their waveforms are written to files of their own.
+	def put(self, key, circuit_result):
+		if not circuit_result.solved or circuit_result.waveform_file != None:
+			return
+
+		stored = {'analysis': circuit_result.analysis, 'node_names': np.array(circuit_result.node_names), 'frequencies': np.asarray(circuit_result.frequencies, dtype = float), 'results': circuit_result.results}
+		if circuit_result.analysis == ANALYSIS_OP:
+			stored['iterations'] = circuit_result.iterations
+
+		if circuit_result.step_names != None:
+			stored['step_names'] = np.array(circuit_result.step_names)
+			stored['step_values'] = circuit_result.step_values
+
+		if circuit_result.transfer_names != None:
+			stored['transfer_names'] = np.array(circuit_result.transfer_names)
+
+			if circuit_result.poles is not None:
+				stored['poles'] = circuit_result.poles
+				stored['zeros'] = circuit_result.zeros
+
+		if circuit_result.reduction_report != None:
+			stored['reduction_sizes'] = np.array(circuit_result.reduction_report[:2], dtype = np.int64)
+			stored['reduction_error'] = np.nan if circuit_result.reduction_report[2] == None else circuit_result.reduction_report[2]
+
+		if circuit_result.ordering_report != None:
+			stored['ordering_names'] = np.array([ordering for ordering, _, _ in circuit_result.ordering_report])
+			stored['ordering_counts'] = np.array([[nonzeros, flops] for _, nonzeros, flops in circuit_result.ordering_report], dtype = np.int64).reshape(-1, 2)
+
+		if circuit_result.solver_report != None:
+			stored['solver_names'] = np.array(circuit_result.solver_report[:2])
+			stored['solver_counts'] = np.array(circuit_result.solver_report[2:], dtype = float)
+
+		self.write(key, stored)
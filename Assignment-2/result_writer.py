@@ -0,0 +1,170 @@
+'''
+Title	 : Result Writer
+Purpose  : To write the nodal voltages and currents of solved circuits to a file in bulk, as CSV, NumPy .npz or Parquet, instead of displaying them
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Results of the circuits of a netlist file, given one at a time as they are solved
+Outputs  : Single file holding the results of all the circuits, written as each result is given
+'''
+
+
+# Importing libraries
+import atexit
+import os
+import tempfile
+import zipfile
+import numpy as np
+
+from file_store import Replace_File
+
+## Parquet is optional and only needed for '.parquet' output files
+try:
+	import pyarrow
+	import pyarrow.parquet
+except ImportError:
+	pyarrow = None
+
+
+# Constants used in the code
+OUTPUT_FORMATS = ('.csv', '.npz', '.parquet')		# Accepted extensions of output files, which decide their format
+OUTPUT_COLUMNS = ('begin_line', 'analysis', 'step', 'frequency', 'unknown', 'real', 'imag')		# Columns of CSV and Parquet output files
+OUTPUT_CHUNK_ROWS = 2**20		# Largest number of rows formed at once, so that long sweeps are written in parts without holding all their rows
+
+
+# Layout of the output files:
+## CSV and Parquet files have a row for every unknown of a circuit at every frequency (and point of a step), with the columns
+## begin_line	- Line at which the circuit starts in the netlist file, which identifies the circuit
+## analysis		- Analysis performed on the circuit (.dc, .ac, sweep, .tran or .op)
+## step			- Index of the point of a parameter step, 0 for circuits without a step
+## frequency	- Frequency in Hz (0 for DC). For a transient it is the end time, as only the values at that time are written.
+## unknown		- Name of the unknown, V_<node> for nodal voltages and I_<component> for currents through voltage sources and inductors
+## real, imag	- Real and imaginary parts of its value. Magnitudes and phases are left to the reader of the file.
+## npz files have the arrays of each circuit as they are in its CircuitResult, named circuit_<begin_line>_<array> (node_names, frequencies,
+## results and for a step, step_names and step_values), along with 'circuits' which holds the lines of all the circuits written.
+## The voltage of the GND node, which is always 0, isn't written. Circuits which couldn't be solved aren't written either.
+
+
+# Defining a Class ResultWriter to write the results of circuits to a file as they are given
+## The file is kept open and every result is written as soon as it is given, so that the results of a netlist file (or a long sweep) are never
+## held together in memory. Values are formatted for the whole circuit at once instead of one unknown at a time.
+## The results are written under a temporary name in the same directory, which is renamed to the output file by close(). So an error in the
+## netlist (which stops the program) or a run in which no circuit is solved leaves the previous output file as it was.
+class ResultWriter:
+	## Function to open the output file, whose format is given by its extension (see OUTPUT_FORMATS)
+	def __init__(self, output_file):
+		self.output_file = output_file
+		self.output_format = output_file[output_file.rfind('.'):]
+		self.circuits = []
+
+		file_descriptor, self.temporary_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(output_file)), suffix = '.tmp')
+		os.close(file_descriptor)
+
+		### If the program stops before close() is called, the temporary file is removed when it exits
+		atexit.register(self.discard)
+
+		if self.output_format == '.csv':
+			self.f = open(self.temporary_path, 'w')
+			self.f.write(','.join(OUTPUT_COLUMNS) + '\n')
+
+		elif self.output_format == '.npz':
+			self.f = zipfile.ZipFile(self.temporary_path, 'w', compression = zipfile.ZIP_STORED, allowZip64 = True)
+
+		else:
+			self.schema = pyarrow.schema([('begin_line', pyarrow.int64()), ('analysis', pyarrow.string()), ('step', pyarrow.int64()), ('frequency', pyarrow.float64()),
+										  ('unknown', pyarrow.string()), ('real', pyarrow.float64()), ('imag', pyarrow.float64())])
+			self.f = pyarrow.parquet.ParquetWriter(self.temporary_path, self.schema)
+
+	## Function to write the result of a circuit, if it was solved
+	def write(self, circuit_result):
+		if not circuit_result.solved:
+			return
+
+		self.circuits.append(circuit_result.begin_line)
+
+		if self.output_format == '.npz':
+			self.write_arrays(circuit_result)
+			return
+
+		for steps, frequencies, unknowns, values in Result_Rows(circuit_result):
+			if self.output_format == '.csv':
+				self.write_csv(circuit_result, steps, frequencies, unknowns, values)
+			else:
+				self.write_parquet(circuit_result, steps, frequencies, unknowns, values)
+
+	## Function to write rows of a circuit as CSV
+	### All the rows are formatted by a single % operation on a repeated format. Floats are written by repr() so they are read back exactly.
+	def write_csv(self, circuit_result, steps, frequencies, unknowns, values):
+		rows = np.empty((len(values), 5), dtype = object)
+		rows[:, 0] = steps
+		rows[:, 1] = frequencies
+		rows[:, 2] = unknowns
+		rows[:, 3] = values.real
+		rows[:, 4] = values.imag
+
+		row_format = str(circuit_result.begin_line) + ',' + circuit_result.analysis + ',%d,%r,%s,%r,%r\n'
+		self.f.write((row_format * len(rows)) % tuple(rows.ravel().tolist()))
+		self.f.flush()
+
+	## Function to write rows of a circuit as a row group of the Parquet file
+	def write_parquet(self, circuit_result, steps, frequencies, unknowns, values):
+		columns = [np.full(len(values), circuit_result.begin_line), np.full(len(values), circuit_result.analysis), steps, frequencies, unknowns, values.real, values.imag]
+		self.f.write_table(pyarrow.Table.from_arrays([pyarrow.array(column) for column in columns], schema = self.schema))
+
+	## Function to write the arrays of a circuit as members of the npz file
+	def write_arrays(self, circuit_result):
+		arrays = {'node_names': np.array(circuit_result.node_names, dtype = str), 'frequencies': np.asarray(circuit_result.frequencies, dtype = float), 'results': circuit_result.results}
+		if circuit_result.step_names != None:
+			arrays.update({'step_names': np.array(circuit_result.step_names, dtype = str), 'step_values': np.asarray(circuit_result.step_values)})
+
+		for name, array in arrays.items():
+			Write_Member(self.f, 'circuit_' + str(circuit_result.begin_line) + '_' + name, array)
+
+	## Function to finish writing the file and put it in place of the output file
+	### Returns False if no circuit was written, in which case the output file is left as it was
+	def close(self):
+		if self.output_format == '.npz':
+			Write_Member(self.f, 'circuits', np.array(self.circuits, dtype = np.int64))
+
+		self.f.close()
+
+		if len(self.circuits) == 0:
+			self.discard()
+			return False
+
+		Replace_File(self.temporary_path, self.output_file)
+		return True
+
+	## Function to remove the temporary file if it hasn't been renamed to the output file
+	def discard(self):
+		if os.path.exists(self.temporary_path):
+			self.f.close()
+			os.remove(self.temporary_path)
+
+
+# Function to write an array as a member of an npz file, in the way np.savez() does
+def Write_Member(npz_file, name, array):
+	with npz_file.open(name + '.npy', 'w', force_zip64 = True) as f:
+		np.lib.format.write_array(f, np.asanyarray(array), allow_pickle = False)
+
+
+# Function to get the rows of the result of a circuit as columns, in chunks of at most OUTPUT_CHUNK_ROWS rows
+## The results are taken as a matrix with a row for every (point of a step, frequency), and the rows of the file are formed from it by repeating
+## the step, frequency and names of the unknowns with numpy rather than by going through the unknowns
+def Result_Rows(circuit_result):
+	columns = np.array([index for index, node in enumerate(circuit_result.node_names) if node != 'V_GND'], dtype = int)
+	unknowns = np.array(circuit_result.node_names, dtype = object)[columns]
+
+	frequencies = np.asarray(circuit_result.frequencies, dtype = float)
+	results = np.asarray(circuit_result.results).reshape(-1, len(frequencies), len(circuit_result.node_names))
+	results = results.reshape(-1, len(circuit_result.node_names))
+
+	steps = np.repeat(np.arange(len(results) // len(frequencies)), len(frequencies))
+	frequencies = np.tile(frequencies, len(results) // len(frequencies))
+
+	chunk_points = max(1, OUTPUT_CHUNK_ROWS // max(len(columns), 1))
+	for start in range(0, len(results), chunk_points):
+		points = slice(start, start + chunk_points)
+		point_count = len(results[points])
+
+		yield (np.repeat(steps[points], len(columns)), np.repeat(frequencies[points], len(columns)), np.tile(unknowns, point_count),
+			   results[points][:, columns].astype(complex).ravel())
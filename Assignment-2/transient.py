@@ -0,0 +1,193 @@
+'''
+Title	 : Transient Analysis
+Purpose  : To simulate a circuit in time (.tran tstep tstop) through companion models of inductors and capacitors on the MNA matrices G and C
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Components of a circuit, frequencies of its sources and the transient settings
+Outputs  : Waveforms of the nodal voltages and currents through voltage sources and inductors written to a file, and their values at the end time
+'''
+
+
+# Importing libraries
+import os
+import tempfile
+import numpy as np
+import scipy.linalg as linalg
+import scipy.sparse as sparse
+
+from file_store import Replace_File
+from mna_engine import SPARSE_THRESHOLD, Assemble_G_C, Build_Node_Table, Solve_Linear_Equations, Source_Vectors
+from node_ordering import DEFAULT_ORDERING, OrderedLU
+from phase_profiler import Profiled
+
+
+# Constants used in the code
+TRAN_METHODS = ('be', 'trap')		# Backward Euler and trapezoidal integration
+TRAN_CHUNK_BYTES = 2**24			# Maximum memory (in bytes) used by the values of a chunk of time steps which are computed and written together
+TRAN_GMIN = 1e-12					# Conductance from every node to ground used only for the initial operating point, so that nodes connected only through capacitors have a defined voltage
+WAVEFORM_FILE_TYPE = '.npy'			# Extension of the files holding the waveforms
+NAMES_FILE_TYPE = '.txt'			# Extension of the files holding the names of the columns of the waveforms
+
+
+# Function to get the B vector of a circuit as a function of time
+## Sources at the same frequency are added together. The B vector at time t is then the real part of sum over f of B_f * exp(j*2*pi*f*t),
+## since AC sources are stored as phasors of their amplitudes. Returns the frequencies and the B_f vectors as columns of a matrix.
+def Source_Phasors(circuit, node_table, source_frequencies):
+	sources = np.flatnonzero(circuit.mask('V', 'I'))
+	frequencies = np.array([source_frequencies.get(circuit.names[element], 0) for element in sources], dtype = float)
+	distinct_frequencies, group = np.unique(frequencies, return_inverse = True)
+
+	b_phasors = np.zeros((len(node_table), len(distinct_frequencies)), dtype = complex)
+	for column in range(len(distinct_frequencies)):
+		b_phasors[:, column] = Source_Vectors(circuit, node_table, sources[group == column]).sum(axis = 1)
+
+	return distinct_frequencies, b_phasors
+
+
+# Defining a Class TransientStepper to advance the MNA equations G x + C dx/dt = b(t) by a constant time step
+## Backward Euler:	(G + C/h) x[n+1] = b[n+1] + (C/h) x[n]
+## Trapezoidal:		(G + 2C/h) x[n+1] = b[n+1] + b[n] + (2C/h - G) x[n]
+## These are the companion models of the capacitors and inductors written for the whole matrix at once. Since h is constant,
+## the matrix on the left is factorised only once. For small circuits its inverse applied to the right side matrix is also found once,
+## so that each step is a single product with a dense matrix. Large circuits are factorised after reordering the unknowns by the given ordering.
+class TransientStepper:
+	## Function to form and factorise the matrices of a step given G and C in sparse form
+	def __init__(self, g_matrix, c_matrix, tstep, method, ordering = DEFAULT_ORDERING):
+		self.method = method
+		self.dense = g_matrix.shape[0] <= SPARSE_THRESHOLD
+
+		scale = 1/tstep if method == 'be' else 2/tstep
+		step_matrix = (g_matrix + scale * c_matrix).tocsc()
+		history_matrix = scale * c_matrix if method == 'be' else scale * c_matrix - g_matrix
+
+		if self.dense:
+			self.factors = linalg.lu_factor(step_matrix.toarray())
+			self.history_matrix = linalg.lu_solve(self.factors, history_matrix.toarray())
+
+		else:
+			self.factors = OrderedLU(step_matrix, ordering)
+			self.history_matrix = history_matrix.tocsr()
+
+		if not np.all(np.isfinite(self.history_matrix.data if sparse.issparse(self.history_matrix) else self.history_matrix)):
+			raise np.linalg.LinAlgError("Matrix of a time step is singular")
+
+	## Function to find the values of the unknowns at the next len(b_values) - 1 time steps
+	### b_values holds the B vectors at the current time followed by those at the next time steps along its columns
+	### Returns the values at the next time steps along the rows of an array
+	@Profiled('steps')
+	def advance(self, x_vector, b_values):
+		if self.method == 'be':
+			source_terms = b_values[:, 1:]
+		else:
+			source_terms = b_values[:, 1:] + b_values[:, :-1]
+
+		results = np.empty((source_terms.shape[1], len(x_vector)))
+
+		if self.dense:
+			source_terms = linalg.lu_solve(self.factors, source_terms)
+
+			for step in range(source_terms.shape[1]):
+				x_vector = self.history_matrix @ x_vector + source_terms[:, step]
+				results[step] = x_vector
+
+		else:
+			for step in range(source_terms.shape[1]):
+				x_vector = self.factors.solve(self.history_matrix @ x_vector + source_terms[:, step])
+				results[step] = x_vector
+
+		return results
+
+
+# Function to simulate a circuit from t = 0 to tstop in steps of tstep
+## The initial values are the DC operating point at t = 0, with inductors as shorts and capacitors as open circuits.
+## The waveforms are written to waveform_file as an array with the time along the first column followed by the unknowns, in chunks of time steps,
+## so that only one chunk is held in memory however long the simulation is. Names of the columns are written to a text file next to it.
+## Returns the values at the end time and the node names. If the equations have no unique solution then False is returned instead of the values.
+def Solve_Transient(circuit_components, source_frequencies, transient_settings, waveform_file, solver_options = {}):
+	tstep, tstop, method = transient_settings
+	steps = int(round(tstop / tstep))
+
+	node_table = Build_Node_Table(circuit_components, inductor_currents = True)
+	g_matrix, c_matrix, _ = Assemble_G_C(circuit_components, node_table)
+	g_matrix = g_matrix.real.tocsc()
+	c_matrix = c_matrix.real.tocsc()
+	mna_size = len(node_table)
+
+	frequencies, b_phasors = Source_Phasors(circuit_components, node_table, source_frequencies)
+
+	## Operating point at t = 0. The conductance TRAN_GMIN is not added to the equation of the ground node.
+	node_gnd = circuit_components.node_index['GND']
+	gmin = np.zeros(mna_size)
+	gmin[:len(circuit_components.node_names)] = TRAN_GMIN
+	gmin[node_gnd] = 0
+
+	x_vector = Solve_Linear_Equations(g_matrix + sparse.diags(gmin, format = 'csc'), b_phasors.real.sum(axis = 1, keepdims = True), solver_options)
+	if type(x_vector) == bool:
+		return False, node_table.names
+
+	try:
+		stepper = TransientStepper(g_matrix, c_matrix, tstep, method, solver_options.get('ordering', DEFAULT_ORDERING))
+	except (np.linalg.LinAlgError, RuntimeError, ValueError):
+		return False, node_table.names
+
+	return Write_Waveforms(stepper, x_vector[:, 0].real, frequencies, b_phasors, tstep, steps, waveform_file, node_table.names), node_table.names
+
+
+# Function to advance a transient from its initial values and write the waveforms of its outputs in chunks of time steps
+## The outputs are the unknowns themselves, or output_matrix times the unknowns if it is given (e.g. the nodes kept by a reduced model)
+## and names holds the names of the outputs. Returns the outputs at the end time, or False if the values don't stay finite.
+def Write_Waveforms(stepper, x_vector, frequencies, b_phasors, tstep, steps, waveform_file, names, output_matrix = None):
+	names_file = waveform_file[:-len(WAVEFORM_FILE_TYPE)] + NAMES_FILE_TYPE
+	temporary_paths = []
+
+	### Both files are written under temporary names and renamed once the last chunk is written, so that a transient which fails
+	### or is interrupted doesn't leave a file which looks like a complete one
+	try:
+		for path in (names_file, waveform_file):
+			file_descriptor, temporary_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(path)), suffix = '.tmp')
+			os.close(file_descriptor)
+			temporary_paths.append(temporary_path)
+
+		with open(temporary_paths[0], 'w') as f:
+			f.write('\n'.join(['time'] + names) + '\n')
+
+		waveforms = np.lib.format.open_memmap(temporary_paths[1], mode = 'w+', dtype = float, shape = (steps + 1, len(names) + 1))
+		waveforms[0, 0] = 0
+		waveforms[0, 1:] = x_vector if output_matrix is None else output_matrix @ x_vector
+
+		chunk_size = max(1, TRAN_CHUNK_BYTES // (8 * (max(len(x_vector), len(names)) + len(frequencies) + 1)))
+		for start in range(1, steps + 1, chunk_size):
+			stop = min(start + chunk_size, steps + 1)
+			times = tstep * np.arange(start - 1, stop)
+
+			b_values = (b_phasors @ np.exp((2j * np.pi) * frequencies[:, None] * times[None, :])).real
+			results = stepper.advance(x_vector, b_values)
+
+			if not np.all(np.isfinite(results)):
+				del waveforms
+				Remove_Files(temporary_paths)
+				return False
+
+			waveforms[start:stop, 0] = times[1:]
+			waveforms[start:stop, 1:] = results if output_matrix is None else results @ output_matrix.T
+			waveforms.flush()
+			x_vector = results[-1]
+
+		del waveforms
+
+	except:
+		Remove_Files(temporary_paths)
+		raise
+
+	Replace_File(temporary_paths[0], names_file)
+	Replace_File(temporary_paths[1], waveform_file)
+	return x_vector if output_matrix is None else output_matrix @ x_vector
+
+
+# Function to remove the files at the given paths, skipping those which aren't present
+def Remove_Files(paths):
+	for path in paths:
+		try:
+			os.remove(path)
+		except OSError:
+			pass
@@ -0,0 +1,101 @@
+'''
+Title	 : Value Parser
+Purpose  : To convert the values given in a netlist file, with or without SPICE suffixes (1k, 4.7u, 10meg), into numbers a whole column at a time
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Value tokens of the components and directives of a netlist file
+Outputs  : Array of the values as float64, with NaN for the tokens which aren't valid values
+'''
+
+
+# Importing libraries
+import string
+import numpy as np
+
+
+# Constants used in the code
+SI_SUFFIXES = {'t': 1e12, 'g': 1e9, 'k': 1e3, 'm': 1e-3, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12, 'f': 1e-15, 'a': 1e-18}		# Suffixes of one letter and their scales
+SI_LONG_SUFFIXES = {'meg': 1e6, 'mil': 25.4e-6}					# Suffixes of three letters, which are checked before those of one letter
+SUFFIX_SCALES = np.ones(128)										# Scale of each ASCII letter which can start a suffix. Other letters don't scale the value.
+SUFFIX_SCALES[[ord(suffix) for suffix in SI_SUFFIXES]] = list(SI_SUFFIXES.values())
+SI_UNITS = ('ohm', 'hz', 'f', 'h', 'v', 'a', 's')					# Units which can be given after the number or after its suffix
+VALID_LETTERS = [suffix + unit for suffix in [''] + list(SI_SUFFIXES) + list(SI_LONG_SUFFIXES) for unit in ('',) + SI_UNITS]	# Letters allowed after a number
+
+
+# Values are given as in SPICE:
+## A number (with or without a decimal point and an exponent) followed by an optional suffix which scales it, e.g. 4.7u = 4.7e-6 and 10meg = 1e7.
+## Suffixes aren't case sensitive, so M (like m) is milli and mega has to be given as meg. One of SI_UNITS can be given after the suffix (or after
+## the number), e.g. 10kohm = 1e4, 1uF = 1e-6 and 5V = 5. Note that 1F is 1 femto and not 1 farad, like in SPICE. Any other letters (e.g. 1xyz, 5e
+## or 2kq) make the value invalid.
+
+
+# Function to convert a column of value tokens into numbers in one pass
+## Columns of plain numbers, which most netlists have, are converted directly into the array without forming a list of floats.
+## Otherwise the tokens are held as a single fixed width array of characters. The letters at the end of every token are stripped together, and the
+## suffix of each token is read from the code points of the characters just after its number - the array is viewed as a matrix of code
+## points and the scale is a lookup in SUFFIX_SCALES. Those characters are also viewed back as strings and looked up in VALID_LETTERS.
+## The numbers are then converted together.
+### numpy's own conversion of strings to float (astype) is slower than float(), so float() is mapped over the numbers.
+## If some token isn't a number, the tokens are converted one at a time to find it, and tokens such as inf which are numbers for Python are kept.
+## Returns the values as a float64 array with NaN in place of the tokens which aren't valid
+def Parse_Values(tokens):
+	tokens = list(tokens)
+
+	try:
+		return np.fromiter(map(float, tokens), dtype = float, count = len(tokens))
+	except ValueError:
+		pass
+
+	tokens = np.array(tokens, dtype = str)
+
+	numbers = np.char.rstrip(tokens, string.ascii_letters)
+	lengths = np.char.str_len(numbers)
+
+	### Code points of the characters after each number, with 0 after the end of the token. Setting bit 0x20 turns upper case letters into lower case.
+	width = tokens.dtype.itemsize // 4
+	letters_width = max(width, 3)
+	code_points = np.zeros((len(tokens), width + letters_width), dtype = np.uint32)
+	code_points[:, :width] = tokens.view(np.uint32).reshape(len(tokens), width)
+	letters = code_points[np.arange(len(tokens))[:, None], lengths[:, None] + np.arange(letters_width)]
+	letters[letters != 0] |= 0x20
+	suffixes = letters[:, :3]
+	valid = np.isin(letters.view('<U{}'.format(letters_width))[:, 0], VALID_LETTERS)
+
+	scales = SUFFIX_SCALES[np.minimum(suffixes[:, 0], 127)]
+	for suffix, scale in SI_LONG_SUFFIXES.items():
+		scales[np.all(suffixes == [ord(letter) for letter in suffix], axis = 1)] = scale
+
+	try:
+		values = np.fromiter(map(float, numbers.tolist()), dtype = float, count = len(numbers))
+
+	except ValueError:
+		values = np.full(len(tokens), np.nan)
+
+		for index, number in enumerate(numbers):
+			try:
+				values[index] = float(number)
+			except ValueError:
+				pass
+
+	values[~valid] = np.nan
+
+	### Tokens which are only letters aren't numbers unless Python takes them as numbers (inf and nan)
+	for index in np.flatnonzero(lengths == 0):
+		try:
+			values[index] = float(tokens[index])
+			scales[index] = 1
+		except ValueError:
+			pass
+
+	return values * scales
+
+
+# Function to convert a single value token into a number
+## Raises ValueError if the token isn't a valid value, like float() does
+def Parse_Value(token):
+	value = Parse_Values([token])[0]
+
+	if np.isnan(value):
+		raise ValueError("invalid value: " + repr(token))
+
+	return value
@@ -14,6 +14,9 @@ import matplotlib.pyplot as plt
 import scipy
 import scipy.special as sp
 
+from batch_fit import QRFit			# Least squares fitting of all the columns of values with a single QR factorisation of M
+from mse_grid import MSE_Grid		# MSE over a grid of A and B from the statistics of the values, without going through the values for each point
+
 
 # List of standard deviation of noise
 sig = np.logspace(-1, -3, 9)
@@ -85,12 +88,9 @@ print("Mean Squared Error is being calculated")
 a = np.linspace(0, 2, 21)
 b = np.linspace(-0.2, 0, 21)
 
-MSE = np.zeros((len(a), len(b)))
-
-## For loop to calculate MSE for different A and B values
-for i in range(len(a)):
-	for j in range(len(b)):
-		MSE[i, j] = ((y[:, 0] - g(x,a[i],b[j]))**2).mean(axis=0)
+## MSE[i, j] is the MSE for A = a[i] and B = b[j]. The whole grid is found at once from the columns of M, which are found only once.
+MSE, Estimation_0, Least_MSE = MSE_Grid(M, y[:, 0], a, b)
+print("Least MSE of {:.4} is at A = {:.4} and B = {:.4}".format(Least_MSE, Estimation_0[0], Estimation_0[1]))
 
 
 # Contour plot
@@ -109,20 +109,9 @@ plt.show()
 
 
 # Estimation and the corresponding error of A and B values
-Estimations = []
-Errors = []
-
-## For loop to estimate for different columns in y
-for i in range(np.size(y, 1)):
-	Estimation_i,_,_,_ = np.linalg.lstsq(M, y[:, i], rcond=None)
-	Error_i = [abs(Estimation_i[0] - 1.05), abs(Estimation_i[1] + 0.105)]
-
-	Estimations.append(Estimation_i)
-	Errors.append(Error_i)
-
-## Converting the lists to numpy arrays for the sake of convenience
-Estimations = np.array(Estimations)
-Errors = np.array(Errors)
+## M is factorised once and all the columns in y are fitted together. Estimations[i] holds the estimate of A and B for the column i of y.
+Estimations = QRFit(M).fit(y).T
+Errors = abs(Estimations - [A_true, B_true])
 
 
 # Plotting of various plots for Error Analysis
@@ -0,0 +1,57 @@
+'''
+Title	 : Batch Fit
+Purpose  : To fit many columns of values (e.g. noisy traces) to the same linear model by least squares with a single QR factorisation of its basis
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Basis columns of the model (e.g. M = [J2(t), t]) and the values to be fitted as columns of a matrix, or of a .npy file read in blocks
+Outputs  : Least squares estimate of the parameters of the model for every column
+'''
+
+
+# Importing libraries
+import numpy as np
+import scipy.linalg as linalg
+
+
+# Constants used in the code
+FIT_CHUNK_BYTES = 2**26		# Maximum memory (in bytes) used by a block of columns read from a file and fitted together
+
+
+# Least squares with one QR factorisation:
+## With M = Q R (Q has orthonormal columns and R is upper triangular), the least squares solution of M p = y is p = R^-1 Q^T y for every y.
+## The factorisation depends only on M, so it is found once and all the columns Y are fitted together as P = R^-1 (Q^T Y), which is a single
+## matrix product (done by BLAS) followed by a triangular solve with as many right hand sides as there are columns.
+
+
+# Defining a Class QRFit to fit columns of values to the model with the given basis columns
+class QRFit:
+	## Function to factorise the basis. The columns of the basis need to be linearly independent.
+	def __init__(self, basis):
+		self.q_matrix, self.r_matrix = np.linalg.qr(np.asarray(basis, dtype = float))
+
+		diagonal = abs(np.diag(self.r_matrix))
+		if np.any(diagonal <= np.finfo(float).eps * len(self.q_matrix) * diagonal.max(initial = 0)):
+			raise np.linalg.LinAlgError("Columns of the basis are linearly dependent")
+
+	## Function to find the parameters of a column of values or of every column of a matrix of values
+	### Returns a vector of parameters, or the parameters of each column along the columns of a matrix
+	def fit(self, y):
+		return linalg.solve_triangular(self.r_matrix, self.q_matrix.T @ y, check_finite = False)
+
+	## Function to fit columns given as blocks, one block (a matrix of columns) at a time
+	### Returns the parameters of all the columns, in the order the blocks are given, along the columns of a matrix
+	def fit_blocks(self, blocks):
+		parameters = [self.fit(block) for block in blocks]
+		return np.concatenate(parameters, axis = 1) if len(parameters) != 0 else np.zeros((self.r_matrix.shape[1], 0))
+
+
+# Function to read the columns of a .npy file in blocks, without loading the whole file
+## The file is memory mapped and blocks of at most FIT_CHUNK_BYTES are read from it. The first skip_columns columns (e.g. time) are left out.
+def Column_Blocks(file_name, skip_columns = 0):
+	values = np.load(file_name, mmap_mode = 'r')
+	if values.ndim == 1:
+		values = values[:, None]
+
+	block_columns = max(1, FIT_CHUNK_BYTES // (8 * max(len(values), 1)))
+	for start in range(skip_columns, values.shape[1], block_columns):
+		yield np.asarray(values[:, start:start + block_columns], dtype = float)
@@ -0,0 +1,57 @@
+'''
+Title	 : MSE Grid
+Purpose  : To evaluate the mean squared error of a linear model A*f1(t) + B*f2(t) over a whole grid of (A, B) at once, along with its exact minimum
+Author   : Surya Prasad.S(EE19B121)
+Date     : 18th October 2026
+Inputs   : Basis columns of the model (e.g. M = [J2(t), t]), the values to be fitted and the values of A and B of the grid
+Outputs  : MSE at every point of the grid, and the closed form estimate of A and B with the least MSE
+'''
+
+
+# Importing libraries
+import numpy as np
+
+
+# Constants used in the code
+GRID_CHUNK_BYTES = 2**26		# Maximum memory (in bytes) used by the values of a chunk of rows of the grid which are found together
+
+
+# MSE as a quadratic form:
+## With the basis columns in M (N rows) and p = [A, B], the MSE of the values y is
+##		MSE(p) = (y - M p)^T (y - M p) / N = MSE(p*) + (p - p*)^T (M^T M / N) (p - p*)
+## where p* = (M^T M)^-1 M^T y is the least squares estimate (the closed form minimum of the MSE). So the trace is gone through only once, for
+## M^T M, M^T y and MSE(p*), and every point of the grid then costs a few operations however long the trace is. Writing it about p* rather than
+## expanding y^T y - 2 p^T M^T y + p^T M^T M p avoids the cancellation of large terms near the minimum, where the MSE is much smaller than y^T y / N.
+
+
+# Function to find the statistics of the values y which the MSE depends on
+## Returns the Gram matrix M^T M / N, the closed form estimate p* and the least MSE MSE(p*)
+def Fit_Statistics(basis, y):
+	gram = basis.T @ basis / len(y)
+	estimate = np.linalg.solve(gram, basis.T @ y / len(y))
+	least_mse = np.mean((y - basis @ estimate)**2)
+
+	return gram, estimate, least_mse
+
+
+# Function to find the MSE of the values y at every point of the grid of the values a of A and b of B
+## MSE[i, j] is the MSE for A = a[i] and B = b[j]. The grid is found in chunks of rows of at most GRID_CHUNK_BYTES, and is written into out if it
+## is given (e.g. an np.memmap for grids larger than the memory), so that only one chunk is held in memory at a time.
+## Returns the grid along with the closed form estimate and the least MSE (see Fit_Statistics())
+def MSE_Grid(basis, y, a, b, out = None):
+	gram, estimate, least_mse = Fit_Statistics(basis, y)
+	a_offsets = np.asarray(a, dtype = float) - estimate[0]
+	b_offsets = np.asarray(b, dtype = float) - estimate[1]
+
+	if out is None:
+		out = np.empty((len(a_offsets), len(b_offsets)))
+
+	### Terms which depend only on B are the same for every row
+	b_terms = least_mse + gram[1, 1] * b_offsets**2
+	chunk_rows = max(1, GRID_CHUNK_BYTES // (8 * max(len(b_offsets), 1)))
+
+	for start in range(0, len(a_offsets), chunk_rows):
+		rows = a_offsets[start:start + chunk_rows, None]
+		out[start:start + chunk_rows] = (gram[0, 0] * rows**2 + b_terms[None, :]) + (2 * gram[0, 1] * rows) * b_offsets[None, :]
+
+	return out, estimate, least_mse